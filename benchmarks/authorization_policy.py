@@ -0,0 +1,68 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/authorization_policy.py [-n NUMBER]
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from accelbyte_py_sdk.token_validation.mock import MockTokenValidator
+
+from accelbyte_grpc_plugin.interceptors.authorization import (
+    AuthorizationServerInterceptor,
+)
+
+from section_pb2 import DESCRIPTOR
+
+SERVICE_NAME = DESCRIPTOR.services_by_name["Section"].full_name
+METHOD = f"/{SERVICE_NAME}/GetRotationItems"
+
+
+def resolve_per_call(method: str):
+    method_descriptor = AuthorizationServerInterceptor.get_method_descriptor(method=method)
+    require_token = AuthorizationServerInterceptor.has_bearer_security(method_descriptor)
+    resource, action = AuthorizationServerInterceptor.extract_permissions(method_descriptor)
+    return require_token, resource, action
+
+
+async def intercept(interceptor: AuthorizationServerInterceptor, number: int) -> float:
+    handler_call_details = SimpleNamespace(method=METHOD, invocation_metadata=())
+
+    async def continuation(_):
+        return None
+
+    start = time.perf_counter()
+    for _ in range(number):
+        await interceptor.intercept_service(continuation, handler_call_details)
+    return time.perf_counter() - start
+
+
+def report(name: str, elapsed: float, number: int) -> None:
+    print(f"{name:<32} {elapsed / number * 1e9:>10.1f} ns/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=200_000)
+    number = parser.parse_args().number
+
+    start = time.perf_counter()
+    for _ in range(number):
+        resolve_per_call(METHOD)
+    report("per-call descriptor resolution", time.perf_counter() - start, number)
+
+    interceptor = AuthorizationServerInterceptor(token_validator=MockTokenValidator())
+    interceptor.compile_policies([SERVICE_NAME])
+    start = time.perf_counter()
+    for _ in range(number):
+        interceptor.get_method_policy(METHOD)
+    report("compiled policy lookup", time.perf_counter() - start, number)
+
+    report("intercept_service (compiled)", asyncio.run(intercept(interceptor, number)), number)
+
+
+if __name__ == "__main__":
+    main()
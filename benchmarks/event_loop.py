@@ -0,0 +1,148 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/event_loop.py [-d SECONDS] [-c CONCURRENCY] [--loops asyncio,uvloop]
+#
+# Serves the Section service with the authorization (mock validator) and metrics
+# interceptors plus OpenTelemetry, in a separate process on each event loop, and
+# drives it from this process with a closed-loop grpc.aio client.
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import time
+from typing import List
+
+import grpc
+import jwt
+
+from section_pb2 import GetRotationItemsRequest, SectionItemObject, SectionObject
+from section_pb2_grpc import SectionStub
+
+PORT = 50_051
+NAMESPACE = "accelbyte"
+
+
+def create_token() -> str:
+    claims = {"namespace": NAMESPACE, "exp": int(time.time()) + 3600, "sub": "benchmark"}
+    return jwt.encode(claims, key="benchmark-signing-key-of-32-bytes", algorithm="HS256")
+
+
+def create_request(size: int) -> GetRotationItemsRequest:
+    return GetRotationItemsRequest(
+        userId="c6354ec948604a1c9f5c026795e420d9",
+        namespace=NAMESPACE,
+        sectionObject=SectionObject(
+            sectionId=f"section-{size}",
+            sectionName="benchmark",
+            items=[SectionItemObject(itemId=f"{i:032x}", itemSku=f"SKU{i}") for i in range(size)],
+        ),
+    )
+
+
+def serve(name: str, port: int, loops: "multiprocessing.Queue") -> None:
+    from accelbyte_py_sdk.token_validation.mock import MockTokenValidator
+
+    from accelbyte_grpc_plugin import App, AppGRPCInterceptorOpt, AppGRPCServiceOpt, event_loop
+    from accelbyte_grpc_plugin.interceptors.authorization import AuthorizationServerInterceptor
+    from accelbyte_grpc_plugin.interceptors.metrics import MetricsServerInterceptor
+    from accelbyte_grpc_plugin.opts.authorization_policy import AuthorizationPolicyOpt
+    from accelbyte_grpc_plugin.opts.metrics import MetricsBindMethodsOpt
+    from accelbyte_grpc_plugin.utils import create_env
+    from app.services.section_service import AsyncSectionService, add_section_servicer_to_server
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.WARNING)
+
+    async def main() -> None:
+        loops.put(type(asyncio.get_running_loop()).__module__.partition(".")[0])
+        authorization = AuthorizationServerInterceptor(
+            token_validator=MockTokenValidator(value=True), namespace=NAMESPACE
+        )
+        metrics = MetricsServerInterceptor()
+        app = App(
+            port=port,
+            env=create_env(),
+            logger=logger,
+            opts=[
+                AppGRPCInterceptorOpt(interceptor=authorization),
+                AuthorizationPolicyOpt(interceptor=authorization),
+                AppGRPCInterceptorOpt(interceptor=metrics),
+                MetricsBindMethodsOpt(interceptor=metrics),
+                AppGRPCServiceOpt(
+                    service=AsyncSectionService(),
+                    service_full_name=AsyncSectionService.full_name,
+                    add_service_func=add_section_servicer_to_server,
+                ),
+            ],
+        )
+        await app.run()
+
+    event_loop.run(main(), event_loop=name, logger=logger)
+
+
+async def drive(port: int, duration: float, concurrency: int, size: int, warmup: float) -> List[float]:
+    request = create_request(size)
+    metadata = (("authorization", f"Bearer {create_token()}"),)
+    latencies: List[float] = []
+
+    async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+        await asyncio.wait_for(channel.channel_ready(), timeout=30)
+        stub = SectionStub(channel)
+        record_from = time.perf_counter() + warmup
+        stop_at = record_from + duration
+
+        async def worker() -> None:
+            while True:
+                start = time.perf_counter()
+                if start >= stop_at:
+                    return
+                await stub.GetRotationItems(request, metadata=metadata)
+                if start >= record_from:
+                    latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def percentile(values: List[float], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="measured seconds per loop")
+    parser.add_argument("-w", "--warmup", type=float, default=2.0)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("-s", "--size", type=int, default=100, help="items per section")
+    parser.add_argument("--loops", default="asyncio,uvloop")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'loop':<10} {'rps':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for name in args.loops.split(","):
+        loops = context.Queue()
+        server = context.Process(target=serve, args=(name, PORT, loops), daemon=True)
+        server.start()
+        try:
+            actual = loops.get(timeout=30)
+            latencies = asyncio.run(
+                drive(PORT, args.duration, args.concurrency, args.size, args.warmup)
+            )
+        finally:
+            server.terminate()
+            server.join()
+        latencies.sort()
+        label = name if actual == name else f"{name}*"
+        print(
+            f"{label:<10} {len(latencies) / args.duration:>10.0f} "
+            f"{percentile(latencies, 0.50) * 1e3:>10.2f} {percentile(latencies, 0.99) * 1e3:>10.2f}"
+        )
+        if actual != name:
+            print(f"  * {name} is not installed, the server ran on {actual}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/interceptor_pipeline.py [-n NUMBER] [--require-token]
+#
+# Per-call cost of the compression, authorization, debug logging and metrics
+# interceptors, chained as gRPC runs them and fused into one FusedServerInterceptor.
+# Calls are driven in-process the way grpc.aio does (each interceptor gets a
+# continuation to the next, then the resolved handler runs), with a handler that
+# returns a pre-built response, so only the interceptors are measured. The
+# OpenTelemetry interceptor is the same in both and left out.
+
+import argparse
+import asyncio
+import functools
+import logging
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+from typing import Any, Callable, List, Sequence
+
+import grpc
+import jwt
+from accelbyte_py_sdk.token_validation.mock import MockTokenValidator
+
+from accelbyte_grpc_plugin.interceptors.authorization import (
+    AuthorizationServerInterceptor,
+    MethodPolicy,
+    TokenCache,
+)
+from accelbyte_grpc_plugin.interceptors.compression import CompressionServerInterceptor
+from accelbyte_grpc_plugin.interceptors.fused import fuse_interceptors
+from accelbyte_grpc_plugin.interceptors.logging import DebugLoggingServerInterceptor
+from accelbyte_grpc_plugin.interceptors.metrics import MetricsServerInterceptor
+
+from section_pb2 import DESCRIPTOR, GetRotationItemsRequest, GetRotationItemsResponse, SectionItemObject
+
+SERVICE_NAME = DESCRIPTOR.services_by_name["Section"].full_name
+METHOD = f"/{SERVICE_NAME}/GetRotationItems"
+
+# as in grpc.aio's invocation metadata
+Metadatum = namedtuple("Metadatum", ["key", "value"])
+
+
+class Context:
+    def code(self):
+        return None
+
+    def set_compression(self, compression) -> None:
+        pass
+
+    async def send_initial_metadata(self, metadata) -> None:
+        pass
+
+    async def abort(self, code, details="", trailing_metadata=()):
+        raise Exception(details)
+
+
+async def run_interceptors(interceptors, query_handler: Callable, handler_call_details) -> Any:
+    # what grpc.aio does for every call
+    interceptor = next(interceptors, None)
+    if interceptor:
+        continuation = functools.partial(run_interceptors, interceptors, query_handler)
+        return await interceptor.intercept_service(continuation, handler_call_details)
+    return query_handler(handler_call_details)
+
+
+async def call(interceptors: Sequence[Any], query_handler: Callable, handler_call_details, data: bytes) -> bytes:
+    handler = await run_interceptors(iter(interceptors), query_handler, handler_call_details)
+    request = handler.request_deserializer(data)
+    response = await handler.unary_unary(request, Context())
+    return handler.response_serializer(response)
+
+
+async def measure(interceptors: List[Any], query_handler: Callable, handler_call_details, data: bytes, number: int) -> float:
+    for _ in range(1000):
+        await call(interceptors, query_handler, handler_call_details, data)
+    start = time.perf_counter()
+    for _ in range(number):
+        await call(interceptors, query_handler, handler_call_details, data)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=100_000)
+    parser.add_argument("--require-token", action="store_true", help="validate a bearer token on the method")
+    parser.add_argument("--compression-min-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    response = GetRotationItemsResponse(
+        items=[SectionItemObject(itemId=f"{i:032x}", itemSku=f"SKU{i}") for i in range(10)]
+    )
+
+    async def behavior(request, context):
+        return response
+
+    handler = grpc.unary_unary_rpc_method_handler(
+        behavior,
+        request_deserializer=GetRotationItemsRequest.FromString,
+        response_serializer=GetRotationItemsResponse.SerializeToString,
+    )
+
+    token = jwt.encode({"namespace": "accelbyte", "exp": int(time.time()) + 3600}, key="k" * 32, algorithm="HS256")
+    handler_call_details = SimpleNamespace(
+        method=METHOD, invocation_metadata=(Metadatum("authorization", f"Bearer {token}"),)
+    )
+    data = GetRotationItemsRequest(userId="c6354ec948604a1c9f5c026795e420d9").SerializeToString()
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.INFO)
+    authorization = AuthorizationServerInterceptor(
+        token_validator=MockTokenValidator(value=True), namespace="accelbyte", token_cache=TokenCache()
+    )
+    authorization.compile_policies([SERVICE_NAME])
+    if args.require_token:
+        authorization.policies = {method: MethodPolicy(True, None, None) for method in authorization.policies}
+    metrics = MetricsServerInterceptor()
+    metrics.bind_methods([SERVICE_NAME])
+    chained = [
+        CompressionServerInterceptor(grpc.Compression.Gzip, args.compression_min_size),
+        authorization,
+        DebugLoggingServerInterceptor(logger=logger),
+        metrics,
+    ]
+    fused = fuse_interceptors(chained)
+    fused[0].bind_methods([SERVICE_NAME])
+
+    def query_handler(_):
+        return handler
+
+    print(f"{'pipeline':<10} {'us/call':>10}")
+    results = {}
+    for name, interceptors in (("none", []), ("chained", chained), ("fused", fused)):
+        elapsed = asyncio.run(measure(interceptors, query_handler, handler_call_details, data, args.number))
+        results[name] = elapsed / args.number * 1e6
+        print(f"{name:<10} {results[name]:>10.2f}")
+    print(
+        f"fused saves {results['chained'] - results['fused']:.2f} us/call "
+        f"({(results['chained'] - results['fused']) / (results['chained'] - results['none']):.0%} of the interceptor overhead)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,578 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/load.py [--layers none,auth,metrics,tracing,logging,limit,all]
+#            [--methods GetRotationItems,Backfill] [--sizes 10,100,1000] [--owned-ratios 0,0.2,0.5]
+#            [--mode closed|fixed|poisson] [-c 32] [--rates 500,1000] [-d SECONDS] [--timeout SECONDS]
+#            [-o results.json]
+#
+# End-to-end load test of the Section service, fully offline. For every layer
+# configuration the App is served in a separate process (so the client does not
+# compete with it for the event loop) and driven from this process with a
+# grpc.aio client, either closed-loop (`-c` callers, each sending its next call
+# when the previous one returns) or open-loop at fixed or Poisson-distributed
+# arrival `--rates`. Open-loop latencies are measured from the scheduled send
+# time, so a server that falls behind is not hidden by the client slowing down.
+#
+# Layers:
+#   auth     bearer tokens (RS256) validated by AsyncCachingTokenValidator with a local
+#            key set, plus the token cache; the Section methods declare no security, so
+#            the benchmark requires a token on them for the layer to do its work
+#   metrics  MetricsServerInterceptor
+#   tracing  recorded spans, exported in batches to a no-op exporter (otherwise the
+#            OpenTelemetry interceptor App always installs creates non-recording spans)
+#   logging  DebugLoggingServerInterceptor and payload logging, written to /dev/null
+#   limit    ConcurrencyLimitServerInterceptor with its default (gradient) limit, first in the
+#            chain; pair it with an open-loop rate above capacity and a `--timeout`
+#
+# The rotation engine, rotation cache, payload logger and gRPC server read the usual
+# environment variables (ROTATION_*, PLUGIN_GRPC_SERVER_*), as in production.
+#
+# Reported per scenario: RPS, p50/p95/p99/max latency, server and client CPU time per
+# request, and the server's peak RSS. `-o` writes them, with the run's settings and
+# environment, as JSON to compare releases.
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import grpc
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from section_pb2 import (
+    BackfillRequest,
+    GetRotationItemsRequest,
+    RotationItemObject,
+    SectionItemObject,
+    SectionObject,
+)
+from section_pb2_grpc import SectionStub
+
+LAYERS = ("auth", "metrics", "tracing", "logging", "limit")
+# what "all" enables, the layers a default deployment runs
+DEFAULT_LAYERS = ("auth", "metrics", "tracing", "logging")
+METHODS = ("GetRotationItems", "Backfill")
+MODES = ("closed", "fixed", "poisson")
+
+NAMESPACE = "accelbyte"
+KEY_ID = "benchmark"
+
+
+# server
+
+
+class Usage(NamedTuple):
+    cpu: float
+    max_rss: int
+
+
+def get_usage() -> Usage:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # kilobytes on Linux, bytes on macOS
+    max_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return Usage(usage.ru_utime + usage.ru_stime, max_rss)
+
+
+def serve(
+    port: int,
+    layers: Sequence[str],
+    public_key_pem: bytes,
+    event_loop_name: str,
+    conn: Connection,
+) -> None:
+    if "tracing" not in layers:
+        os.environ["OTEL_TRACES_SAMPLER"] = "always_off"
+
+    from types import MappingProxyType
+
+    import opentelemetry.trace
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+    from accelbyte_grpc_plugin import (
+        App,
+        AppGRPCInterceptorOpt,
+        AppGRPCServiceOpt,
+        AppOptABC,
+        AppOptOrder,
+        event_loop,
+    )
+    from accelbyte_grpc_plugin.interceptors.authorization import (
+        AuthorizationServerInterceptor,
+        MethodPolicy,
+        TokenCache,
+    )
+    from accelbyte_grpc_plugin.interceptors.concurrency import ConcurrencyLimitServerInterceptor
+    from accelbyte_grpc_plugin.interceptors.logging import DebugLoggingServerInterceptor
+    from accelbyte_grpc_plugin.interceptors.metrics import MetricsServerInterceptor
+    from accelbyte_grpc_plugin.opts.authorization_policy import AuthorizationPolicyOpt
+    from accelbyte_grpc_plugin.opts.grpc_server import GRPCServerOptions, GRPCServerOptionsOpt
+    from accelbyte_grpc_plugin.opts.metrics import MetricsBindMethodsOpt
+    from accelbyte_grpc_plugin.token_validation import AsyncCachingTokenValidator
+    from accelbyte_grpc_plugin.utils import create_env
+    from app.__main__ import (
+        DEFAULT_PLUGIN_GRPC_SERVER_FUSED_INTERCEPTORS_ENABLED,
+        create_payload_logger,
+        create_rotation_cache,
+        create_rotation_engine,
+    )
+    from app.services.section_service import AsyncSectionService, add_section_servicer_to_server
+
+    class OfflineTokenValidator(AsyncCachingTokenValidator):
+        # serves a local key set and an empty revocation list instead of fetching them from IAM
+        async def _fetch_jwks(self) -> None:
+            self._jwks = {KEY_ID: serialization.load_pem_public_key(public_key_pem)}
+            self._jwks_fetched_at = time.monotonic()
+
+        async def _fetch_revocation_list(self) -> None:
+            self._revocation_list_fetched_at = time.monotonic()
+
+    class RequireTokenOpt(AppOptABC):
+        def __init__(self, interceptor: AuthorizationServerInterceptor) -> None:
+            self.interceptor = interceptor
+
+        def apply_order(self) -> AppOptOrder:
+            return AppOptOrder.AFTER_ADD_GRPC_SERVICES
+
+        def apply(self, app: App, *args, **kwargs) -> None:
+            self.interceptor.policies = MappingProxyType(
+                {method: MethodPolicy(True, None, None) for method in self.interceptor.policies}
+            )
+
+    class NoOpSpanExporter(SpanExporter):
+        def export(self, spans) -> SpanExportResult:
+            return SpanExportResult.SUCCESS
+
+    class SpanExportOpt(AppOptABC):
+        def apply_order(self) -> AppOptOrder:
+            return AppOptOrder.AFTER_SET_OTEL_TRACER_PROVIDER
+
+        def apply(self, app: App, *args, **kwargs) -> None:
+            opentelemetry.trace.get_tracer_provider().add_span_processor(
+                BatchSpanProcessor(NoOpSpanExporter())
+            )
+
+    env = create_env()
+    logger = logging.getLogger("benchmark")
+    logger.propagate = False
+    if "logging" in layers:
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(logging.StreamHandler(open(os.devnull, "w")))
+    else:
+        logger.setLevel(logging.WARNING)
+        logger.addHandler(logging.StreamHandler())
+
+    async def main() -> None:
+        opts = [GRPCServerOptionsOpt(options=GRPCServerOptions.from_env(env))]
+        if "limit" in layers:
+            opts.append(AppGRPCInterceptorOpt(interceptor=ConcurrencyLimitServerInterceptor()))
+        if "tracing" in layers:
+            opts.append(SpanExportOpt())
+        if "auth" in layers:
+            token_validator = OfflineTokenValidator(sdk=None)
+            authorization = AuthorizationServerInterceptor(
+                token_validator=token_validator, namespace=NAMESPACE, token_cache=TokenCache()
+            )
+            opts.append(AppGRPCInterceptorOpt(interceptor=authorization))
+            opts.append(AuthorizationPolicyOpt(interceptor=authorization))
+            opts.append(RequireTokenOpt(interceptor=authorization))
+        if "logging" in layers:
+            opts.append(AppGRPCInterceptorOpt(interceptor=DebugLoggingServerInterceptor(logger=logger)))
+        if "metrics" in layers:
+            metrics = MetricsServerInterceptor()
+            opts.append(AppGRPCInterceptorOpt(interceptor=metrics))
+            opts.append(MetricsBindMethodsOpt(interceptor=metrics))
+        opts.append(
+            AppGRPCServiceOpt(
+                service=AsyncSectionService(
+                    logger=logger if "logging" in layers else None,
+                    payload_logger=create_payload_logger(env=env, logger=logger) if "logging" in layers else None,
+                    rotation_engine=create_rotation_engine(env=env),
+                    rotation_cache=create_rotation_cache(env=env),
+                ),
+                service_full_name=AsyncSectionService.full_name,
+                add_service_func=add_section_servicer_to_server,
+            )
+        )
+
+        with env.prefixed("PLUGIN_GRPC_SERVER_"):
+            fuse = env.bool("FUSED_INTERCEPTORS_ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_FUSED_INTERCEPTORS_ENABLED)
+
+        app = App(port=port, env=env, logger=logger, opts=opts, fuse_interceptors=fuse)
+        if "auth" in layers:
+            app.readiness_gates.append(token_validator.wait_until_ready)
+
+        async def on_readiness(ready: bool) -> None:
+            if ready:
+                conn.send("ready")
+
+        app.readiness_listeners.append(on_readiness)
+        await app.run()
+
+    def answer() -> None:
+        while True:
+            try:
+                conn.recv()
+            except EOFError:
+                os._exit(0)
+            conn.send(get_usage())
+
+    threading.Thread(target=answer, daemon=True).start()
+    event_loop.run(main(), event_loop=event_loop_name, logger=logger)
+
+
+class Server:
+    def __init__(self, port: int, layers: Sequence[str], public_key_pem: bytes, event_loop_name: str) -> None:
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=serve,
+            args=(port, tuple(layers), public_key_pem, event_loop_name, child_conn),
+            daemon=True,
+        )
+
+    def __enter__(self) -> "Server":
+        self.process.start()
+        if not self.conn.poll(60) or self.conn.recv() != "ready":
+            raise RuntimeError("the server did not get ready")
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.process.terminate()
+        self.process.join()
+
+    def usage(self) -> Usage:
+        self.conn.send("usage")
+        return self.conn.recv()
+
+
+# client
+
+
+class Scenario(NamedTuple):
+    method: str
+    size: int
+    owned_ratio: Optional[float]
+    mode: str
+    concurrency: Optional[int]
+    rate: Optional[float]
+
+
+class Recording(NamedTuple):
+    latencies: List[float]
+    errors: Counter
+    elapsed: float
+    max_outstanding: int
+
+
+def create_token(private_key: Any) -> str:
+    claims = {"namespace": NAMESPACE, "exp": int(time.time()) + 86400, "sub": "benchmark"}
+    return jwt.encode(claims, key=private_key, algorithm="RS256", headers={"kid": KEY_ID})
+
+
+def create_section(size: int) -> SectionObject:
+    return SectionObject(
+        sectionId=f"section-{size}",
+        sectionName="benchmark",
+        items=[SectionItemObject(itemId=f"{i:032x}", itemSku=f"SKU{i}") for i in range(size)],
+    )
+
+
+def create_requests(
+    method: str,
+    size: int,
+    owned_ratio: Optional[float],
+    users: int,
+    rotation_size: int,
+) -> List[Any]:
+    section = create_section(size)
+    user_ids = [f"{i:032x}" for i in range(users)]
+    if method == "GetRotationItems":
+        return [
+            GetRotationItemsRequest(userId=user_id, namespace=NAMESPACE, sectionObject=section)
+            for user_id in user_ids
+        ]
+
+    rng = random.Random(size)
+    requests = []
+    for user_id in user_ids:
+        rotation = rng.sample(list(section.items), min(size, rotation_size))
+        owned = set(rng.sample(range(len(rotation)), round(len(rotation) * (owned_ratio or 0.0))))
+        requests.append(
+            BackfillRequest(
+                userId=user_id,
+                namespace=NAMESPACE,
+                sectionId=section.sectionId,
+                sectionName=section.sectionName,
+                items=[
+                    RotationItemObject(itemId=item.itemId, itemSku=item.itemSku, owned=i in owned, index=i)
+                    for i, item in enumerate(rotation)
+                ],
+            )
+        )
+    return requests
+
+
+async def run_closed(
+    call: Callable,
+    requests: List[Any],
+    metadata: Sequence[Tuple[str, str]],
+    concurrency: int,
+    duration: float,
+) -> Recording:
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    counter = itertools.count()
+    start = time.perf_counter()
+    stop_at = start + duration
+
+    async def caller() -> None:
+        while True:
+            sent_at = time.perf_counter()
+            if sent_at >= stop_at:
+                return
+            try:
+                await call(requests[next(counter) % len(requests)], metadata=metadata)
+            except grpc.aio.AioRpcError as error:
+                errors[error.code().name] += 1
+            else:
+                latencies.append(time.perf_counter() - sent_at)
+
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return Recording(latencies, errors, time.perf_counter() - start, concurrency)
+
+
+async def run_open(
+    call: Callable,
+    requests: List[Any],
+    metadata: Sequence[Tuple[str, str]],
+    rate: float,
+    poisson: bool,
+    duration: float,
+) -> Recording:
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    outstanding = set()
+    max_outstanding = 0
+    rng = random.Random(0)
+    loop = asyncio.get_running_loop()
+
+    async def send(request: Any, scheduled_at: float) -> None:
+        try:
+            await call(request, metadata=metadata)
+        except grpc.aio.AioRpcError as error:
+            errors[error.code().name] += 1
+        else:
+            latencies.append(time.perf_counter() - scheduled_at)
+
+    start = time.perf_counter()
+    stop_at = start + duration
+    next_at = start
+    sent = 0
+    while next_at < stop_at:
+        now = time.perf_counter()
+        # sends everything that is due, the timer resolution is coarser than the interval at high rates
+        while next_at <= now and next_at < stop_at:
+            task = loop.create_task(send(requests[sent % len(requests)], next_at))
+            outstanding.add(task)
+            task.add_done_callback(outstanding.discard)
+            sent += 1
+            next_at += rng.expovariate(rate) if poisson else 1.0 / rate
+        max_outstanding = max(max_outstanding, len(outstanding))
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+    if outstanding:
+        await asyncio.wait(outstanding)
+    return Recording(latencies, errors, time.perf_counter() - start, max_outstanding)
+
+
+async def run_scenario(
+    port: int,
+    scenario: Scenario,
+    requests: List[Any],
+    metadata: Sequence[Tuple[str, str]],
+    warmup: float,
+    duration: float,
+    server: Server,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+        stub = SectionStub(channel)
+        call = functools.partial(getattr(stub, scenario.method), timeout=timeout)
+        # registers the section as the candidate pool of its Backfill calls
+        await stub.GetRotationItems(
+            GetRotationItemsRequest(namespace=NAMESPACE, sectionObject=create_section(scenario.size)),
+            metadata=metadata,
+        )
+
+        async def run(seconds: float) -> Recording:
+            if scenario.mode == "closed":
+                return await run_closed(call, requests, metadata, scenario.concurrency, seconds)
+            return await run_open(call, requests, metadata, scenario.rate, scenario.mode == "poisson", seconds)
+
+        if warmup > 0:
+            await run(warmup)
+        server_before, client_before = server.usage(), get_usage()
+        recording = await run(duration)
+        server_after, client_after = server.usage(), get_usage()
+
+    latencies = sorted(recording.latencies)
+    completed = len(latencies)
+    calls = completed + sum(recording.errors.values())
+    return {
+        **scenario._asdict(),
+        "calls": calls,
+        "errors": dict(recording.errors),
+        "rps": completed / recording.elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1e3,
+            "p95": percentile(latencies, 0.95) * 1e3,
+            "p99": percentile(latencies, 0.99) * 1e3,
+            "max": (latencies[-1] if latencies else float("nan")) * 1e3,
+        },
+        "server_cpu_ms_per_call": (server_after.cpu - server_before.cpu) * 1e3 / max(1, calls),
+        "client_cpu_ms_per_call": (client_after.cpu - client_before.cpu) * 1e3 / max(1, calls),
+        "server_peak_rss_mb": server_after.max_rss / 2**20,
+        "max_outstanding": recording.max_outstanding,
+    }
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def parse_layers(value: str) -> List[Tuple[str, ...]]:
+    configurations = []
+    for configuration in value.split(","):
+        if configuration == "all":
+            layers = DEFAULT_LAYERS
+        elif configuration == "none":
+            layers = ()
+        else:
+            layers = tuple(layer for layer in LAYERS if layer in configuration.split("+"))
+            unknown = set(configuration.split("+")) - set(LAYERS)
+            if unknown:
+                raise argparse.ArgumentTypeError(f"unknown layers: {', '.join(sorted(unknown))}")
+        configurations.append(layers)
+    return configurations
+
+
+def create_scenarios(args: argparse.Namespace) -> List[Scenario]:
+    scenarios = []
+    for method in args.methods.split(","):
+        if method not in METHODS:
+            raise SystemExit(f"unknown method: {method}")
+        owned_ratios = [float(r) for r in args.owned_ratios.split(",")] if method == "Backfill" else [None]
+        for size, owned_ratio in itertools.product([int(s) for s in args.sizes.split(",")], owned_ratios):
+            if args.mode == "closed":
+                for concurrency in [int(c) for c in args.concurrency.split(",")]:
+                    scenarios.append(Scenario(method, size, owned_ratio, args.mode, concurrency, None))
+            else:
+                for rate in [float(r) for r in args.rates.split(",")]:
+                    scenarios.append(Scenario(method, size, owned_ratio, args.mode, None, rate))
+    return scenarios
+
+
+def get_environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "grpc": grpc.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def format_row(layers: Sequence[str], result: Dict[str, Any]) -> str:
+    load = f"c={result['concurrency']}" if result["mode"] == "closed" else f"{result['mode']} {result['rate']:g}/s"
+    owned = "-" if result["owned_ratio"] is None else f"{result['owned_ratio']:g}"
+    latency = result["latency_ms"]
+    errors = sum(result["errors"].values())
+    return (
+        f"{'+'.join(layers) or 'none':<30} {result['method']:<17} {result['size']:>6} {owned:>5} {load:>14} "
+        f"{result['rps']:>8.0f} {latency['p50']:>7.2f} {latency['p95']:>7.2f} {latency['p99']:>7.2f} "
+        f"{result['server_cpu_ms_per_call']:>8.3f} {result['server_peak_rss_mb']:>7.1f} {errors:>6}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layers", default="all", help="comma-separated configurations, each 'all', 'none' or layers joined by '+'")
+    parser.add_argument("--methods", default=",".join(METHODS))
+    parser.add_argument("--sizes", default="10,100,1000", help="items per section")
+    parser.add_argument("--owned-ratios", default="0,0.2,0.5", help="share of the rotation already owned (Backfill)")
+    parser.add_argument("--rotation-size", type=int, default=10, help="items in the current rotation (Backfill)")
+    parser.add_argument("--users", type=int, default=64, help="distinct users the requests cycle through")
+    parser.add_argument("--mode", choices=MODES, default="closed")
+    parser.add_argument("-c", "--concurrency", default="32", help="closed-loop callers (comma-separated)")
+    parser.add_argument("--rates", default="500", help="open-loop calls per second (comma-separated)")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="measured seconds per scenario")
+    parser.add_argument("-w", "--warmup", type=float, default=2.0, help="unmeasured seconds per scenario")
+    parser.add_argument("--timeout", type=float, help="deadline of each call in seconds")
+    parser.add_argument("--event-loop", default="asyncio")
+    parser.add_argument("--port", type=int, default=50_051)
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    configurations = parse_layers(args.layers)
+    scenarios = create_scenarios(args)
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_key_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    metadata = (("authorization", f"Bearer {create_token(private_key)}"),)
+
+    print(
+        f"{'layers':<30} {'method':<17} {'size':>6} {'owned':>5} {'load':>14} "
+        f"{'rps':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'cpu ms':>8} {'rss MB':>7} {'errors':>6}"
+    )
+    results = []
+    for layers in configurations:
+        with Server(args.port, layers, public_key_pem, args.event_loop) as server:
+            for scenario in scenarios:
+                requests = create_requests(
+                    scenario.method, scenario.size, scenario.owned_ratio, args.users, args.rotation_size
+                )
+                result = asyncio.run(
+                    run_scenario(
+                        args.port, scenario, requests, metadata, args.warmup, args.duration, server, args.timeout
+                    )
+                )
+                result["layers"] = list(layers)
+                results.append(result)
+                print(format_row(layers, result), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": get_environment(), "settings": vars(args), "results": results}, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
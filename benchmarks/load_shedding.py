@@ -0,0 +1,195 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/load_shedding.py [--work-ms 1] [--io-ms 20] [--io-concurrency 8]
+#            [--rates 200,400,800] [--limits none,gradient,aimd] [--timeout 0.5] [-d SECONDS]
+#
+# Overload behaviour with and without ConcurrencyLimitServerInterceptor. The server
+# (a separate process) has the health service and one method that burns `--work-ms`
+# of CPU on its event loop, then awaits a downstream that serves `--io-concurrency`
+# requests at a time in `--io-ms` each (like the entitlement or catalog lookups). This
+# process sends calls open-loop at each of `--rates` with a `--timeout` deadline, while
+# probing the health check every 100ms. Payloads are a few bytes, so the client stays
+# cheap next to the server.
+#
+# With `--io-ms 0` the method is CPU-bound. grpc.aio then only accepts a new call once
+# per turn of its event loop, so the backlog stays in gRPC core, where no interceptor
+# sees it, and the limit has nothing to act on.
+#
+# Reported: goodput (calls that succeeded per second), p50/p99 latency of those,
+# calls shed with RESOURCE_EXHAUSTED and timed out, and health probe p99 and failures.
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+from collections import Counter
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional
+
+import grpc
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+METHOD = "/benchmark.Work/Call"
+
+
+def serve(port: int, limit_name: Optional[str], work: float, io: float, io_concurrency: int, conn: Connection) -> None:
+    from grpc_health.v1.health import aio as health_aio
+
+    from accelbyte_grpc_plugin.interceptors.concurrency import (
+        ConcurrencyLimitServerInterceptor,
+        create_concurrency_limit,
+    )
+
+    downstream = asyncio.Semaphore(io_concurrency)
+
+    async def call(request: bytes, context) -> bytes:
+        end = time.perf_counter() + work
+        while time.perf_counter() < end:
+            pass
+        if io > 0:
+            async with downstream:
+                await asyncio.sleep(io)
+        return request
+
+    async def main() -> None:
+        interceptors = []
+        if limit_name:
+            interceptors.append(ConcurrencyLimitServerInterceptor(limit=create_concurrency_limit(limit_name)))
+        server = grpc.aio.server(interceptors=interceptors)
+        server.add_generic_rpc_handlers(
+            (grpc.method_handlers_generic_handler("benchmark.Work", {"Call": grpc.unary_unary_rpc_method_handler(call)}),)
+        )
+        health_servicer = health_aio.HealthServicer()
+        await health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
+        health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+        server.add_insecure_port(f"127.0.0.1:{port}")
+        await server.start()
+        conn.send("ready")
+        await server.wait_for_termination()
+
+    asyncio.run(main())
+
+
+async def probe(channel: grpc.aio.Channel, stop_at: float, latencies: List[float], failures: Counter) -> None:
+    check = health_pb2_grpc.HealthStub(channel).Check
+    while time.perf_counter() < stop_at:
+        sent_at = time.perf_counter()
+        try:
+            await check(health_pb2.HealthCheckRequest(), timeout=1.0)
+            latencies.append(time.perf_counter() - sent_at)
+        except grpc.aio.AioRpcError as error:
+            failures[error.code().name] += 1
+        await asyncio.sleep(0.1)
+
+
+async def run(port: int, rate: float, timeout: float, duration: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    codes: Counter = Counter()
+    probe_latencies: List[float] = []
+    probe_failures: Counter = Counter()
+    rng = random.Random(0)
+
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        call = channel.unary_unary(METHOD)
+        await call(b"warm-up")
+
+        async def send(scheduled_at: float) -> None:
+            try:
+                await call(b"x", timeout=timeout)
+                latencies.append(time.perf_counter() - scheduled_at)
+                codes["OK"] += 1
+            except grpc.aio.AioRpcError as error:
+                codes[error.code().name] += 1
+
+        start = time.perf_counter()
+        stop_at = start + duration
+        prober = asyncio.create_task(probe(channel, stop_at, probe_latencies, probe_failures))
+        tasks = []
+        next_at = start
+        while next_at < stop_at:
+            now = time.perf_counter()
+            while next_at <= now and next_at < stop_at:
+                tasks.append(asyncio.create_task(send(next_at)))
+                next_at += rng.expovariate(rate)
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        await asyncio.gather(*tasks, prober)
+        # lets the server drain before the next run
+        await asyncio.sleep(timeout)
+
+    latencies.sort()
+    probe_latencies.sort()
+    return {
+        "goodput": codes["OK"] / duration,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "shed": codes["RESOURCE_EXHAUSTED"],
+        "timed_out": codes["DEADLINE_EXCEEDED"],
+        "calls": sum(codes.values()),
+        "probe_p99_ms": percentile(probe_latencies, 0.99) * 1e3,
+        "probe_failures": sum(probe_failures.values()),
+    }
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--work-ms", type=float, default=1.0, help="CPU time per call on the server")
+    parser.add_argument("--io-ms", type=float, default=20.0, help="time per call in the downstream")
+    parser.add_argument("--io-concurrency", type=int, default=8, help="calls the downstream serves at once")
+    parser.add_argument("--rates", default="200,400,800", help="Poisson arrival rates, calls per second")
+    parser.add_argument("--limits", default="none,gradient,aimd", help="'none' or concurrency limit algorithms")
+    parser.add_argument("--timeout", type=float, default=0.5, help="deadline of each call in seconds")
+    parser.add_argument("-d", "--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=50_061)
+    args = parser.parse_args()
+
+    capacity = 1000 / args.work_ms
+    if args.io_ms > 0:
+        capacity = min(capacity, args.io_concurrency * 1000 / args.io_ms)
+    print(f"capacity ~{capacity:.0f} calls/s")
+    print(
+        f"{'limit':<10} {'rate':>6} {'goodput':>8} {'p50 ms':>7} {'p99 ms':>7} {'shed':>6} "
+        f"{'timeout':>7} {'probe p99 ms':>12} {'probe fail':>10}"
+    )
+    context = multiprocessing.get_context("spawn")
+    for limit_name in args.limits.split(","):
+        for rate in (float(r) for r in args.rates.split(",")):
+            # a fresh server per run, so every limit starts from its initial value
+            conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=serve,
+                args=(
+                    args.port,
+                    None if limit_name == "none" else limit_name,
+                    args.work_ms / 1e3,
+                    args.io_ms / 1e3,
+                    args.io_concurrency,
+                    child_conn,
+                ),
+                daemon=True,
+            )
+            process.start()
+            try:
+                if not conn.poll(60) or conn.recv() != "ready":
+                    raise RuntimeError("the server did not get ready")
+                r = asyncio.run(run(args.port, rate, args.timeout, args.duration))
+            finally:
+                process.kill()
+                process.join()
+            print(
+                f"{limit_name:<10} {rate:>6.0f} {r['goodput']:>8.1f} {r['p50_ms']:>7.1f} {r['p99_ms']:>7.1f} "
+                f"{r['shed']:>6} {r['timed_out']:>7} {r['probe_p99_ms']:>12.1f} {r['probe_failures']:>10}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
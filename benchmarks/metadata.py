@@ -0,0 +1,83 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/metadata.py [-n NUMBER]
+#
+# Cost of reading the authorization header and the trace headers from a call's
+# metadata, copied into a dict (get_headers_from_metadata) and read in place
+# (MetadataView), on metadata shaped like what the Extend gateway sends.
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from grpc._cython.cygrpc import _Metadatum
+
+from accelbyte_grpc_plugin.utils import (
+    MetadataView,
+    get_headers_from_metadata,
+    get_propagator_header_keys,
+)
+
+INVOCATION_METADATA = tuple(
+    _Metadatum(key, value)
+    for key, value in (
+        ("user-agent", "grpc-go/1.64.0"),
+        ("grpc-accept-encoding", "gzip"),
+        ("x-forwarded-for", "10.0.0.1"),
+        ("x-request-id", "4bf92f3577b34da6a3ce929d0e0e4736"),
+        ("traceparent", "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"),
+        ("namespace", "accelbyte"),
+        ("authorization", "Bearer " + "x" * 800),
+    )
+)
+
+
+def copied(handler_call_details) -> None:
+    headers = get_headers_from_metadata(handler_call_details=handler_call_details)
+    headers.get("authorization", None)
+    propagator_header_keys = get_propagator_header_keys()
+    {k: v for k, v in headers.items() if k in propagator_header_keys}
+
+
+def in_place(view: MetadataView, handler_call_details) -> None:
+    MetadataView.get(handler_call_details, "authorization")
+    view.select(handler_call_details)
+
+
+def report(name: str, elapsed: float, number: int) -> None:
+    print(f"{name:<40} {elapsed / number * 1e9:>10.1f} ns/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=500_000)
+    number = parser.parse_args().number
+
+    handler_call_details = SimpleNamespace(method="/Section/GetRotationItems", invocation_metadata=INVOCATION_METADATA)
+    view = MetadataView.for_propagator()
+
+    start = time.perf_counter()
+    for _ in range(number):
+        copied(handler_call_details)
+    report("copied (authorization + trace headers)", time.perf_counter() - start, number)
+
+    start = time.perf_counter()
+    for _ in range(number):
+        in_place(view, handler_call_details)
+    report("in place (authorization + trace headers)", time.perf_counter() - start, number)
+
+    start = time.perf_counter()
+    for _ in range(number):
+        get_headers_from_metadata(handler_call_details=handler_call_details).get("authorization", None)
+    report("copied (authorization only)", time.perf_counter() - start, number)
+
+    start = time.perf_counter()
+    for _ in range(number):
+        MetadataView.get(handler_call_details, "authorization")
+    report("in place (authorization only)", time.perf_counter() - start, number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/personalized_rotation.py [--users 20000] [--items 50] [-k 5]
+#            [--sizes 1000,10000,100000] [-n NUMBER]
+#
+# Checks and costs of the `personalized` strategy:
+# - uniformity: over `--users` users, how often each of `--items` items is shown,
+#   and shown first, against the uniform expectation (chi-square, with a p-value
+#   from the Wilson-Hilferty approximation; small p-values mean not uniform);
+# - users: the average overlap of two users' rotations and of a user's rotation in
+#   two consecutive slots, against what independent draws would give (k*k/items);
+# - determinism: every user's rotation computed again gives the same items;
+# - expiredAt: the end of the slot, or of the section when it ends first;
+# - cost: per rotation for sections of `--sizes` items, which should not grow with
+#   the size of the section.
+
+import argparse
+import math
+import time
+from collections import Counter
+from typing import List
+
+from section_pb2 import GetRotationItemsRequest, SectionItemObject, SectionObject
+
+from app.rotation.strategies import PersonalizedStrategy, compute_slot
+
+
+def create_section(size: int, end_date: int = 0) -> SectionObject:
+    return SectionObject(
+        sectionId=f"section-{size}",
+        sectionName="benchmark",
+        endDate=end_date,
+        items=[SectionItemObject(itemId=f"{i:032x}", itemSku=f"SKU{i}") for i in range(size)],
+    )
+
+
+def chi_square_p_value(counts: List[int], expected: float) -> float:
+    statistic = sum((count - expected) ** 2 / expected for count in counts)
+    df = len(counts) - 1
+    z = ((statistic / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("-k", "--count", type=int, default=5)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("-n", "--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    strategy = PersonalizedStrategy(count=args.count)
+    section = create_section(args.items)
+    slot = compute_slot(0, strategy.slot_duration)
+    next_slot = compute_slot(slot.end, strategy.slot_duration)
+    users = [f"{i:032x}" for i in range(args.users)]
+
+    rotations = []
+    shown: Counter = Counter()
+    shown_first: Counter = Counter()
+    for user_id in users:
+        request = GetRotationItemsRequest(userId=user_id, sectionObject=section)
+        indices = strategy.select(request, slot, args.items)
+        assert len(set(indices)) == len(indices) == min(args.count, args.items)
+        rotations.append(indices)
+        shown.update(indices)
+        shown_first[indices[0]] += 1
+
+    print(f"uniformity over {args.users} users, {args.items} items, k={args.count}")
+    p_shown = chi_square_p_value([shown[i] for i in range(args.items)], args.users * args.count / args.items)
+    p_first = chi_square_p_value([shown_first[i] for i in range(args.items)], args.users / args.items)
+    print(f"  items shown          p={p_shown:.3f}")
+    print(f"  items shown first    p={p_first:.3f}")
+
+    pairs = min(len(rotations) - 1, 5000)
+    overlap_users = sum(len(set(rotations[i]) & set(rotations[i + 1])) for i in range(pairs)) / pairs
+    overlap_slots = 0
+    for user_id, indices in zip(users[:pairs], rotations):
+        request = GetRotationItemsRequest(userId=user_id, sectionObject=section)
+        overlap_slots += len(set(indices) & set(strategy.select(request, next_slot, args.items)))
+    print(
+        f"  overlap of two users {overlap_users:.3f}, of two slots {overlap_slots / pairs:.3f} "
+        f"(independent: {args.count * args.count / args.items:.3f})"
+    )
+
+    same = all(
+        strategy.select(GetRotationItemsRequest(userId=user_id, sectionObject=section), slot, args.items) == indices
+        for user_id, indices in zip(users, rotations)
+    )
+    print(f"  deterministic        {same}")
+
+    request = GetRotationItemsRequest(userId=users[0], sectionObject=section)
+    now = slot.start + 1234.5
+    print(f"  expiredAt            {strategy.rotate(request, now).expired_at == slot.end}", end=" ")
+    ending = create_section(args.items, end_date=slot.start + 600)
+    request = GetRotationItemsRequest(userId=users[0], sectionObject=ending)
+    print(f"(section ending first: {strategy.rotate(request, now).expired_at == slot.start + 600})")
+
+    print(f"\n{'size':>7} {'us/rotation':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        request = GetRotationItemsRequest(userId=users[0], sectionObject=create_section(size))
+        start = time.perf_counter()
+        for i in range(args.number):
+            strategy.select(request, compute_slot(i * strategy.slot_duration, strategy.slot_duration), size)
+        print(f"{size:>7} {(time.perf_counter() - start) / args.number * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
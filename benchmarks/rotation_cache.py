@@ -0,0 +1,67 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/rotation_cache.py [-n NUMBER] [--sizes 10,100,1000,10000]
+
+import argparse
+import asyncio
+import time
+
+from section_pb2 import GetRotationItemsRequest, SectionItemObject, SectionObject
+
+from app.rotation.cache import RotationCache
+from app.rotation.strategies import RotationEngine, RoundRobinStrategy, WeightedStrategy
+from app.services.section_service import AsyncSectionService
+
+
+def create_request(size: int) -> GetRotationItemsRequest:
+    return GetRotationItemsRequest(
+        userId="c6354ec948604a1c9f5c026795e420d9",
+        namespace="accelbyte",
+        sectionObject=SectionObject(
+            sectionId=f"section-{size}",
+            sectionName="benchmark",
+            items=[
+                SectionItemObject(itemId=f"{i:032x}", itemSku=f"SKU{i}")
+                for i in range(size)
+            ],
+        ),
+    )
+
+
+async def measure(service: AsyncSectionService, request: GetRotationItemsRequest, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        await service.GetRotationItems(request, None)
+    return number / (time.perf_counter() - start)
+
+
+async def run(sizes, number: int, count: int) -> None:
+    print(f"{'strategy':<12} {'items':>8} {'uncached rps':>14} {'cached rps':>14} {'cached+bytes rps':>18}")
+    for strategy_type in (RoundRobinStrategy, WeightedStrategy):
+        for size in sizes:
+            request = create_request(size)
+            engine = RotationEngine(default_strategy=strategy_type(count=count))
+            rotation_caches = (None, RotationCache(registry=None), RotationCache(serialize=True, registry=None))
+            results = [
+                await measure(AsyncSectionService(rotation_engine=engine, rotation_cache=c), request, number)
+                for c in rotation_caches
+            ]
+            print(
+                f"{strategy_type.name:<12} {size:>8} "
+                f"{results[0]:>14.0f} {results[1]:>14.0f} {results[2]:>18.0f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=5_000)
+    parser.add_argument("-k", "--count", type=int, default=10, help="items per rotation")
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    args = parser.parse_args()
+    asyncio.run(run([int(s) for s in args.sizes.split(",")], args.number, args.count))
+
+
+if __name__ == "__main__":
+    main()
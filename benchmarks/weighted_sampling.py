@@ -0,0 +1,132 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+# Usage: PYTHONPATH=src python benchmarks/weighted_sampling.py [-n NUMBER] [--sizes 1000,10000,100000] [--counts 10,100]
+#
+# Cost of drawing k items by weight without replacement from sections of 1,000 to
+# 100,000 items, with the `weighted` strategy and with `weighted_sample` on each
+# sampler (NumPy, when installed, and pure Python). Weights are skewed (1 to 100)
+# and, in the catalog runs, a third of the items are unavailable. Reported: the
+# one-off cost of turning a new section version into arrays, the cost per rotation
+# after that (given the section fingerprint, which the service computes for the
+# rotation cache anyway), and whether every sampler drew the same items. Each
+# rotation is for a new slot, so the catalog runs also pay for masking the weights,
+# which the service only does on the first rotation of a slot.
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+from section_pb2 import GetRotationItemsRequest, SectionItemObject, SectionObject
+
+from app.catalog import CatalogIndex, CatalogItem
+from app.rotation.sampling import SAMPLERS, numpy
+from app.rotation.strategies import (
+    RotationStrategy,
+    WeightedSampleStrategy,
+    WeightedStrategy,
+    compute_slot,
+    section_fingerprint,
+)
+
+
+def create_request(size: int) -> GetRotationItemsRequest:
+    return GetRotationItemsRequest(
+        userId="c6354ec948604a1c9f5c026795e420d9",
+        namespace="accelbyte",
+        sectionObject=SectionObject(
+            sectionId=f"section-{size}",
+            sectionName="benchmark",
+            items=[SectionItemObject(itemId=f"{i:032x}", itemSku=f"SKU{i}") for i in range(size)],
+        ),
+    )
+
+
+def create_weights(size: int) -> Dict[str, float]:
+    rng = random.Random(size)
+    return {f"SKU{i}": float(rng.randint(1, 100)) for i in range(size)}
+
+
+def create_catalog(size: int) -> SimpleNamespace:
+    items = {
+        f"{i:032x}": CatalogItem(
+            item_id=f"{i:032x}",
+            sku=f"SKU{i}",
+            name="",
+            item_type="INGAMEITEM",
+            category_path="/",
+            tags=(),
+            active=i % 3 != 0,
+            purchasable=True,
+            currency_code="USD",
+            price=100,
+            available_from=0,
+            available_until=0,
+            updated_at=0,
+        )
+        for i in range(size)
+    }
+    return SimpleNamespace(index=CatalogIndex(items))
+
+
+def measure(strategy: RotationStrategy, request: GetRotationItemsRequest, fingerprint: int, number: int):
+    # with the section fingerprint given, as the service computes it for the rotation cache anyway
+    size = len(request.sectionObject.items)
+    duration = strategy.slot_duration
+    start = time.perf_counter()
+    strategy.select(request, compute_slot(0, duration), size, fingerprint=fingerprint)
+    first = time.perf_counter() - start
+
+    selected: List[List[int]] = []
+    start = time.perf_counter()
+    for i in range(number):
+        selected.append(strategy.select(request, compute_slot(i * duration, duration), size, fingerprint=fingerprint))
+    return first, (time.perf_counter() - start) / number, selected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=50)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--counts", default="10,100")
+    args = parser.parse_args()
+
+    samplers = [name for name in SAMPLERS if name != "numpy" or numpy is not None]
+    if numpy is None:
+        print("numpy is not installed, only the pure Python sampler is measured")
+    print(f"{'size':>7} {'k':>4} {'catalog':>7} {'strategy':<24} {'first ms':>9} {'ms/rotation':>12} {'same':>5}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        request = create_request(size)
+        fingerprint = section_fingerprint(request.sectionObject)
+        weights = create_weights(size)
+        catalog = create_catalog(size)
+        for count in (int(c) for c in args.counts.split(",")):
+            for with_catalog in (False, True):
+                runs = {}
+                if not with_catalog:
+                    runs["weighted"] = WeightedStrategy(count=count, weights=weights)
+                for name in samplers:
+                    runs[f"weighted_sample/{name}"] = WeightedSampleStrategy(
+                        count=count,
+                        weights=weights,
+                        sampler=SAMPLERS[name](),
+                        catalog=catalog if with_catalog else None,
+                    )
+                drawn = {}
+                for label, strategy in runs.items():
+                    first, per_rotation, drawn[label] = measure(strategy, request, fingerprint, args.number)
+                    same = "" if label == "weighted" else str(
+                        drawn[label] == drawn[f"weighted_sample/{samplers[0]}"]
+                    )
+                    print(
+                        f"{size:>7} {count:>4} {'yes' if with_catalog else 'no':>7} {label:<24} "
+                        f"{first * 1e3:>9.2f} {per_rotation * 1e3:>12.3f} {same:>5}",
+                        flush=True,
+                    )
+
+
+if __name__ == "__main__":
+    main()
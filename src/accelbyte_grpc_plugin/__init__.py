@@ -4,11 +4,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from concurrent.futures import Executor
 from abc import ABC, abstractmethod
 from enum import Enum, auto as enum_auto
 from logging import Logger
-from typing import Any, Callable, Optional, Protocol, List, Union
+from typing import Any, Awaitable, Callable, Optional, Protocol, List, Tuple, Union
 
 from environs import Env
 
@@ -23,9 +25,16 @@ from opentelemetry.sdk.metrics.export import MetricReader
 from opentelemetry.sdk.resources import Resource, SERVICE_NAME as RESOURCE_SERVICE_NAME
 from opentelemetry.sdk.trace import TracerProvider
 
+from accelbyte_grpc_plugin.startup import StartupTimeline
+from accelbyte_grpc_plugin.workers import get_worker_id
+
 DEFAULT_LOGGER_NAME: str = "extend-app-item-rotation"
 DEFAULT_LOGGER_LEVEL: Union[int, str] = logging.DEBUG
 
+DEFAULT_READINESS_ATTEMPTS: int = 5
+DEFAULT_READINESS_RETRY_DELAY: float = 1.0
+DEFAULT_READINESS_MAX_RETRY_DELAY: float = 30.0
+
 
 class App:
     def __init__(
@@ -34,6 +43,11 @@ class App:
         env: Env,
         opts: Optional[List[AppOpt]] = None,
         logger: Optional[Logger] = None,
+        timeline: Optional[StartupTimeline] = None,
+        fuse_interceptors: bool = False,
+        readiness_attempts: int = DEFAULT_READINESS_ATTEMPTS,
+        readiness_retry_delay: float = DEFAULT_READINESS_RETRY_DELAY,
+        readiness_max_retry_delay: float = DEFAULT_READINESS_MAX_RETRY_DELAY,
         **kwargs,
     ) -> None:
         opts = opts if opts else []
@@ -44,13 +58,41 @@ class App:
         self.port = port
         self.env = env
         self.logger = logger
+        # set when running as one of the processes of a WorkerPool
+        self.worker_id = get_worker_id()
+        self.timeline = timeline if timeline is not None else StartupTimeline()
+        # awaited concurrently once the server has started; the app is ready when all of them are done
+        self.readiness_gates: List[Callable[[], Awaitable[None]]] = []
+        # awaited in order once the gates have passed, e.g. to send warm-up calls
+        self.warm_ups: List[Callable[[], Awaitable[None]]] = []
+        # a failing gate or warm-up is retried with an exponential backoff, then the app stops
+        self.readiness_attempts = readiness_attempts
+        self.readiness_retry_delay = readiness_retry_delay
+        self.readiness_max_retry_delay = readiness_max_retry_delay
+        # why the app gave up getting ready, if it did
+        self.readiness_error: Optional[BaseException] = None
+        # started in the background once the server has started, readiness does not wait for them
+        self.startup_hooks: List[Callable[[], Awaitable[None]]] = []
+        # called with False before the server starts and with True once the app is ready
+        self.readiness_listeners: List[Callable[[bool], Awaitable[None]]] = []
+        self.is_ready = False
 
         v = self.env.str("SERVICE_NAME", self.env.str("OTEL_SERVICE_NAME", None))
         self.service_name = f"extend-app-rt-{v.strip().lower()}" if v else "extend-app-item-rotation"
         self.grpc_interceptors: List[ServerInterceptor] = [aio_server_interceptor()]
+        # run this package's interceptors as one (see FusedServerInterceptor)
+        self.grpc_fuse_interceptors = fuse_interceptors
+        self.grpc_server_options: List[Tuple[str, Any]] = []
+        self.grpc_maximum_concurrent_rpcs: Optional[int] = None
+        self.grpc_compression: Optional[grpc.Compression] = None
+        self.grpc_migration_thread_pool: Optional[Executor] = None
         self.grpc_service_names: List[str] = []
         self.otel_metric_readers: List[MetricReader] = []
         self.otel_resource = Resource({RESOURCE_SERVICE_NAME: self.service_name})
+        if self.worker_id is not None:
+            # all workers listen on the same port
+            self.grpc_server_options.append(("grpc.so_reuseport", 1))
+            self.otel_resource = self.otel_resource.merge(Resource({"worker.id": self.worker_id}))
 
         # apply default options
         self.__apply_opts(opts, AppOptOrder.DEFAULT)
@@ -75,7 +117,20 @@ class App:
 
         # set gRPC server
         self.__apply_opts(opts, AppOptOrder.BEFORE_CREATE_GRPC_SERVER)
-        self.grpc_server = grpc.aio.server(interceptors=self.grpc_interceptors)
+        fused_interceptors = []
+        if self.grpc_fuse_interceptors:
+            from accelbyte_grpc_plugin.interceptors.fused import FusedServerInterceptor, fuse_interceptors
+
+            self.grpc_interceptors = fuse_interceptors(self.grpc_interceptors)
+            fused_interceptors = [i for i in self.grpc_interceptors if isinstance(i, FusedServerInterceptor)]
+            self.logger.info(f"gRPC interceptors fused: {len(fused_interceptors)} pipeline(s)")
+        self.grpc_server = grpc.aio.server(
+            interceptors=self.grpc_interceptors,
+            options=self.grpc_server_options,
+            maximum_concurrent_rpcs=self.grpc_maximum_concurrent_rpcs,
+            compression=self.grpc_compression,
+            migration_thread_pool=self.grpc_migration_thread_pool,
+        )
         self.logger.info("gRPC server set")
         self.__apply_opts(opts, AppOptOrder.AFTER_CREATE_GRPC_SERVER)
 
@@ -83,14 +138,83 @@ class App:
         self.__apply_opts(opts, AppOptOrder.BEFORE_ADD_GRPC_SERVICES)
         self.logger.info("gRPC services set")
         self.__apply_opts(opts, AppOptOrder.AFTER_ADD_GRPC_SERVICES)
+        for fused_interceptor in fused_interceptors:
+            # after the options above compiled the policies the pipelines are built from
+            fused_interceptor.bind_methods(self.grpc_service_names)
+        self.timeline.mark("app created")
 
     async def run(self, termination_timeout: Optional[float] = None) -> None:
+        await self.__notify_readiness(False)
         self.grpc_server.add_insecure_port(f"[::]:{self.port}")
         self.logger.info("gRPC server starting")
         await self.grpc_server.start()
+        self.timeline.mark("gRPC server started")
         self.logger.info("gRPC server started")
-        await self.grpc_server.wait_for_termination(termination_timeout)
+        loop = asyncio.get_running_loop()
+        hooks = [loop.create_task(self.__run_hook(hook)) for hook in self.startup_hooks]
+        # the server answers (health checks included) while the app gets ready
+        readiness = loop.create_task(self.__become_ready())
+        try:
+            await self.grpc_server.wait_for_termination(termination_timeout)
+        finally:
+            readiness.cancel()
+            for hook in hooks:
+                hook.cancel()
         self.logger.info("gRPC server terminated")
+        if self.readiness_error is not None:
+            # exit non-zero, so that the orchestrator (or the WorkerPool) restarts the process
+            raise RuntimeError("app failed to get ready") from self.readiness_error
+
+    async def __become_ready(self) -> None:
+        try:
+            await asyncio.gather(*(self.__pass_gate(gate) for gate in self.readiness_gates))
+            for warm_up in self.warm_ups:
+                await self.__pass_gate(warm_up)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self.logger.error(f"app failed to get ready, stopping: {type(error).__name__}: {error}")
+            self.readiness_error = error
+            await self.grpc_server.stop(grace=None)
+            return
+        self.is_ready = True
+        await self.__notify_readiness(True)
+        self.timeline.mark("ready")
+        self.logger.info(f"app ready in {self.timeline.elapsed():.3f}s ({self.timeline.format()})")
+
+    async def __pass_gate(self, gate: Callable[[], Awaitable[None]]) -> None:
+        name = getattr(gate, "__name__", "gate")
+        delay = self.readiness_retry_delay
+        attempt = 1
+        while True:
+            try:
+                await gate()
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                if attempt >= self.readiness_attempts:
+                    raise
+                self.logger.warning(
+                    f"{name} failed (attempt {attempt} of {self.readiness_attempts}), "
+                    f"retrying in {delay:.1f}s: {type(error).__name__}: {error}"
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.readiness_max_retry_delay)
+            attempt += 1
+        self.timeline.mark(name)
+
+    async def __run_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await hook()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self.logger.error(f"{getattr(hook, '__name__', 'startup hook')} failed: {type(error).__name__}: {error}")
+
+    async def __notify_readiness(self, ready: bool) -> None:
+        for listener in self.readiness_listeners:
+            await listener(ready)
 
     def __apply_opts(
         self, opts: List[AppOpt], order: AppOptOrder, *args, **kwargs
@@ -172,6 +296,28 @@ class AppGRPCServiceOpt(AppOptABC):
         app.grpc_service_names.append(self.service_name)
 
 
+class AppReadinessGateOpt(AppOptABC):
+    """Keeps the app not ready (e.g. NOT_SERVING health) until `gate` completes"""
+
+    def __init__(self, gate: Callable[[], Awaitable[None]], name: Optional[str] = None) -> None:
+        self.gate = gate
+        self.__name__ = f"AppReadinessGateOpt[{name or getattr(gate, '__name__', 'gate')}]"
+
+    def apply(self, app: App, *args, **kwargs) -> None:
+        app.readiness_gates.append(self.gate)
+
+
+class AppStartupHookOpt(AppOptABC):
+    """Runs `hook` in the background once the server has started, without holding readiness back"""
+
+    def __init__(self, hook: Callable[[], Awaitable[None]], name: Optional[str] = None) -> None:
+        self.hook = hook
+        self.__name__ = f"AppStartupHookOpt[{name or getattr(hook, '__name__', 'hook')}]"
+
+    def apply(self, app: App, *args, **kwargs) -> None:
+        app.startup_hooks.append(self.hook)
+
+
 __all__ = [
     "App",
     "AppOpt",
@@ -179,4 +325,6 @@ __all__ = [
     "AppOptOrder",
     "AppGRPCInterceptorOpt",
     "AppGRPCServiceOpt",
+    "AppReadinessGateOpt",
+    "AppStartupHookOpt",
 ]
@@ -0,0 +1,69 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import sys
+from logging import Logger
+from typing import Any, Callable, Coroutine, Optional, Tuple
+
+ASYNCIO: str = "asyncio"
+UVLOOP: str = "uvloop"
+
+EVENT_LOOPS: Tuple[str, ...] = (ASYNCIO, UVLOOP)
+
+
+def get_event_loop_factory(
+    event_loop: str = ASYNCIO,
+    logger: Optional[Logger] = None,
+) -> Tuple[str, Optional[Callable[[], asyncio.AbstractEventLoop]]]:
+    """Name and factory of the event loop to use; None for the default asyncio loop.
+
+    uvloop is optional: when it is asked for but not installed, this falls back to
+    asyncio with a warning instead of failing.
+    """
+    if event_loop not in EVENT_LOOPS:
+        raise ValueError(f"unknown event loop: {event_loop} (expected one of {', '.join(EVENT_LOOPS)})")
+    if event_loop == UVLOOP:
+        try:
+            import uvloop
+        except ImportError:
+            if logger:
+                logger.warning("uvloop is not installed, falling back to the asyncio event loop")
+        else:
+            return UVLOOP, uvloop.new_event_loop
+    return ASYNCIO, None
+
+
+def run(
+    main: Coroutine[Any, Any, Any],
+    event_loop: str = ASYNCIO,
+    logger: Optional[Logger] = None,
+) -> Any:
+    """Like asyncio.run, on the event loop named by `event_loop`"""
+    _, loop_factory = get_event_loop_factory(event_loop, logger=logger)
+    if loop_factory is None:
+        return asyncio.run(main)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            return runner.run(main)
+    loop = loop_factory()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+__all__ = [
+    "ASYNCIO",
+    "EVENT_LOOPS",
+    "UVLOOP",
+    "get_event_loop_factory",
+    "run",
+]
@@ -2,19 +2,32 @@
 # This is licensed software from AccelByte Inc, for limitations
 # and restrictions contact your company contract manager.
 
-from typing import Awaitable, Callable, Optional, Tuple
+import hashlib
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 import grpc
 from grpc import HandlerCallDetails, RpcMethodHandler, StatusCode
 from grpc.aio import ServerInterceptor
+from prometheus_client import Counter, Gauge
 
 from google.protobuf.descriptor import MethodDescriptor
 from google.protobuf.descriptor_pool import Default as DescriptorPool
 
-from accelbyte_grpc_plugin.utils import (
-    get_headers_from_metadata,
-    get_propagator_header_keys,
-)
+from accelbyte_grpc_plugin.utils import MetadataView, iter_method_descriptors
+from accelbyte_grpc_plugin.workers import set_gauge_function
 
 from accelbyte_py_sdk.services.auth import parse_access_token
 from accelbyte_py_sdk.token_validation import TokenValidatorProtocol
@@ -25,14 +38,153 @@ from accelbyte_py_sdk.token_validation._ctypes import (
 )
 
 
+class MethodPolicy(NamedTuple):
+    require_token: bool
+    resource: Optional[str]
+    action: Optional[int]
+
+    @property
+    def requires_auth(self) -> bool:
+        return self.require_token or self.resource is not None or self.action is not None
+
+
+class TokenCacheEntry(NamedTuple):
+    extend_namespace: Optional[str]
+    expires_at: float
+    revocation_epoch: Any
+
+
+class TokenCache:
+    """Bounded LRU cache of tokens that passed validation, keyed by token digest, resource and action.
+
+    An entry expires at the token's `exp` (capped by `max_ttl`) or as soon as the
+    validator's revocation list changes, whichever comes first.
+    """
+
+    DEFAULT_MAX_SIZE: int = 10_000
+    DEFAULT_MAX_TTL: float = 300.0
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_ttl: float = DEFAULT_MAX_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, TokenCacheEntry]" = OrderedDict()
+
+        self.events = Counter(
+            name="grpc_server_auth_token_cache_events",
+            documentation="authorization token cache hits, misses and evictions",
+            labelnames=["event"],
+        )
+        self.hits = self.events.labels(event="hit")
+        self.misses = self.events.labels(event="miss")
+        self.evictions = self.events.labels(event="eviction")
+        self.size = Gauge(
+            name="grpc_server_auth_token_cache_size",
+            documentation="number of entries in the authorization token cache",
+            multiprocess_mode="livesum",
+        )
+        set_gauge_function(self.size, lambda: len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def create_key(token: str, resource: Optional[str], action: Optional[int]) -> bytes:
+        # a cryptographic digest, a forged collision would inherit another token's verdict
+        h = hashlib.blake2b(token.encode(), digest_size=16)
+        h.update(f"\0{resource}\0{action}".encode())
+        return h.digest()
+
+    def get(self, key: bytes, revocation_epoch: Any) -> Optional[TokenCacheEntry]:
+        entry = self._entries.get(key, None)
+        if entry is None:
+            self.misses.inc()
+            return None
+        if entry.expires_at <= self.clock() or entry.revocation_epoch != revocation_epoch:
+            del self._entries[key]
+            self.misses.inc()
+            return None
+        self._entries.move_to_end(key)
+        self.hits.inc()
+        return entry
+
+    def put(
+        self,
+        key: bytes,
+        extend_namespace: Optional[str],
+        expires_at: Optional[float],
+        revocation_epoch: Any,
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        max_expires_at = self.clock() + self.max_ttl
+        expires_at = min(expires_at, max_expires_at) if expires_at is not None else max_expires_at
+        self._entries[key] = TokenCacheEntry(extend_namespace, expires_at, revocation_epoch)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions.inc()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class AuthorizationServerInterceptor(ServerInterceptor):
+    DEFAULT_MAX_UNKNOWN_METHODS: int = 1024
+
     def __init__(
         self,
         token_validator: TokenValidatorProtocol,
         namespace: Optional[str] = None,
+        max_unknown_methods: int = DEFAULT_MAX_UNKNOWN_METHODS,
+        token_cache: Optional[TokenCache] = None,
     ) -> None:
         self.token_validator = token_validator
         self.namespace = namespace
+        self.max_unknown_methods = max_unknown_methods
+        self.token_cache = token_cache
+
+        # validators that can refresh their caches without blocking the event loop
+        self.validate_token_async = getattr(token_validator, "validate_token_async", None)
+
+        # full method path -> policy, None marks a method that does not exist
+        self.policies: Mapping[str, Optional[MethodPolicy]] = MappingProxyType({})
+        self._lazy_policies: Dict[str, Optional[MethodPolicy]] = {}
+
+        # trace headers forwarded to the validator's HTTP calls, which do not propagate them by default
+        self.propagator_metadata = MetadataView.for_propagator()
+
+    def compile_policies(self, service_names: Iterable[str]) -> None:
+        """Resolve the policy of every method of the given services once, so the hot path is a single lookup"""
+        policies: Dict[str, Optional[MethodPolicy]] = {
+            method: self.create_method_policy(method_descriptor)
+            for method, method_descriptor in iter_method_descriptors(service_names)
+        }
+        self.policies = MappingProxyType(policies)
+        self._lazy_policies.clear()
+        # the propagator is configured by now
+        self.propagator_metadata = MetadataView.for_propagator()
+
+    def get_method_policy(self, method: str) -> Optional[MethodPolicy]:
+        try:
+            return self.policies[method]
+        except KeyError:
+            pass
+        try:
+            return self._lazy_policies[method]
+        except KeyError:
+            pass
+
+        method_descriptor = self.get_method_descriptor(method=method)
+        policy = self.create_method_policy(method_descriptor) if method_descriptor else None
+        if len(self._lazy_policies) < self.max_unknown_methods:
+            self._lazy_policies[method] = policy
+        return policy
 
     async def intercept_service(
         self,
@@ -40,27 +192,31 @@ class AuthorizationServerInterceptor(ServerInterceptor):
         handler_call_details: HandlerCallDetails,
     ) -> RpcMethodHandler:
         method = getattr(handler_call_details, "method", "")
-        method_descriptor = self.get_method_descriptor(method=method)
+        policy = self.get_method_policy(method=method)
 
-        if not method_descriptor:
+        if policy is None:
             return self.create_aio_rpc_error(
                 error="method not found", code=StatusCode.INTERNAL
             )
 
-        # Check if method requires Bearer authentication from OpenAPI annotations
-        require_token = self.has_bearer_security(method_descriptor)
-
-        # Extract permission extensions
-        resource, action = self.extract_permissions(method_descriptor)
-
         # Skip auth if no security requirements
-        if not require_token and resource is None and action is None:
+        if not policy.requires_auth:
             return await continuation(handler_call_details)
 
-        # At this point, either Bearer security or permissions are required
-        headers = get_headers_from_metadata(handler_call_details=handler_call_details)
+        if handler := await self.authorize(policy, handler_call_details):
+            return handler
+        return await continuation(handler_call_details)
 
-        authorization = headers.get("authorization", None)
+    async def authorize(
+        self,
+        policy: MethodPolicy,
+        handler_call_details: HandlerCallDetails,
+    ) -> Optional[RpcMethodHandler]:
+        """Check the call against a policy that requires auth; a handler that aborts the call when it is denied"""
+        resource, action = policy.resource, policy.action
+
+        # At this point, either Bearer security or permissions are required
+        authorization = MetadataView.get(handler_call_details, "authorization")
 
         if not authorization:
             return self.create_aio_rpc_error(error="no authorization token found")
@@ -68,21 +224,37 @@ class AuthorizationServerInterceptor(ServerInterceptor):
         if not authorization.startswith("Bearer "):
             return self.create_aio_rpc_error(error="invalid authorization token format")
 
+        token = authorization.removeprefix("Bearer ")
+
+        cache_key: Optional[bytes] = None
+        revocation_epoch: Any = None
+        if self.token_cache is not None:
+            cache_key = self.token_cache.create_key(token, resource, action)
+            # read before validating, so a refresh that happens meanwhile invalidates the entry
+            revocation_epoch = self.get_revocation_epoch()
+            if (entry := self.token_cache.get(cache_key, revocation_epoch)) is not None:
+                return self.check_extend_namespace(entry.extend_namespace)
+
         try:
             # by default, any HTTP calls inside an interceptor does not propagate headers
-            propagator_header_keys = get_propagator_header_keys()
-            propagator_headers = {
-                k: v for k, v in headers.items() if k in propagator_header_keys
-            }
-
-            token = authorization.removeprefix("Bearer ")
-            error = self.token_validator.validate_token(
-                token=token,
-                resource=resource,
-                action=action,
-                namespace=self.namespace,
-                x_additional_headers=propagator_headers,
-            )
+            propagator_headers = self.propagator_metadata.select(handler_call_details)
+
+            if self.validate_token_async is not None:
+                error = await self.validate_token_async(
+                    token=token,
+                    resource=resource,
+                    action=action,
+                    namespace=self.namespace,
+                    x_additional_headers=propagator_headers,
+                )
+            else:
+                error = self.token_validator.validate_token(
+                    token=token,
+                    resource=resource,
+                    action=action,
+                    namespace=self.namespace,
+                    x_additional_headers=propagator_headers,
+                )
             if error is not None:
                 if isinstance(error, InsufficientPermissionsError):
                     return self.create_aio_rpc_error(
@@ -112,19 +284,36 @@ class AuthorizationServerInterceptor(ServerInterceptor):
                     error=f"ParceAccessToken.{type(error).__name__}: {error}",
                     code=StatusCode.UNAUTHENTICATED,
                 )
-            if extend_namespace := claims.get("extend_namespace", None):
-                if extend_namespace != self.namespace:
-                    return self.create_aio_rpc_error(
-                        error=f"'{extend_namespace}' does not match '{self.namespace}'",
-                        code=StatusCode.PERMISSION_DENIED,
-                    )
+            extend_namespace = claims.get("extend_namespace", None)
+            if cache_key is not None:
+                self.token_cache.put(
+                    cache_key,
+                    extend_namespace=extend_namespace,
+                    expires_at=claims.get("exp", None),
+                    revocation_epoch=revocation_epoch,
+                )
+            return self.check_extend_namespace(extend_namespace)
         except Exception as error:
             return self.create_aio_rpc_error(
                 error=f"ParceAccessToken.{type(error).__name__}: {error}",
                 code=StatusCode.INTERNAL,
             )
 
-        return await continuation(handler_call_details)
+    def check_extend_namespace(self, extend_namespace: Optional[str]) -> Optional[RpcMethodHandler]:
+        if extend_namespace and extend_namespace != self.namespace:
+            return self.create_aio_rpc_error(
+                error=f"'{extend_namespace}' does not match '{self.namespace}'",
+                code=StatusCode.PERMISSION_DENIED,
+            )
+        return None
+
+    def get_revocation_epoch(self) -> Any:
+        """Value that changes whenever the validator refreshes its revocation list"""
+        if (version := getattr(self.token_validator, "revocation_list_version", None)) is not None:
+            return version
+        # CachingTokenValidator replaces its bloom filter on every refresh
+        revocation_list_cache = getattr(self.token_validator, "revocation_list_cache", None)
+        return getattr(revocation_list_cache, "_revoked_token_filter", None)
 
     @staticmethod
     def create_aio_rpc_error(error: str, code: StatusCode = StatusCode.UNAUTHENTICATED):
@@ -133,6 +322,16 @@ class AuthorizationServerInterceptor(ServerInterceptor):
 
         return grpc.unary_unary_rpc_method_handler(abort)
 
+    @staticmethod
+    def create_method_policy(method_descriptor: MethodDescriptor) -> MethodPolicy:
+        # Check if method requires Bearer authentication from OpenAPI annotations
+        require_token = AuthorizationServerInterceptor.has_bearer_security(method_descriptor)
+
+        # Extract permission extensions
+        resource, action = AuthorizationServerInterceptor.extract_permissions(method_descriptor)
+
+        return MethodPolicy(require_token=require_token, resource=resource, action=action)
+
     @staticmethod
     def get_method_descriptor(method: str) -> Optional[MethodDescriptor]:
         parts = method.removeprefix("/").split("/")
@@ -216,4 +415,7 @@ class AuthorizationServerInterceptor(ServerInterceptor):
 
 __all__ = [
     "AuthorizationServerInterceptor",
+    "MethodPolicy",
+    "TokenCache",
+    "TokenCacheEntry",
 ]
@@ -0,0 +1,73 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+import grpc
+from grpc import Compression, HandlerCallDetails, RpcMethodHandler
+from grpc.aio import ServerInterceptor
+
+
+class CompressionServerInterceptor(ServerInterceptor):
+    """Compresses unary responses of at least `min_size` bytes with `compression`.
+
+    Small messages gain little from compression and still pay for it in CPU, so
+    the algorithm is only set on the call once the response size is known. The
+    size is the response's `ByteSize()`, or its length when the handler returned
+    pre-serialized bytes. gRPC only compresses if the client accepts the encoding.
+    """
+
+    def __init__(self, compression: Compression, min_size: int) -> None:
+        self.compression = compression
+        self.min_size = min_size
+        # method -> (resolved handler, wrapped handler)
+        self._wrapped_handlers: Dict[str, Tuple[RpcMethodHandler, RpcMethodHandler]] = {}
+
+    async def intercept_service(
+        self,
+        continuation: Callable[[HandlerCallDetails], Awaitable[RpcMethodHandler]],
+        handler_call_details: HandlerCallDetails,
+    ) -> RpcMethodHandler:
+        handler = await continuation(handler_call_details)
+        if handler is None or not inspect.iscoroutinefunction(handler.unary_unary):
+            return handler
+
+        method = handler_call_details.method
+        wrapped = self._wrapped_handlers.get(method, None)
+        if wrapped is not None and wrapped[0] is handler:
+            return wrapped[1]
+
+        compressing = self.wrap_handler(handler)
+        self._wrapped_handlers[method] = (handler, compressing)
+        return compressing
+
+    def wrap_handler(self, handler: RpcMethodHandler) -> RpcMethodHandler:
+        behavior = handler.unary_unary
+        compress = self.compress
+
+        async def unary_unary(request, context):
+            response = await behavior(request, context)
+            await compress(response, context)
+            return response
+
+        return grpc.unary_unary_rpc_method_handler(
+            unary_unary,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+    async def compress(self, response: Any, context: grpc.aio.ServicerContext) -> None:
+        """Set the call's compression if `response` is large enough"""
+        if response is None:
+            return
+        size = len(response) if isinstance(response, bytes) else response.ByteSize()
+        if size >= self.min_size:
+            try:
+                context.set_compression(self.compression)
+            except RuntimeError:
+                # the handler already sent the initial metadata
+                return
+            # the aio server only applies the call's compression when sending initial metadata
+            await context.send_initial_metadata(())
@@ -0,0 +1,359 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import inspect
+import math
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Sequence
+
+import grpc
+from grpc import HandlerCallDetails, RpcMethodHandler, StatusCode
+from grpc.aio import ServerInterceptor
+from prometheus_client import Counter, Gauge
+
+from accelbyte_grpc_plugin.interceptors.metrics import _STATUS_CODES_BY_VALUE
+from accelbyte_grpc_plugin.utils import WarmUpCalls
+
+DEFAULT_CRITICAL_METHODS: Sequence[str] = (
+    "/grpc.health.v1.Health/Check",
+    "/grpc.health.v1.Health/Watch",
+)
+
+# the caller gave up on these, a sign the server took too long
+_DROPPED_CODES = frozenset({StatusCode.CANCELLED, StatusCode.DEADLINE_EXCEEDED})
+
+
+class ConcurrencyLimit(ABC):
+    """Estimate of how many calls the server can handle at once, adapted from the calls it handles.
+
+    Calls are accounted for in windows of at least `window` seconds and
+    `window_size` calls; the limit is adjusted once per window, from the average
+    latency of its calls, the most calls that were in flight, and whether any was
+    dropped, so that it follows the load rather than each call's noise.
+    """
+
+    name: str = ""
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        window: float = 0.1,
+        window_size: int = 10,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                f"expected 1 <= min_limit ({min_limit}) <= initial_limit ({initial_limit}) <= max_limit ({max_limit})"
+            )
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit: float = float(initial_limit)
+        self.window = window
+        self.window_size = window_size
+
+        self._window_start: Optional[float] = None
+        self._window_count = 0
+        self._window_rtt = 0.0
+        self._window_in_flight = 0
+        self._window_dropped = False
+
+    def update(self, rtt: float, in_flight: int, dropped: bool) -> None:
+        """Account for one call: how long it took, the calls in flight when it was admitted, and whether it was dropped"""
+        now = time.perf_counter()
+        if self._window_start is None:
+            self._window_start = now
+        self._window_count += 1
+        self._window_rtt += rtt
+        if in_flight > self._window_in_flight:
+            self._window_in_flight = in_flight
+        self._window_dropped = self._window_dropped or dropped
+        if self._window_count < self.window_size or now - self._window_start < self.window:
+            return
+
+        self.adjust(self._window_rtt / self._window_count, self._window_in_flight, self._window_dropped)
+        self._window_start = now
+        self._window_count = 0
+        self._window_rtt = 0.0
+        self._window_in_flight = 0
+        self._window_dropped = False
+
+    @abstractmethod
+    def adjust(self, rtt: float, in_flight: int, dropped: bool) -> None:
+        """Adjust the limit at the end of a window"""
+
+
+class AIMDLimit(ConcurrencyLimit):
+    """Additive increase, multiplicative decrease.
+
+    The limit grows by one per window while at least half of it is in use, and is
+    multiplied by `backoff_ratio` when a call is dropped or the average latency
+    exceeds `timeout` seconds.
+    """
+
+    name = "aimd"
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 4,
+        max_limit: int = 1000,
+        backoff_ratio: float = 0.9,
+        timeout: float = 0.25,
+        **kwargs,
+    ) -> None:
+        super().__init__(initial_limit, min_limit, max_limit, **kwargs)
+        if not 0.5 <= backoff_ratio < 1.0:
+            raise ValueError(f"expected 0.5 <= backoff_ratio ({backoff_ratio}) < 1.0")
+        self.backoff_ratio = backoff_ratio
+        self.timeout = timeout
+
+    def adjust(self, rtt: float, in_flight: int, dropped: bool) -> None:
+        if dropped or rtt > self.timeout:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        elif in_flight * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1.0)
+
+
+class GradientLimit(ConcurrencyLimit):
+    """Follows the ratio of the long-term average latency to the latest one (Netflix's gradient2).
+
+    While latency stays near its long-term average (an exponential average over
+    about `long_window` windows) the limit grows by about sqrt(limit) per window;
+    once queueing makes calls slower than `tolerance` times that average, the limit
+    shrinks in proportion (by at most half). The long-term average drifts down when
+    latency drops sharply, so it tracks a server that got faster. Nothing changes
+    while less than half of the limit is in use, since that says nothing about how
+    much more the server could take.
+    """
+
+    name = "gradient"
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 4,
+        max_limit: int = 1000,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        long_window: int = 600,
+        **kwargs,
+    ) -> None:
+        super().__init__(initial_limit, min_limit, max_limit, **kwargs)
+        if tolerance < 1.0:
+            raise ValueError(f"expected tolerance ({tolerance}) >= 1.0")
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.long_window = long_window
+        self.long_rtt: Optional[float] = None
+        self._long_count = 0
+
+    def adjust(self, rtt: float, in_flight: int, dropped: bool) -> None:
+        if rtt <= 0.0:
+            return
+        # a plain average over the first windows, then an exponential one
+        self._long_count = min(self._long_count + 1, self.long_window)
+        long_rtt = self.long_rtt if self.long_rtt is not None else rtt
+        long_rtt += (rtt - long_rtt) / (self._long_count if self._long_count < 10 else (self.long_window + 1) / 2)
+        if long_rtt / rtt > 2.0:
+            long_rtt *= 0.95
+        self.long_rtt = long_rtt
+
+        limit = self.limit
+        if in_flight < limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * long_rtt / rtt))
+        new_limit = limit * gradient + math.sqrt(limit)
+        new_limit = limit * (1.0 - self.smoothing) + new_limit * self.smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, new_limit))
+
+
+CONCURRENCY_LIMITS: Dict[str, Callable[..., ConcurrencyLimit]] = {
+    AIMDLimit.name: AIMDLimit,
+    GradientLimit.name: GradientLimit,
+}
+
+
+def create_concurrency_limit(name: str, **kwargs) -> ConcurrencyLimit:
+    try:
+        limit_type = CONCURRENCY_LIMITS[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown concurrency limit: {name} (expected one of {', '.join(CONCURRENCY_LIMITS)})"
+        ) from None
+    return limit_type(**kwargs)
+
+
+class _Call:
+    """A call admitted under the limit, released when the task serving it is done"""
+
+    __slots__ = ("interceptor", "start", "in_flight", "dropped")
+
+    def __init__(self, interceptor: "ConcurrencyLimitServerInterceptor", in_flight: int) -> None:
+        self.interceptor = interceptor
+        self.start = time.perf_counter()
+        self.in_flight = in_flight
+        self.dropped = False
+
+    def done(self, task: "asyncio.Task") -> None:
+        self.interceptor.release(self, dropped=self.dropped or task.cancelled())
+
+
+_current_call: ContextVar[Optional[_Call]] = ContextVar("concurrency_limited_call", default=None)
+
+
+class _LimitedMethod:
+    """Handlers of one method, wrapped once"""
+
+    __slots__ = ("handler", "limited", "rejecting")
+
+    def __init__(self, handler: RpcMethodHandler, limited: RpcMethodHandler, rejecting: RpcMethodHandler) -> None:
+        self.handler = handler
+        self.limited = limited
+        self.rejecting = rejecting
+
+
+class ConcurrencyLimitServerInterceptor(ServerInterceptor):
+    """Sheds unary calls beyond an adaptive concurrency limit with RESOURCE_EXHAUSTED.
+
+    A single event loop has no back-pressure of its own: under a spike it keeps
+    accepting calls, which queue on the loop and all get slower until they time
+    out. Here the calls in flight are capped by `limit`, which adapts to the
+    latency the calls observe, and calls over it fail immediately, before the
+    interceptors after this one run (e.g. token validation), so the client can
+    retry elsewhere.
+
+    A call counts from the moment it reaches this interceptor until the task
+    serving it is done, so the time it spends waiting on a busy loop (for its
+    request message, or to send its response) is part of its latency. The limit
+    acts on the calls that pile up while handlers await (e.g. entitlement or
+    catalog lookups): grpc.aio accepts one new call per turn of its event loop, so
+    when handlers are CPU-bound the backlog stays in gRPC core, out of reach of
+    any interceptor.
+
+    `critical_methods` (the health checks by default) are never shed nor counted,
+    so an overloaded server is not also restarted for failing its probes. Neither
+    are warm-up calls, which would otherwise teach the limit the latency of a cold
+    server.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[ConcurrencyLimit] = None,
+        critical_methods: Iterable[str] = DEFAULT_CRITICAL_METHODS,
+    ) -> None:
+        self.limit = limit if limit is not None else GradientLimit()
+        self.critical_methods = frozenset(critical_methods)
+        self.in_flight = 0
+
+        self.limit_gauge = Gauge(
+            name="grpc_server_concurrency_limit",
+            documentation="current adaptive limit of concurrent gRPC calls",
+            multiprocess_mode="livesum",
+        )
+        self.in_flight_gauge = Gauge(
+            name="grpc_server_concurrency_in_flight",
+            documentation="number of gRPC calls admitted under the concurrency limit and not finished yet",
+            multiprocess_mode="livesum",
+        )
+        self.shed = Counter(
+            name="grpc_server_shed_calls",
+            documentation="number of gRPC calls rejected for exceeding the concurrency limit",
+            labelnames=["grpc_service", "grpc_method"],
+        )
+        self._published_limit = int(self.limit.limit)
+        self.limit_gauge.set(self._published_limit)
+
+        self._methods: Dict[str, _LimitedMethod] = {}
+
+    async def intercept_service(
+        self,
+        continuation: Callable[[HandlerCallDetails], Awaitable[RpcMethodHandler]],
+        handler_call_details: HandlerCallDetails,
+    ) -> RpcMethodHandler:
+        method = handler_call_details.method
+        if method in self.critical_methods or WarmUpCalls.is_warm_up(handler_call_details):
+            return await continuation(handler_call_details)
+
+        limited = self._methods.get(method, None)
+        if limited is not None and self.in_flight >= self.limit.limit:
+            return limited.rejecting
+
+        task = asyncio.current_task()
+        call = None
+        if task is not None:
+            self.in_flight += 1
+            self.in_flight_gauge.inc()
+            call = _Call(self, self.in_flight)
+            task.add_done_callback(call.done)
+            _current_call.set(call)
+
+        handler = await continuation(handler_call_details)
+        if handler is None or not inspect.iscoroutinefunction(handler.unary_unary):
+            if call is not None:
+                # not limited, e.g. a streaming method
+                task.remove_done_callback(call.done)
+                self.release(call, dropped=False, sample=False)
+            return handler
+        if limited is not None and limited.handler is handler:
+            return limited.limited
+
+        service, _, name = method.removeprefix("/").partition("/")
+        shed = self.shed.labels(grpc_service=service, grpc_method=name)
+        limited = _LimitedMethod(handler, self.wrap_handler(handler), self.create_rejecting_handler(shed))
+        self._methods[method] = limited
+        return limited.limited
+
+    @staticmethod
+    def wrap_handler(handler: RpcMethodHandler) -> RpcMethodHandler:
+        behavior = handler.unary_unary
+
+        async def unary_unary(request, context):
+            try:
+                return await behavior(request, context)
+            finally:
+                # calls the client gave up on say the server is too slow
+                call = _current_call.get()
+                if call is not None and _STATUS_CODES_BY_VALUE.get(context.code(), None) in _DROPPED_CODES:
+                    call.dropped = True
+
+        return grpc.unary_unary_rpc_method_handler(
+            unary_unary,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+    def release(self, call: _Call, dropped: bool, sample: bool = True) -> None:
+        self.in_flight -= 1
+        self.in_flight_gauge.dec()
+        if not sample:
+            return
+        self.limit.update(time.perf_counter() - call.start, call.in_flight, dropped)
+        limit = int(self.limit.limit)
+        if limit != self._published_limit:
+            self._published_limit = limit
+            self.limit_gauge.set(limit)
+
+    @staticmethod
+    def create_rejecting_handler(shed) -> RpcMethodHandler:
+        async def reject(ignored_request, context):
+            shed.inc()
+            await context.abort(StatusCode.RESOURCE_EXHAUSTED, "concurrency limit reached")
+
+        return grpc.unary_unary_rpc_method_handler(reject)
+
+
+__all__ = [
+    "AIMDLimit",
+    "CONCURRENCY_LIMITS",
+    "ConcurrencyLimit",
+    "ConcurrencyLimitServerInterceptor",
+    "DEFAULT_CRITICAL_METHODS",
+    "GradientLimit",
+    "create_concurrency_limit",
+]
@@ -0,0 +1,268 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import inspect
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import grpc
+from grpc import HandlerCallDetails, RpcMethodHandler, StatusCode
+from grpc.aio import ServerInterceptor
+
+from accelbyte_grpc_plugin.interceptors.authorization import (
+    AuthorizationServerInterceptor,
+    MethodPolicy,
+)
+from accelbyte_grpc_plugin.interceptors.compression import CompressionServerInterceptor
+from accelbyte_grpc_plugin.interceptors.logging import DebugLoggingServerInterceptor
+from accelbyte_grpc_plugin.interceptors.metrics import MetricsServerInterceptor, _MethodMetrics
+from accelbyte_grpc_plugin.utils import WarmUpCalls, iter_method_descriptors
+
+FUSABLE_INTERCEPTORS: Tuple[type, ...] = (
+    AuthorizationServerInterceptor,
+    CompressionServerInterceptor,
+    DebugLoggingServerInterceptor,
+    MetricsServerInterceptor,
+)
+
+
+def get_fusable_kind(interceptor: ServerInterceptor) -> Optional[type]:
+    for cls in FUSABLE_INTERCEPTORS:
+        if isinstance(interceptor, cls):
+            return cls
+    return None
+
+
+class _MethodPipeline:
+    """What the fused stages need for one method, resolved once"""
+
+    __slots__ = ("policy", "metrics", "wrapped")
+
+    def __init__(self, policy: Optional[MethodPolicy], metrics: Optional[_MethodMetrics]) -> None:
+        self.policy = policy
+        self.metrics = metrics
+        # (resolved handler, fused handler)
+        self.wrapped: Optional[Tuple[RpcMethodHandler, RpcMethodHandler]] = None
+
+
+class FusedServerInterceptor(ServerInterceptor):
+    """Runs several of this package's interceptors as one, with the same behaviour.
+
+    Chained, gRPC awaits every interceptor separately on each call, and the
+    metrics and compression interceptors each wrap the handler in a coroutine of
+    their own. Fused, each method's policy and metric children are resolved once
+    (`bind_methods`) and the handler runs inside a single coroutine that inlines
+    the metrics and compression stages. The stages
+    keep the order in which the interceptors were given: e.g. a call rejected by
+    authorization is not counted by a metrics interceptor that came after it.
+    Warm-up calls go through every stage but the metrics one.
+    """
+
+    def __init__(self, interceptors: Sequence[ServerInterceptor]) -> None:
+        self.interceptors = list(interceptors)
+        self.authorization: Optional[AuthorizationServerInterceptor] = None
+        self.compression: Optional[CompressionServerInterceptor] = None
+        self.logging: Optional[DebugLoggingServerInterceptor] = None
+        self.metrics: Optional[MetricsServerInterceptor] = None
+
+        names = {
+            AuthorizationServerInterceptor: "authorization",
+            CompressionServerInterceptor: "compression",
+            DebugLoggingServerInterceptor: "logging",
+            MetricsServerInterceptor: "metrics",
+        }
+        positions: Dict[str, int] = {}
+        for position, interceptor in enumerate(self.interceptors):
+            kind = get_fusable_kind(interceptor)
+            if kind is None:
+                raise ValueError(f"{type(interceptor).__name__} cannot be fused")
+            if names[kind] in positions:
+                raise ValueError(f"more than one {kind.__name__} to fuse")
+            positions[names[kind]] = position
+            setattr(self, names[kind], interceptor)
+
+        # stages before authorization also see the calls it rejects
+        auth_position = positions.get("authorization", len(self.interceptors))
+        self._log_before_auth = self.logging is not None and positions["logging"] < auth_position
+        self._log_after_auth = self.logging is not None and not self._log_before_auth
+        self._count_before_auth = self.metrics is not None and positions["metrics"] < auth_position
+        self._count_after_auth = self.metrics is not None and not self._count_before_auth
+        self._compress_rejected = self.compression is not None and positions["compression"] < auth_position
+        # an outer compression stage runs after the call's latency was recorded, an inner one before
+        self._compress_after_metrics = (
+            self.compression is not None
+            and self.metrics is not None
+            and positions["compression"] < positions["metrics"]
+        )
+
+        self._pipelines: Dict[str, _MethodPipeline] = {}
+
+    def bind_methods(self, service_names: Iterable[str]) -> None:
+        service_names = list(service_names)
+        if self.metrics is not None:
+            self.metrics.bind_methods(service_names)
+        for method, _ in iter_method_descriptors(service_names):
+            self._pipelines[method] = self._create_pipeline(method)
+
+    def _create_pipeline(self, method: str) -> _MethodPipeline:
+        policy = self.authorization.get_method_policy(method) if self.authorization is not None else None
+        metrics = self.metrics.method_metrics.get(method, None) if self.metrics is not None else None
+        return _MethodPipeline(policy, metrics)
+
+    def _get_method_metrics(self, pipeline: _MethodPipeline, method: str) -> _MethodMetrics:
+        # created on first use like the metrics interceptor does, so unknown methods only get
+        # label children when a call actually reaches the metrics stage
+        if pipeline.metrics is None:
+            pipeline.metrics = self.metrics.method_metrics.get(method, None)
+            if pipeline.metrics is None:
+                pipeline.metrics = self.metrics.method_metrics[method] = _MethodMetrics(self.metrics, method)
+        return pipeline.metrics
+
+    async def intercept_service(
+        self,
+        continuation: Callable[[HandlerCallDetails], Awaitable[RpcMethodHandler]],
+        handler_call_details: HandlerCallDetails,
+    ) -> RpcMethodHandler:
+        method = handler_call_details.method
+        pipeline = self._pipelines.get(method, None)
+        known = pipeline is not None
+        if not known:
+            pipeline = self._create_pipeline(method)
+        counted = self.metrics is not None and not WarmUpCalls.is_warm_up(handler_call_details)
+
+        if self._log_before_auth:
+            self.logging.log_call(handler_call_details)
+        if self._count_before_auth and counted:
+            self.metrics.counter_child.inc(amount=1)
+
+        if self.authorization is not None:
+            policy = pipeline.policy
+            if policy is None:
+                return self._wrap_rejected(
+                    AuthorizationServerInterceptor.create_aio_rpc_error(
+                        error="method not found", code=StatusCode.INTERNAL
+                    ),
+                    pipeline,
+                    method,
+                    counted,
+                )
+            if policy.requires_auth:
+                rejected = await self.authorization.authorize(policy, handler_call_details)
+                if rejected is not None:
+                    return self._wrap_rejected(rejected, pipeline, method, counted)
+
+            if self._log_after_auth:
+                self.logging.log_call(handler_call_details)
+            if self._count_after_auth and counted:
+                self.metrics.counter_child.inc(amount=1)
+
+        handler = await continuation(handler_call_details)
+        if handler is None or not inspect.iscoroutinefunction(handler.unary_unary):
+            return handler
+        if self.metrics is not None and not counted:
+            return self.fuse_handler(handler, None, self.compression)
+
+        wrapped = pipeline.wrapped
+        if wrapped is not None and wrapped[0] is handler:
+            return wrapped[1]
+        metrics = self._get_method_metrics(pipeline, method) if self.metrics is not None else None
+        fused = self.fuse_handler(handler, metrics, self.compression)
+        pipeline.wrapped = (handler, fused)
+        if not known:
+            # only methods that resolved to a handler are kept, which bounds the pipelines
+            self._pipelines[method] = pipeline
+        return fused
+
+    def _wrap_rejected(
+        self, handler: RpcMethodHandler, pipeline: _MethodPipeline, method: str, counted: bool = True
+    ) -> RpcMethodHandler:
+        # only the stages before authorization wrap the handler that rejects the call
+        return self.fuse_handler(
+            handler,
+            self._get_method_metrics(pipeline, method) if self._count_before_auth and counted else None,
+            self.compression if self._compress_rejected else None,
+        )
+
+    def fuse_handler(
+        self,
+        handler: RpcMethodHandler,
+        metrics: Optional[_MethodMetrics],
+        compression: Optional[CompressionServerInterceptor],
+    ) -> RpcMethodHandler:
+        if metrics is None:
+            return compression.wrap_handler(handler) if compression is not None else handler
+
+        behavior = handler.unary_unary
+        in_flight = metrics.in_flight
+        record = metrics.record
+        deserialize_request, serialize_response = MetricsServerInterceptor.instrument_serializers(
+            handler, metrics
+        )
+        compress = compression.compress if compression is not None else None
+        compress_after = compress is not None and self._compress_after_metrics
+        compress_within = compress is not None and not self._compress_after_metrics
+
+        async def unary_unary(request, context):
+            in_flight.inc()
+            start = time.perf_counter()
+            failure: Optional[StatusCode] = None
+            try:
+                response = await behavior(request, context)
+                if compress_within:
+                    await compress(response, context)
+            except asyncio.CancelledError:
+                failure = StatusCode.CANCELLED
+                raise
+            except BaseException:
+                failure = StatusCode.UNKNOWN
+                raise
+            finally:
+                record(context, failure, time.perf_counter() - start)
+            if compress_after:
+                await compress(response, context)
+            return response
+
+        return grpc.unary_unary_rpc_method_handler(
+            unary_unary,
+            request_deserializer=deserialize_request,
+            response_serializer=serialize_response,
+        )
+
+
+def fuse_interceptors(interceptors: Sequence[ServerInterceptor]) -> List[ServerInterceptor]:
+    """Replace each run of consecutive fusable interceptors with one `FusedServerInterceptor`.
+
+    Other interceptors (e.g. OpenTelemetry's, whose wrapper depends on each call)
+    stay where they are, so the overall order is unchanged.
+    """
+    fused: List[ServerInterceptor] = []
+    run: List[ServerInterceptor] = []
+
+    def flush() -> None:
+        if len(run) > 1:
+            fused.append(FusedServerInterceptor(run))
+        else:
+            fused.extend(run)
+        run.clear()
+
+    for interceptor in interceptors:
+        kind = get_fusable_kind(interceptor)
+        if kind is not None:
+            if any(isinstance(other, kind) for other in run):
+                flush()
+            run.append(interceptor)
+        else:
+            flush()
+            fused.append(interceptor)
+    flush()
+    return fused
+
+
+__all__ = [
+    "FUSABLE_INTERCEPTORS",
+    "FusedServerInterceptor",
+    "fuse_interceptors",
+    "get_fusable_kind",
+]
@@ -19,6 +19,9 @@ class DebugLoggingServerInterceptor(ServerInterceptor):
         continuation: Callable[[HandlerCallDetails], Awaitable[RpcMethodHandler]],
         handler_call_details: HandlerCallDetails,
     ) -> RpcMethodHandler:
+        self.log_call(handler_call_details)
+        return await continuation(handler_call_details)
+
+    def log_call(self, handler_call_details: HandlerCallDetails) -> None:
         if self.logger:
             self.logger.debug(f"method: {handler_call_details.method}")
-        return await continuation(handler_call_details)
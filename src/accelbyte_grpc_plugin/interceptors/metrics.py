@@ -2,12 +2,57 @@
 # This is licensed software from AccelByte Inc, for limitations
 # and restrictions contact your company contract manager.
 
+import asyncio
+import inspect
 import platform
-from typing import Any, Awaitable, Callable, Dict, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple
 
-from grpc import HandlerCallDetails, RpcMethodHandler
+import grpc
+from grpc import HandlerCallDetails, RpcMethodHandler, StatusCode
 from grpc.aio import ServerInterceptor
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge, Histogram
+
+from accelbyte_grpc_plugin.utils import WarmUpCalls, iter_method_descriptors
+
+DEFAULT_LATENCY_BUCKETS: Sequence[float] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+DEFAULT_MESSAGE_SIZE_BUCKETS: Sequence[float] = (
+    64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+)
+
+# aio servicer contexts report the status code as a plain int
+_STATUS_CODES_BY_VALUE: Dict[Any, StatusCode] = {
+    **{code.value[0]: code for code in StatusCode},
+    **{code: code for code in StatusCode},
+}
+
+
+class _MethodMetrics:
+    """Label children of one method, bound once so recording a call needs no label lookup"""
+
+    __slots__ = ("in_flight", "latency", "request_size", "response_size")
+
+    def __init__(self, interceptor: "MetricsServerInterceptor", method: str) -> None:
+        service, _, name = method.removeprefix("/").partition("/")
+        self.in_flight = interceptor.in_flight.labels(grpc_service=service, grpc_method=name)
+        self.latency = {
+            code: interceptor.latency.labels(
+                grpc_service=service, grpc_method=name, grpc_code=code.name
+            )
+            for code in StatusCode
+        }
+        self.request_size = interceptor.request_size.labels(grpc_service=service, grpc_method=name)
+        self.response_size = interceptor.response_size.labels(grpc_service=service, grpc_method=name)
+
+    def record(self, context: Any, failure: Optional[StatusCode], elapsed: float) -> None:
+        """Record the end of a call; `failure` is the code implied by an exception the handler raised"""
+        self.in_flight.dec()
+        code = _STATUS_CODES_BY_VALUE.get(context.code(), None)
+        if failure is not None and code in (None, StatusCode.OK):
+            code = failure
+        self.latency[code or StatusCode.OK].observe(elapsed)
 
 
 class MetricsServerInterceptor(ServerInterceptor):
@@ -16,6 +61,8 @@ class MetricsServerInterceptor(ServerInterceptor):
         meter_name: str = "com.accelbyte.app",
         meter_version: str = "1.0.0",
         labels: Optional[Dict[str, Any]] = None,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        message_size_buckets: Sequence[float] = DEFAULT_MESSAGE_SIZE_BUCKETS,
     ) -> None:
         if not labels:
             labels = {"os": platform.system().lower()}
@@ -34,11 +81,113 @@ class MetricsServerInterceptor(ServerInterceptor):
             labelnames=labels.keys(),
             unit=counter_unit,
         )
+        self.counter_child = self.counter.labels(**self.labels)
+
+        method_labelnames = ["grpc_service", "grpc_method"]
+        self.latency = Histogram(
+            name="grpc_server_handling_seconds",
+            documentation="latency of gRPC calls handled by the server",
+            labelnames=[*method_labelnames, "grpc_code"],
+            buckets=latency_buckets,
+        )
+        self.in_flight = Gauge(
+            name="grpc_server_in_flight_calls",
+            documentation="number of gRPC calls currently being handled",
+            labelnames=method_labelnames,
+            multiprocess_mode="livesum",
+        )
+        self.request_size = Histogram(
+            name="grpc_server_request_size_bytes",
+            documentation="size of gRPC request messages",
+            labelnames=method_labelnames,
+            buckets=message_size_buckets,
+        )
+        self.response_size = Histogram(
+            name="grpc_server_response_size_bytes",
+            documentation="size of gRPC response messages",
+            labelnames=method_labelnames,
+            buckets=message_size_buckets,
+        )
+
+        self.method_metrics: Dict[str, _MethodMetrics] = {}
+        # method -> (resolved handler, instrumented handler); continuation returns the same handler per method
+        self._wrapped_handlers: Dict[str, Tuple[RpcMethodHandler, RpcMethodHandler]] = {}
+
+    def bind_methods(self, service_names: Iterable[str]) -> None:
+        for method, _ in iter_method_descriptors(service_names):
+            if method not in self.method_metrics:
+                self.method_metrics[method] = _MethodMetrics(self, method)
 
     async def intercept_service(
         self,
         continuation: Callable[[HandlerCallDetails], Awaitable[RpcMethodHandler]],
         handler_call_details: HandlerCallDetails,
     ) -> RpcMethodHandler:
-        self.counter.labels(**self.labels).inc(amount=1)
-        return await continuation(handler_call_details)
+        if WarmUpCalls.is_warm_up(handler_call_details):
+            return await continuation(handler_call_details)
+
+        self.counter_child.inc(amount=1)
+        handler = await continuation(handler_call_details)
+        if handler is None or not inspect.iscoroutinefunction(handler.unary_unary):
+            return handler
+
+        method = handler_call_details.method
+        wrapped = self._wrapped_handlers.get(method, None)
+        if wrapped is not None and wrapped[0] is handler:
+            return wrapped[1]
+
+        metrics = self.method_metrics.get(method, None)
+        if metrics is None:
+            metrics = self.method_metrics[method] = _MethodMetrics(self, method)
+        instrumented = self.instrument_handler(handler, metrics)
+        self._wrapped_handlers[method] = (handler, instrumented)
+        return instrumented
+
+    @staticmethod
+    def instrument_serializers(
+        handler: RpcMethodHandler, metrics: _MethodMetrics
+    ) -> Tuple[Callable[[bytes], Any], Callable[[Any], bytes]]:
+        request_deserializer = handler.request_deserializer
+        response_serializer = handler.response_serializer
+
+        # sizes are taken from the wire bytes the (de)serializers already handle
+        def deserialize_request(data: bytes) -> Any:
+            metrics.request_size.observe(len(data))
+            return request_deserializer(data) if request_deserializer else data
+
+        def serialize_response(message: Any) -> bytes:
+            data = response_serializer(message) if response_serializer else message
+            metrics.response_size.observe(len(data))
+            return data
+
+        return deserialize_request, serialize_response
+
+    @staticmethod
+    def instrument_handler(handler: RpcMethodHandler, metrics: _MethodMetrics) -> RpcMethodHandler:
+        behavior = handler.unary_unary
+        in_flight = metrics.in_flight
+        record = metrics.record
+        deserialize_request, serialize_response = MetricsServerInterceptor.instrument_serializers(
+            handler, metrics
+        )
+
+        async def unary_unary(request, context):
+            in_flight.inc()
+            start = time.perf_counter()
+            failure: Optional[StatusCode] = None
+            try:
+                return await behavior(request, context)
+            except asyncio.CancelledError:
+                failure = StatusCode.CANCELLED
+                raise
+            except BaseException:
+                failure = StatusCode.UNKNOWN
+                raise
+            finally:
+                record(context, failure, time.perf_counter() - start)
+
+        return grpc.unary_unary_rpc_method_handler(
+            unary_unary,
+            request_deserializer=deserialize_request,
+            response_serializer=serialize_response,
+        )
@@ -0,0 +1,256 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import base64
+import binascii
+import inspect
+import json
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+import grpc
+from grpc import HandlerCallDetails, RpcMethodHandler, StatusCode
+from grpc.aio import ServerInterceptor
+from prometheus_client import Counter, Gauge
+
+from accelbyte_grpc_plugin.interceptors.concurrency import DEFAULT_CRITICAL_METHODS
+from accelbyte_grpc_plugin.utils import WarmUpCalls
+from accelbyte_grpc_plugin.workers import set_gauge_function
+
+KEY_NAMESPACE: str = "namespace"
+KEY_USER: str = "user"
+KEY_CLAIM_PREFIX: str = "claim:"
+
+
+class RateLimit(NamedTuple):
+    rate: float
+    """tokens added per second"""
+    burst: int
+    """most tokens a bucket holds, i.e. calls allowed at once after being idle"""
+
+
+def check_rate_limit(limit: RateLimit, name: str) -> RateLimit:
+    """Raises ValueError for a limit that could never let a call through again once its burst is spent"""
+    if not limit.rate > 0.0:
+        raise ValueError(f"{name}: rate must be above 0, got {limit.rate}")
+    if limit.burst < 1:
+        raise ValueError(f"{name}: burst must be at least 1, got {limit.burst}")
+    return limit
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+# rough size of one bucket entry, without its key string: the bucket, its two floats, the key tuple and the dict slot
+_BUCKET_ENTRY_SIZE: int = (
+    sys.getsizeof(_Bucket(0.0, 0.0)) + 2 * sys.getsizeof(0.0) + sys.getsizeof(("", "")) + 3 * 8
+)
+
+
+def get_token_claim(authorization: Optional[str], claim: str) -> Optional[str]:
+    """A claim of a bearer token, read without verifying it: the authorization interceptor already did"""
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    try:
+        payload = authorization[7:].split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError, binascii.Error):
+        return None
+    value = claims.get(claim, None) if isinstance(claims, dict) else None
+    return str(value) if value is not None else None
+
+
+def create_rate_limit_key(key: str) -> Callable[[Any, Any], Optional[str]]:
+    """Function of (request, context) that returns what the calls are limited by"""
+    if key == KEY_NAMESPACE:
+        return lambda request, context: getattr(request, "namespace", None) or None
+    if key == KEY_USER:
+        return lambda request, context: getattr(request, "userId", None) or None
+    if key.startswith(KEY_CLAIM_PREFIX) and len(key) > len(KEY_CLAIM_PREFIX):
+        claim = key[len(KEY_CLAIM_PREFIX):]
+
+        def get_claim(request, context) -> Optional[str]:
+            for metadatum in context.invocation_metadata() or ():
+                if metadatum[0] == "authorization":
+                    return get_token_claim(metadatum[1], claim)
+            return None
+
+        return get_claim
+    raise ValueError(
+        f"unknown rate limit key: {key} (expected {KEY_NAMESPACE}, {KEY_USER} or {KEY_CLAIM_PREFIX}<name>)"
+    )
+
+
+class RateLimitServerInterceptor(ServerInterceptor):
+    """Limits unary calls per key with token buckets, rejecting the excess with RESOURCE_EXHAUSTED.
+
+    Calls are keyed by the request's `namespace`, its `userId`, or a claim of the
+    bearer token (`claim:sub`), see `create_rate_limit_key`. Each method gets
+    `limits[name]` (by method name or full path), else `default_limit`, else is
+    not limited. Calls without a key are not limited either, unless `keyless_limit`
+    is given: they then share one bucket per method, with that limit. Neither are
+    `critical_methods` (the health checks by default).
+
+    Buckets are refilled lazily, when a call needs them, so idle keys cost no
+    timers. At most `max_buckets` are kept, the least recently used one is evicted
+    first (a key that comes back starts with a full bucket). Warm-up calls are not
+    limited and take no bucket.
+    """
+
+    DEFAULT_MAX_BUCKETS: int = 100_000
+
+    def __init__(
+        self,
+        key: str = KEY_USER,
+        default_limit: Optional[RateLimit] = None,
+        limits: Optional[Mapping[str, RateLimit]] = None,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+        clock: Callable[[], float] = time.monotonic,
+        keyless_limit: Optional[RateLimit] = None,
+        critical_methods: Iterable[str] = DEFAULT_CRITICAL_METHODS,
+    ) -> None:
+        self.key = key
+        self.get_key = create_rate_limit_key(key)
+        self.default_limit = check_rate_limit(default_limit, "default limit") if default_limit else None
+        self.limits = {
+            method: check_rate_limit(limit, f"limit of {method}") for method, limit in (limits or {}).items()
+        }
+        self.keyless_limit = check_rate_limit(keyless_limit, "keyless limit") if keyless_limit else None
+        self.critical_methods = frozenset(critical_methods)
+        self.max_buckets = max_buckets
+        self.clock = clock
+
+        # (full method path, key) -> bucket, least recently used first; keyless calls use the key None
+        self._buckets: "OrderedDict[Tuple[str, Optional[str]], _Bucket]" = OrderedDict()
+        self._key_sizes = 0
+        # method -> (resolved handler, limited handler)
+        self._wrapped_handlers: Dict[str, Tuple[RpcMethodHandler, RpcMethodHandler]] = {}
+
+        self.decisions = Counter(
+            name="grpc_server_rate_limit_decisions",
+            documentation="number of gRPC calls allowed and rejected by the rate limiter",
+            labelnames=["grpc_service", "grpc_method", "decision"],
+        )
+        self.evictions = Counter(
+            name="grpc_server_rate_limit_evictions",
+            documentation="number of rate limit buckets evicted to stay within the maximum",
+        )
+        self.size = Gauge(
+            name="grpc_server_rate_limit_buckets",
+            documentation="number of rate limit buckets held",
+            multiprocess_mode="livesum",
+        )
+        set_gauge_function(self.size, lambda: len(self._buckets))
+        self.memory = Gauge(
+            name="grpc_server_rate_limit_memory_bytes",
+            documentation="estimated memory held by the rate limit buckets",
+            multiprocess_mode="livesum",
+        )
+        set_gauge_function(self.memory, self.estimate_memory)
+
+    def get_method_limit(self, method: str) -> Optional[RateLimit]:
+        limit = self.limits.get(method, None)
+        if limit is None:
+            limit = self.limits.get(method.rpartition("/")[2], None)
+        return limit if limit is not None else self.default_limit
+
+    def estimate_memory(self) -> int:
+        return sys.getsizeof(self._buckets) + len(self._buckets) * _BUCKET_ENTRY_SIZE + self._key_sizes
+
+    async def intercept_service(
+        self,
+        continuation: Callable[[HandlerCallDetails], Awaitable[RpcMethodHandler]],
+        handler_call_details: HandlerCallDetails,
+    ) -> RpcMethodHandler:
+        handler = await continuation(handler_call_details)
+        if handler is None or not inspect.iscoroutinefunction(handler.unary_unary):
+            return handler
+        method = handler_call_details.method
+        if method in self.critical_methods or WarmUpCalls.is_warm_up(handler_call_details):
+            return handler
+
+        wrapped = self._wrapped_handlers.get(method, None)
+        if wrapped is not None and wrapped[0] is handler:
+            return wrapped[1]
+
+        limit = self.get_method_limit(method)
+        limited = self.wrap_handler(handler, method, limit) if limit is not None else handler
+        self._wrapped_handlers[method] = (handler, limited)
+        return limited
+
+    def wrap_handler(self, handler: RpcMethodHandler, method: str, limit: RateLimit) -> RpcMethodHandler:
+        behavior = handler.unary_unary
+        get_key = self.get_key
+        acquire = self.acquire
+        keyless_limit = self.keyless_limit
+        service, _, name = method.removeprefix("/").partition("/")
+        allowed = self.decisions.labels(grpc_service=service, grpc_method=name, decision="allowed")
+        rejected = self.decisions.labels(grpc_service=service, grpc_method=name, decision="rejected")
+
+        async def unary_unary(request, context):
+            key = get_key(request, context)
+            if key is not None:
+                wait = acquire(method, key, limit)
+            elif keyless_limit is not None:
+                wait = acquire(method, None, keyless_limit)
+            else:
+                return await behavior(request, context)
+            if wait > 0.0:
+                rejected.inc()
+                await context.abort(
+                    StatusCode.RESOURCE_EXHAUSTED, f"rate limit exceeded, retry in {wait:.3f}s"
+                )
+            allowed.inc()
+            return await behavior(request, context)
+
+        return grpc.unary_unary_rpc_method_handler(
+            unary_unary,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+    def acquire(self, method: str, key: Optional[str], limit: RateLimit) -> float:
+        """Take a token from the bucket of (method, key); 0.0 if there was one, else the seconds until there is"""
+        now = self.clock()
+        bucket_key = (method, key)
+        bucket = self._buckets.get(bucket_key, None)
+        if bucket is None:
+            bucket = self._buckets[bucket_key] = _Bucket(float(limit.burst), now)
+            self._key_sizes += sys.getsizeof(key)
+            while len(self._buckets) > self.max_buckets:
+                (_, evicted_key), _ = self._buckets.popitem(last=False)
+                self._key_sizes -= sys.getsizeof(evicted_key)
+                self.evictions.inc()
+        else:
+            self._buckets.move_to_end(bucket_key)
+            bucket.tokens = min(float(limit.burst), bucket.tokens + (now - bucket.updated) * limit.rate)
+            bucket.updated = now
+
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            return 0.0
+        return (1.0 - bucket.tokens) / limit.rate
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._key_sizes = 0
+
+
+__all__ = [
+    "KEY_CLAIM_PREFIX",
+    "KEY_NAMESPACE",
+    "KEY_USER",
+    "RateLimit",
+    "RateLimitServerInterceptor",
+    "check_rate_limit",
+    "create_rate_limit_key",
+    "get_token_claim",
+]
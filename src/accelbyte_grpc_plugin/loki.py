@@ -0,0 +1,197 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import gzip
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from prometheus_client import REGISTRY, CollectorRegistry, Counter
+
+DROP_NEWEST: str = "drop_newest"
+DROP_OLDEST: str = "drop_oldest"
+
+LokiEntry = Tuple[Tuple[Tuple[str, str], ...], str, str]
+
+
+class BatchingLokiHandler(logging.Handler):
+    """Logging handler that ships records to Loki (push API v1) from a background thread.
+
+    `emit` only formats the record and enqueues it. The worker sends a batch when
+    `batch_size` records are queued or `flush_interval` seconds have passed, gzips
+    the push body and retries with exponential backoff. The queue is bounded;
+    when it is full the newest or the oldest record is dropped, per `drop_policy`.
+    """
+
+    RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        url: str,
+        tags: Optional[Dict[str, str]] = None,
+        auth: Optional[Tuple[str, str]] = None,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10_000,
+        drop_policy: str = DROP_NEWEST,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        timeout: float = 5.0,
+        compress: bool = True,
+        registry: Optional[CollectorRegistry] = REGISTRY,
+    ) -> None:
+        super().__init__()
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"unknown drop policy: {drop_policy}")
+
+        self.url = url
+        self.tags = dict(tags or {})
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.compress = compress
+
+        self.session = requests.Session()
+        self.session.auth = auth
+        self.session.headers["Content-Type"] = "application/json"
+        if compress:
+            self.session.headers["Content-Encoding"] = "gzip"
+
+        self.records = Counter(
+            name="loki_handler_records",
+            documentation="log records handled by the batching Loki handler",
+            labelnames=["outcome"],
+            registry=registry,
+        )
+        self.sent = self.records.labels(outcome="sent")
+        self.dropped_queue_full = self.records.labels(outcome="dropped_queue_full")
+        self.dropped_send_failed = self.records.labels(outcome="dropped_send_failed")
+
+        self._queue: "queue.Queue[LokiEntry]" = queue.Queue(maxsize=max_queue_size)
+        self._flush_requested = threading.Event()
+        self._closing = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name="loki-handler", daemon=True
+        )
+        self._worker.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry = (self.build_labels(record), str(time.time_ns()), self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        try:
+            self._queue.put_nowait(entry)
+            return
+        except queue.Full:
+            pass
+        if self.drop_policy == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                pass
+        self.dropped_queue_full.inc()
+
+    def build_labels(self, record: logging.LogRecord) -> Tuple[Tuple[str, str], ...]:
+        labels = dict(self.tags)
+        labels["severity"] = record.levelname.lower()
+        labels["logger"] = record.name
+        extra_tags = getattr(record, "tags", None)
+        if isinstance(extra_tags, dict):
+            for k, v in extra_tags.items():
+                labels[str(k)] = str(v)
+        return tuple(sorted(labels.items()))
+
+    def flush(self) -> None:
+        self._flush_requested.set()
+
+    def close(self) -> None:
+        if not self._closing.is_set():
+            self._closing.set()
+            self._flush_requested.set()
+            self._worker.join(timeout=self.timeout * 2)
+            self.session.close()
+        super().close()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch:
+                self._send(batch)
+            elif self._closing.is_set():
+                return
+
+    def _collect(self) -> List[LokiEntry]:
+        batch: List[LokiEntry] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._flush_requested.is_set() or self._closing.is_set():
+                self._flush_requested.clear()
+                # drain what is already queued, then send right away (a single flush request is
+                # used up by the first batch, so closing keeps every later batch from waiting too)
+                deadline = time.monotonic()
+            try:
+                timeout = deadline - time.monotonic()
+                if timeout > 0:
+                    batch.append(self._queue.get(timeout=min(timeout, 0.1)))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                if time.monotonic() >= deadline:
+                    break
+        return batch
+
+    def build_payload(self, batch: List[LokiEntry]) -> bytes:
+        streams: Dict[Tuple[Tuple[str, str], ...], List[List[str]]] = {}
+        for labels, ts, line in batch:
+            streams.setdefault(labels, []).append([ts, line])
+        body: Dict[str, Any] = {
+            "streams": [
+                {"stream": dict(labels), "values": values}
+                for labels, values in streams.items()
+            ]
+        }
+        data = json.dumps(body, separators=(",", ":")).encode()
+        return gzip.compress(data, compresslevel=6) if self.compress else data
+
+    def _send(self, batch: List[LokiEntry]) -> None:
+        data = self.build_payload(batch)
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(self.url, data=data, timeout=self.timeout)
+                if response.status_code < 300:
+                    self.sent.inc(len(batch))
+                    return
+                if response.status_code not in self.RETRYABLE_STATUS_CODES:
+                    break
+            except requests.RequestException:
+                pass
+            if attempt < self.max_retries:
+                backoff = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+                # full jitter; cut short when closing so shutdown is not held up
+                if self._closing.wait(random.uniform(0, backoff)):
+                    break
+        self.dropped_send_failed.inc(len(batch))
+
+
+__all__ = [
+    "BatchingLokiHandler",
+    "DROP_NEWEST",
+    "DROP_OLDEST",
+]
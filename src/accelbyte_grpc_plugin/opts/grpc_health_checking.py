@@ -10,13 +10,30 @@ from accelbyte_grpc_plugin import App, AppOptABC, AppOptOrder
 
 
 class GRPCHealthCheckingOpt(AppOptABC):
+    """Serves grpc.health.v1.Health, reporting NOT_SERVING until the app is ready.
+
+    The overall status ("") and the status of each registered service follow
+    `App.readiness_gates`, so load balancers hold traffic back while the app is
+    still logging in or warming up.
+    """
+
     def apply_order(self) -> AppOptOrder:
         return AppOptOrder.BEFORE_ADD_GRPC_SERVICES
 
     def apply(self, app: App, *args, **kwargs) -> None:
+        servicer = health.aio.HealthServicer()
         app.grpc_service_names.append(
             health_pb2.DESCRIPTOR.services_by_name["Health"].full_name
         )
-        health_pb2_grpc.add_HealthServicer_to_server(
-            health.aio.HealthServicer(), app.grpc_server
-        )
+        health_pb2_grpc.add_HealthServicer_to_server(servicer, app.grpc_server)
+
+        async def on_readiness(ready: bool) -> None:
+            status = (
+                health_pb2.HealthCheckResponse.SERVING
+                if ready
+                else health_pb2.HealthCheckResponse.NOT_SERVING
+            )
+            for service_name in ["", *app.grpc_service_names]:
+                await servicer.set(service_name, status)
+
+        app.readiness_listeners.append(on_readiness)
@@ -0,0 +1,138 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from environs import Env
+from grpc import Compression
+
+from accelbyte_grpc_plugin import App, AppOptABC, AppOptOrder
+from accelbyte_grpc_plugin.interceptors.compression import CompressionServerInterceptor
+
+COMPRESSION_ALGORITHMS = {
+    "none": Compression.NoCompression,
+    "deflate": Compression.Deflate,
+    "gzip": Compression.Gzip,
+}
+
+# field -> gRPC channel argument
+CHANNEL_ARGS = {
+    "max_receive_message_length": "grpc.max_receive_message_length",
+    "max_send_message_length": "grpc.max_send_message_length",
+    "max_concurrent_streams": "grpc.max_concurrent_streams",
+    "keepalive_time_ms": "grpc.keepalive_time_ms",
+    "keepalive_timeout_ms": "grpc.keepalive_timeout_ms",
+    "keepalive_permit_without_calls": "grpc.keepalive_permit_without_calls",
+    "http2_max_pings_without_data": "grpc.http2.max_pings_without_data",
+    "http2_min_ping_interval_without_data_ms": "grpc.http2.min_ping_interval_without_data_ms",
+    "http2_max_ping_strikes": "grpc.http2.max_ping_strikes",
+    "max_connection_idle_ms": "grpc.max_connection_idle_ms",
+    "max_connection_age_ms": "grpc.max_connection_age_ms",
+    "max_connection_age_grace_ms": "grpc.max_connection_age_grace_ms",
+}
+
+
+class GRPCServerOptions(NamedTuple):
+    """Settings of the gRPC server; None leaves the gRPC default in place"""
+
+    maximum_concurrent_rpcs: Optional[int] = None
+    max_receive_message_length: Optional[int] = None
+    max_send_message_length: Optional[int] = None
+    max_concurrent_streams: Optional[int] = None
+    keepalive_time_ms: Optional[int] = None
+    keepalive_timeout_ms: Optional[int] = None
+    keepalive_permit_without_calls: Optional[bool] = None
+    http2_max_pings_without_data: Optional[int] = None
+    http2_min_ping_interval_without_data_ms: Optional[int] = None
+    http2_max_ping_strikes: Optional[int] = None
+    max_connection_idle_ms: Optional[int] = None
+    max_connection_age_ms: Optional[int] = None
+    max_connection_age_grace_ms: Optional[int] = None
+    # "none", "deflate" or "gzip"; with compression_min_size only responses at least that large are compressed
+    compression: Optional[str] = None
+    compression_min_size: int = 0
+    migration_thread_pool_workers: Optional[int] = None
+
+    @classmethod
+    def from_env(cls, env: Env) -> "GRPCServerOptions":
+        """Read the options from the PLUGIN_GRPC_SERVER_* variables (e.g. PLUGIN_GRPC_SERVER_KEEPALIVE_TIME_MS)"""
+        with env.prefixed("PLUGIN_GRPC_SERVER_"):
+            options = cls(
+                maximum_concurrent_rpcs=env.int("MAXIMUM_CONCURRENT_RPCS", None),
+                compression=env.str("COMPRESSION", None),
+                compression_min_size=env.int("COMPRESSION_MIN_SIZE", 0),
+                migration_thread_pool_workers=env.int("MIGRATION_THREAD_POOL_WORKERS", None),
+                keepalive_permit_without_calls=env.bool("KEEPALIVE_PERMIT_WITHOUT_CALLS", None),
+                **{
+                    field: env.int(field.upper(), None)
+                    for field in CHANNEL_ARGS
+                    if field != "keepalive_permit_without_calls"
+                },
+            )
+        options.get_compression()
+        return options
+
+    def get_channel_args(self) -> List[Tuple[str, Any]]:
+        args: List[Tuple[str, Any]] = []
+        for field, arg in CHANNEL_ARGS.items():
+            value = getattr(self, field)
+            if value is not None:
+                args.append((arg, int(value)))
+        return args
+
+    def get_compression(self) -> Optional[Compression]:
+        if self.compression is None:
+            return None
+        try:
+            return COMPRESSION_ALGORITHMS[self.compression.lower()]
+        except KeyError:
+            raise ValueError(
+                f"unknown gRPC compression: {self.compression} (expected one of {', '.join(COMPRESSION_ALGORITHMS)})"
+            ) from None
+
+    def describe(self) -> str:
+        return ", ".join(
+            f"{field}={'default' if value is None else value}"
+            for field, value in self._asdict().items()
+        )
+
+
+class GRPCServerOptionsOpt(AppOptABC):
+    """Applies `GRPCServerOptions` to the server the app is about to create and logs the result"""
+
+    def __init__(self, options: Optional[GRPCServerOptions] = None) -> None:
+        self.options = options
+
+    def apply_order(self) -> AppOptOrder:
+        return AppOptOrder.BEFORE_CREATE_GRPC_SERVER
+
+    def apply(self, app: App, *args, **kwargs) -> None:
+        options = self.options if self.options is not None else GRPCServerOptions.from_env(app.env)
+
+        app.grpc_server_options.extend(options.get_channel_args())
+        if options.maximum_concurrent_rpcs is not None:
+            app.grpc_maximum_concurrent_rpcs = options.maximum_concurrent_rpcs
+        if options.migration_thread_pool_workers is not None:
+            app.grpc_migration_thread_pool = ThreadPoolExecutor(
+                max_workers=options.migration_thread_pool_workers,
+                thread_name_prefix="grpc-migration",
+            )
+
+        compression = options.get_compression()
+        if compression is not None and compression != Compression.NoCompression:
+            if options.compression_min_size > 0:
+                app.grpc_interceptors.append(
+                    CompressionServerInterceptor(compression, options.compression_min_size)
+                )
+            else:
+                app.grpc_compression = compression
+
+        app.logger.info(f"gRPC server options: {options.describe()}")
+
+
+__all__ = [
+    "GRPCServerOptions",
+    "GRPCServerOptionsOpt",
+]
@@ -2,9 +2,8 @@
 # This is licensed software from AccelByte Inc, for limitations
 # and restrictions contact your company contract manager.
 
-import logging_loki
-
 from accelbyte_grpc_plugin import App, AppOptABC
+from accelbyte_grpc_plugin.loki import DROP_NEWEST
 
 
 class LokiOpt(AppOptABC):
@@ -14,11 +13,21 @@ class LokiOpt(AppOptABC):
         username: str = "",
         password: str = "",
         version: str = "1",
+        batching: bool = True,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10_000,
+        drop_policy: str = DROP_NEWEST,
     ) -> None:
         self.url = url
         self.username = username
         self.password = password
         self.version = version
+        self.batching = batching
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.drop_policy = drop_policy
 
     def apply(self, app: App, *args, **kwargs) -> None:
         with app.env.prefixed(prefix="LOKI_"):
@@ -27,5 +36,20 @@ class LokiOpt(AppOptABC):
             password = app.env("PASSWORD", self.password)
             version = app.env("VERSION", self.version)
             auth = (username, password) if username else None
-            hdlr = logging_loki.LokiHandler(url=url, auth=auth, version=version)
+            # the batching handler only speaks the v1 push API
+            if app.env.bool("BATCHING_ENABLED", self.batching) and version == "1":
+                from accelbyte_grpc_plugin.loki import BatchingLokiHandler
+
+                hdlr = BatchingLokiHandler(
+                    url=url,
+                    auth=auth,
+                    batch_size=app.env.int("BATCH_SIZE", self.batch_size),
+                    flush_interval=app.env.float("FLUSH_INTERVAL", self.flush_interval),
+                    max_queue_size=app.env.int("MAX_QUEUE_SIZE", self.max_queue_size),
+                    drop_policy=app.env("DROP_POLICY", self.drop_policy),
+                )
+            else:
+                import logging_loki
+
+                hdlr = logging_loki.LokiHandler(url=url, auth=auth, version=version)
             app.logger.addHandler(hdlr=hdlr)
@@ -0,0 +1,20 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+from accelbyte_grpc_plugin import App, AppOptABC, AppOptOrder
+from accelbyte_grpc_plugin.interceptors.metrics import MetricsServerInterceptor
+
+
+class MetricsBindMethodsOpt(AppOptABC):
+    def __init__(self, interceptor: MetricsServerInterceptor) -> None:
+        self.interceptor = interceptor
+
+    def apply_order(self) -> AppOptOrder:
+        return AppOptOrder.AFTER_ADD_GRPC_SERVICES
+
+    def apply(self, app: App, *args, **kwargs) -> None:
+        self.interceptor.bind_methods(app.grpc_service_names)
+        app.logger.info(
+            f"metrics bound for {len(self.interceptor.method_metrics)} method(s)"
+        )
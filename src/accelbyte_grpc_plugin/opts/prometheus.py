@@ -2,14 +2,90 @@
 # This is licensed software from AccelByte Inc, for limitations
 # and restrictions contact your company contract manager.
 
+import socket
 import threading
+import time
+from typing import Callable, Iterable, Tuple
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
 
-from flask import Flask
+from environs import Env
 from opentelemetry.exporter.prometheus import PrometheusMetricReader
-from prometheus_client import start_http_server, make_wsgi_app
-from werkzeug.middleware.dispatcher import DispatcherMiddleware
+from prometheus_client import REGISTRY, CollectorRegistry, Histogram, make_wsgi_app
+from prometheus_client.exposition import ThreadingWSGIServer
 
 from accelbyte_grpc_plugin import App, AppOptABC, AppOptOrder
+from accelbyte_grpc_plugin.workers import is_prometheus_multiprocess
+
+
+class _SilentRequestHandler(WSGIRequestHandler):
+    # noinspection PyShadowingBuiltins
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def create_metrics_wsgi_app(endpoint: str, registry: CollectorRegistry = REGISTRY) -> Callable:
+    """WSGI app serving the exposition (gzip when accepted) on `endpoint` only, and timing every scrape"""
+    metrics_app = make_wsgi_app(registry)
+    scrape_duration = Histogram(
+        name="metrics_scrape_duration_seconds",
+        documentation="time spent rendering the metrics exposition",
+        registry=registry,
+    )
+    endpoint = endpoint.rstrip("/") or "/"
+
+    def app(environ, start_response) -> Iterable[bytes]:
+        path = environ.get("PATH_INFO", "").rstrip("/") or "/"
+        if path != endpoint:
+            start_response("404 Not Found", [("Content-Type", "text/plain")])
+            return [b"Not Found"]
+        start = time.perf_counter()
+        try:
+            return metrics_app(environ, start_response)
+        finally:
+            scrape_duration.observe(time.perf_counter() - start)
+
+    return app
+
+
+def start_metrics_server(
+    addr: str,
+    port: int,
+    endpoint: str,
+    registry: CollectorRegistry = REGISTRY,
+) -> Tuple[WSGIServer, threading.Thread]:
+    class Server(ThreadingWSGIServer):
+        address_family = socket.getaddrinfo(addr, port, type=socket.SOCK_STREAM)[0][0]
+
+    httpd = make_server(
+        addr,
+        port,
+        create_metrics_wsgi_app(endpoint, registry),
+        server_class=Server,
+        handler_class=_SilentRequestHandler,
+    )
+    thread = threading.Thread(target=httpd.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return httpd, thread
+
+
+def create_multiprocess_registry() -> CollectorRegistry:
+    """Registry aggregating the metrics the worker processes write to PROMETHEUS_MULTIPROC_DIR"""
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def get_metrics_server_settings(env: Env, service_name: str = "") -> Tuple[str, int, str, str]:
+    """Address, port, endpoint and OpenTelemetry metric prefix, from the PROMETHEUS_* variables"""
+    with env.prefixed(prefix="PROMETHEUS_"):
+        return (
+            env("ADDR", "0.0.0.0"),
+            env.int("PORT", 8080),
+            env("ENDPOINT", "/metrics"),
+            env("PREFIX", service_name),
+        )
 
 
 class PrometheusOpt(AppOptABC):
@@ -17,21 +93,13 @@ class PrometheusOpt(AppOptABC):
         return AppOptOrder.BEFORE_SET_OTEL_METER_PROVIDER
 
     def apply(self, app: App, *args, **kwargs) -> None:
-        with app.env.prefixed(prefix="PROMETHEUS_"):
-            addr = app.env("ADDR", "0.0.0.0")
-            port = app.env.int("PORT", 8080)
-            endpoint = app.env("ENDPOINT", "/metrics")
-            prefix = app.env("PREFIX", app.service_name)
-            flask_app = Flask(app.service_name)
-            flask_app.wsgi_app = DispatcherMiddleware(
-                flask_app.wsgi_app, mounts={endpoint: make_wsgi_app()}
-            )
-            threading.Thread(
-                target=lambda: flask_app.run(
-                    host=addr,
-                    port=port,
-                    debug=True,
-                    use_reloader=False,
-                )
-            ).start()
-            app.otel_metric_readers.append(PrometheusMetricReader(prefix))
+        addr, port, endpoint, prefix = get_metrics_server_settings(app.env, app.service_name)
+        if app.worker_id is not None and is_prometheus_multiprocess():
+            # the worker pool supervisor serves the aggregated metrics of all workers, as written to
+            # PROMETHEUS_MULTIPROC_DIR: the OpenTelemetry reader only collects in its own process, so
+            # nothing it read would ever be served
+            app.logger.info("metrics served by the worker pool supervisor, without the OpenTelemetry metrics")
+            return
+        start_metrics_server(addr=addr, port=port, endpoint=endpoint)
+        app.logger.info(f"metrics server listening on {addr}:{port}{endpoint}")
+        app.otel_metric_readers.append(PrometheusMetricReader(prefix))
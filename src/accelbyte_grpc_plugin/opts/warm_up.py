@@ -0,0 +1,159 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter as CounterDict
+from logging import Logger
+from typing import Any, Callable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import grpc
+from google.protobuf.message import Message
+from google.protobuf.message_factory import GetMessageClass
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge
+
+from accelbyte_grpc_plugin import App, AppOptABC, AppOptOrder
+from accelbyte_grpc_plugin.utils import WarmUpCalls, iter_method_descriptors
+
+DEFAULT_WARM_UP_ROUNDS: int = 3
+DEFAULT_WARM_UP_TIMEOUT: float = 5.0
+
+Metadata = Sequence[Tuple[str, str]]
+
+
+class WarmUpMethod(NamedTuple):
+    method: str
+    request: Message
+    response_class: type
+
+
+class WarmUpOpt(AppOptABC):
+    """Sends synthetic calls to every unary method before the app reports ready.
+
+    The first calls after a start pay for descriptor lookups, protobuf class
+    set-up, handler wrapping in the interceptors, span and metric creation, and
+    the first token validation. Warming up sends `rounds` calls per method through
+    the whole server (the interceptor chain included) over a Unix socket private to
+    this process, so with SO_REUSEPORT workers each warms itself up. The socket is
+    removed once warmed up: gRPC cannot close a port of a started server, but
+    nothing can connect to it any more.
+
+    The calls carry `WarmUpCalls.METADATA_KEY`, set to this process's
+    `WarmUpCalls.token`: metrics, limiters and the caches filled from requests
+    leave them out.
+
+    Methods get an empty request unless `requests` holds one (keyed by full method
+    path). `metadata` is called once per warm-up, e.g. to add an authorization
+    header. Errors returned by the calls are expected (a synthetic request may be
+    rejected) and only counted.
+    """
+
+    def __init__(
+        self,
+        requests: Optional[Mapping[str, Message]] = None,
+        metadata: Optional[Callable[[], Metadata]] = None,
+        rounds: int = DEFAULT_WARM_UP_ROUNDS,
+        timeout: float = DEFAULT_WARM_UP_TIMEOUT,
+        registry: Optional[CollectorRegistry] = REGISTRY,
+    ) -> None:
+        self.requests = dict(requests) if requests else {}
+        self.metadata = metadata
+        self.rounds = rounds
+        self.timeout = timeout
+
+        self.methods: List[WarmUpMethod] = []
+        self.target: Optional[str] = None
+        self.directory: Optional[str] = None
+        self.logger: Optional[Logger] = None
+        self.codes: "CounterDict[grpc.StatusCode]" = CounterDict()
+
+        self.duration = Gauge(
+            name="grpc_server_warm_up_duration_seconds",
+            documentation="time taken by the warm-up calls sent before the server reported ready",
+            registry=registry,
+        )
+        self.calls = Counter(
+            name="grpc_server_warm_up_calls",
+            documentation="number of synthetic warm-up calls, by status code",
+            labelnames=["grpc_code"],
+            registry=registry,
+        )
+
+    def apply_order(self) -> AppOptOrder:
+        return AppOptOrder.AFTER_ADD_GRPC_SERVICES
+
+    def apply(self, app: App, *args, **kwargs) -> None:
+        # resolving the message classes here already sets them up
+        for method, method_descriptor in iter_method_descriptors(app.grpc_service_names):
+            if method_descriptor.client_streaming or method_descriptor.server_streaming:
+                continue
+            request = self.requests.get(method, None)
+            if request is None:
+                request = GetMessageClass(method_descriptor.input_type)()
+            self.methods.append(
+                WarmUpMethod(method, request, GetMessageClass(method_descriptor.output_type))
+            )
+
+        self.directory = tempfile.mkdtemp(prefix="grpc-warm-up-")
+        self.target = f"unix:{os.path.join(self.directory, 'grpc.sock')}"
+        app.grpc_server.add_insecure_port(self.target)
+        self.logger = app.logger
+        app.warm_ups.append(self.warm_up)
+        app.logger.info(f"warm-up prepared for {len(self.methods)} method(s)")
+
+    async def warm_up(self) -> None:
+        start = time.perf_counter()
+        metadata = (*(self.metadata() if self.metadata else ()), (WarmUpCalls.METADATA_KEY, WarmUpCalls.token))
+        WarmUpCalls.running += 1
+        try:
+            async with grpc.aio.insecure_channel(self.target) as channel:
+                callables = [
+                    channel.unary_unary(
+                        m.method,
+                        request_serializer=type(m.request).SerializeToString,
+                        response_deserializer=m.response_class.FromString,
+                    )
+                    for m in self.methods
+                ]
+                for _ in range(self.rounds):
+                    await asyncio.gather(
+                        *(
+                            self.call(callable_, m.request, metadata)
+                            for callable_, m in zip(callables, self.methods)
+                        )
+                    )
+        finally:
+            WarmUpCalls.running -= 1
+        # only once it succeeded: a failed warm-up is tried again over the same socket
+        self.close()
+        elapsed = time.perf_counter() - start
+        self.duration.set(elapsed)
+        if self.logger:
+            codes = ", ".join(f"{code.name}={count}" for code, count in self.codes.items())
+            self.logger.info(f"warmed up {len(self.methods)} method(s) in {elapsed:.3f}s ({codes})")
+
+    def close(self) -> None:
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    async def call(self, callable_: Any, request: Message, metadata: Metadata) -> None:
+        try:
+            await callable_(request, metadata=metadata, timeout=self.timeout)
+            code = grpc.StatusCode.OK
+        except grpc.aio.AioRpcError as error:
+            code = error.code()
+        self.codes[code] += 1
+        self.calls.labels(grpc_code=code.name).inc()
+
+
+__all__ = [
+    "DEFAULT_WARM_UP_ROUNDS",
+    "DEFAULT_WARM_UP_TIMEOUT",
+    "WarmUpMethod",
+    "WarmUpOpt",
+]
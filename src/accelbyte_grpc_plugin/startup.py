@@ -0,0 +1,54 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import os
+import time
+from typing import List, Optional, Tuple
+
+
+def get_process_uptime() -> Optional[float]:
+    """Seconds since this process started, or None when the platform does not tell (Linux only)"""
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            stat = f.read()
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+        # the command name in parentheses may contain spaces; starttime is the 22nd field
+        start_ticks = int(stat[stat.rindex(b")") + 2:].split()[19])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimeline:
+    """Records how long it took to reach each startup milestone.
+
+    Times are measured from the start of the process when the platform reports it
+    (so interpreter start-up and imports are included), else from the creation of
+    the timeline.
+    """
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        if start is None:
+            uptime = get_process_uptime()
+            start = time.monotonic() - (uptime or 0.0)
+        self.start = start
+        self.events: List[Tuple[str, float]] = []
+
+    def mark(self, event: str) -> float:
+        elapsed = time.monotonic() - self.start
+        self.events.append((event, elapsed))
+        return elapsed
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def format(self) -> str:
+        return ", ".join(f"{event} +{elapsed * 1e3:.0f}ms" for event, elapsed in self.events)
+
+
+__all__ = [
+    "StartupTimeline",
+    "get_process_uptime",
+]
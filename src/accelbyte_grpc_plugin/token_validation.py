@@ -0,0 +1,566 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import time
+from logging import Logger
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import jwt
+from prometheus_client import Gauge, Histogram
+
+from accelbyte_grpc_plugin.workers import set_gauge_function
+
+import accelbyte_py_sdk.api.basic as basic_service
+import accelbyte_py_sdk.api.iam as iam_service
+from accelbyte_py_sdk import AccelByteSDK
+from accelbyte_py_sdk.token_validation import (
+    InsufficientPermissionsError,
+    PermissionAction,
+    PermissionStruct,
+    TokenRevokedError,
+    UserRevokedError,
+    create_permission_struct,
+    replace_resource,
+    validate_permission,
+)
+from accelbyte_py_sdk.token_validation._bloom_filter import BloomFilter
+from accelbyte_py_sdk.token_validation._utils import str2datetime
+
+JWTClaims = Dict[str, Any]
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight task"""
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._tasks.get(key, None)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return task
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        # shielded so a cancelled caller does not cancel the fetch other callers share
+        return await asyncio.shield(self.run(key, factory))
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key, None) is task:
+            del self._tasks[key]
+
+
+class _InMemoryNamespaceContextCache:
+    # adapter for validate_permission(), which expects a synchronous cache
+    def __init__(self, validator: "AsyncCachingTokenValidator") -> None:
+        self.validator = validator
+
+    def get_namespace_context(self, namespace: str, **kwargs) -> Any:
+        return self.validator.get_namespace_context_from_cache(namespace)
+
+
+class AsyncCachingTokenValidator:
+    """Token validator for the asyncio gRPC server.
+
+    JWKS and the revocation list are refreshed by background tasks, roles and
+    namespace contexts are fetched on first use and then served stale while they
+    are revalidated. Every refresh is single-flight, so the request path only
+    awaits network I/O when it meets a key ID, role or namespace it has never seen.
+    """
+
+    DEFAULT_DECODE_ALGORITHMS: List[str] = ["RS256"]
+    DEFAULT_DECODE_OPTIONS: Dict[str, Any] = {"verify_aud": False, "verify_exp": True}
+    JWS_HEADER_PARAM_KEY_ID_KEY: str = "kid"
+    JWKS_KEYS_KEY: str = "keys"
+
+    def __init__(
+        self,
+        sdk: AccelByteSDK,
+        algorithms: Optional[List[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        publisher_namespace: Optional[str] = None,
+        jwks_refresh_interval: float = 300,
+        min_refresh_interval: float = 10,
+        revocation_list_refresh_interval: float = 60,
+        role_cache_time: float = 3600,
+        namespace_context_cache_time: float = 3600,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        self.sdk = sdk
+        self.algorithms = algorithms if algorithms is not None else self.DEFAULT_DECODE_ALGORITHMS
+        self.options = options if options is not None else self.DEFAULT_DECODE_OPTIONS
+        self.publisher_namespace = publisher_namespace
+        self.jwks_refresh_interval = jwks_refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.revocation_list_refresh_interval = revocation_list_refresh_interval
+        self.role_cache_time = role_cache_time
+        self.namespace_context_cache_time = namespace_context_cache_time
+        self.logger = logger
+
+        self._jwks: Dict[str, Any] = {}
+        self._jwks_fetched_at: Optional[float] = None
+        self._revoked_token_filter: Optional[BloomFilter] = None
+        self._revoked_users: Dict[str, float] = {}
+        self._revocation_list_fetched_at: Optional[float] = None
+        # bumped on every revocation list refresh, lets callers invalidate cached verdicts
+        self.revocation_list_version: int = 0
+        self._roles: Dict[str, Tuple[Any, float]] = {}
+        self._namespace_contexts: Dict[str, Tuple[Any, float]] = {}
+        self._namespace_context_cache = _InMemoryNamespaceContextCache(self)
+
+        self._single_flight = SingleFlight()
+        self._attempted_at: Dict[str, float] = {}
+        self._refresh_tasks: List[asyncio.Task] = []
+
+        self.refresh_duration = Histogram(
+            name="token_validator_refresh_duration_seconds",
+            documentation="duration of token validator cache refreshes",
+            labelnames=["cache", "outcome"],
+        )
+        self.staleness = Gauge(
+            name="token_validator_cache_staleness_seconds",
+            documentation="seconds since the oldest entry of a token validator cache was refreshed",
+            labelnames=["cache"],
+            # the stalest worker's
+            multiprocess_mode="livemax",
+        )
+        set_gauge_function(
+            self.staleness.labels(cache="jwks"),
+            lambda: self._age(self._jwks_fetched_at),
+        )
+        set_gauge_function(
+            self.staleness.labels(cache="revocation_list"),
+            lambda: self._age(self._revocation_list_fetched_at),
+        )
+        set_gauge_function(
+            self.staleness.labels(cache="roles"),
+            lambda: self._oldest_age(self._roles.values()),
+        )
+        set_gauge_function(
+            self.staleness.labels(cache="namespace_contexts"),
+            lambda: self._oldest_age(self._namespace_contexts.values()),
+        )
+
+    # lifecycle
+
+    def start(self) -> None:
+        """Start the background refresh tasks; must be called from the running event loop"""
+        if self._refresh_tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._refresh_tasks = [
+            loop.create_task(self._refresh_forever(self.refresh_jwks, self.jwks_refresh_interval)),
+            loop.create_task(
+                self._refresh_forever(
+                    self.refresh_revocation_list, self.revocation_list_refresh_interval
+                )
+            ),
+        ]
+
+    async def wait_until_ready(self) -> None:
+        await asyncio.gather(self.refresh_jwks(), self.refresh_revocation_list())
+
+    async def close(self) -> None:
+        for task in self._refresh_tasks:
+            task.cancel()
+        await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        self._refresh_tasks = []
+
+    @property
+    def is_ready(self) -> bool:
+        return self._jwks_fetched_at is not None and self._revocation_list_fetched_at is not None
+
+    # refreshes
+
+    async def refresh_jwks(self) -> None:
+        await self._single_flight.do("jwks", lambda: self._timed("jwks", self._fetch_jwks))
+
+    async def refresh_revocation_list(self) -> None:
+        await self._single_flight.do(
+            "revocation_list", lambda: self._timed("revocation_list", self._fetch_revocation_list)
+        )
+
+    async def refresh_role(self, role_id: str) -> None:
+        await self._single_flight.do(
+            ("role", role_id), lambda: self._timed("roles", lambda: self._fetch_role(role_id))
+        )
+
+    async def refresh_namespace_context(self, namespace: str) -> None:
+        await self._single_flight.do(
+            ("namespace_context", namespace),
+            lambda: self._timed("namespace_contexts", lambda: self._fetch_namespace_context(namespace)),
+        )
+
+    async def _refresh_forever(self, refresh: Callable[[], Awaitable[None]], interval: float) -> None:
+        while True:
+            await refresh()
+            await asyncio.sleep(interval)
+
+    async def _timed(self, cache: str, fetch: Callable[[], Awaitable[None]]) -> None:
+        self._attempted_at[cache] = time.monotonic()
+        start = time.perf_counter()
+        outcome = "success"
+        try:
+            await fetch()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            # keep serving the previous (stale) data
+            outcome = "error"
+            if self.logger:
+                self.logger.warning(f"failed to refresh {cache}: {type(error).__name__}: {error}")
+        finally:
+            self.refresh_duration.labels(cache=cache, outcome=outcome).observe(
+                time.perf_counter() - start
+            )
+
+    async def _fetch_jwks(self) -> None:
+        result, error = await iam_service.get_jwksv3_async(sdk=self.sdk)
+        if error:
+            raise Exception(error)
+        keys = result.to_dict().get(self.JWKS_KEYS_KEY, [])
+        jwks = dict(self._jwks)
+        for jwk in jwt.PyJWKSet(keys).keys:
+            jwks[jwk.key_id] = jwk.key
+        self._jwks = jwks
+        self._jwks_fetched_at = time.monotonic()
+
+    async def _fetch_revocation_list(self) -> None:
+        result, error = await iam_service.get_revocation_list_v3_async(sdk=self.sdk)
+        if error:
+            raise Exception(error)
+        revoked_tokens = result.revoked_tokens
+        revoked_token_filter = BloomFilter.create_from_bits(
+            bits=revoked_tokens.bits, k=revoked_tokens.k, m=revoked_tokens.m
+        )
+        revoked_users: Dict[str, float] = {}
+        for user in result.revoked_users or []:
+            if user.id_ and user.revoked_at:
+                revoked_users[user.id_] = str2datetime(user.revoked_at).timestamp()
+        self._revoked_token_filter, self._revoked_users = revoked_token_filter, revoked_users
+        self._revocation_list_fetched_at = time.monotonic()
+        self.revocation_list_version += 1
+
+    async def _fetch_role(self, role_id: str) -> None:
+        role, error = await iam_service.admin_get_role_namespace_permission_v3_async(
+            role_id=role_id, sdk=self.sdk
+        )
+        if error:
+            raise Exception(error)
+        self._roles[role_id] = (role, time.monotonic())
+
+    async def _fetch_namespace_context(self, namespace: str) -> None:
+        namespace_context, error = await basic_service.get_namespace_context_async(
+            namespace=namespace, sdk=self.sdk
+        )
+        if error:
+            raise Exception(error)
+        self._namespace_contexts[namespace] = (namespace_context, time.monotonic())
+
+    # in-memory lookups
+
+    def get_key_from_cache(self, key_id: str) -> Any:
+        return self._jwks.get(key_id, None)
+
+    def get_role_from_cache(self, role_id: str) -> Any:
+        entry = self._roles.get(role_id, None)
+        if entry is None:
+            return None
+        role, fetched_at = entry
+        if time.monotonic() - fetched_at > self.role_cache_time:
+            self._revalidate(("role", role_id), lambda: self.refresh_role(role_id))
+        return role
+
+    def get_namespace_context_from_cache(self, namespace: str) -> Any:
+        entry = self._namespace_contexts.get(namespace, None)
+        if entry is None:
+            return None
+        namespace_context, fetched_at = entry
+        if time.monotonic() - fetched_at > self.namespace_context_cache_time:
+            self._revalidate(
+                ("namespace_context", namespace), lambda: self.refresh_namespace_context(namespace)
+            )
+        return namespace_context
+
+    def is_token_revoked(self, token: str) -> bool:
+        revoked_token_filter = self._revoked_token_filter
+        return revoked_token_filter is not None and revoked_token_filter.might_contains(key=token)
+
+    def is_user_revoked(self, user_id: str, issued_at: Optional[int]) -> bool:
+        revoked_at = self._revoked_users.get(user_id, None)
+        return revoked_at is not None and issued_at is not None and revoked_at >= issued_at
+
+    def _revalidate(self, key: Hashable, refresh: Callable[[], Awaitable[None]]) -> None:
+        if key in self._single_flight:
+            return
+        try:
+            asyncio.get_running_loop().create_task(refresh())
+        except RuntimeError:
+            pass  # no running loop, serve stale
+
+    # validation
+
+    async def validate_token_async(
+        self,
+        token: str,
+        resource: Optional[str] = None,
+        action: Optional[PermissionAction] = None,
+        namespace: Optional[str] = None,
+        user_id: Optional[str] = None,
+        **kwargs,
+    ) -> Optional[Exception]:
+        if self._revocation_list_fetched_at is None and self._can_force_refresh("revocation_list"):
+            # not loaded yet, joins the initial refresh if it is still in flight
+            await self.refresh_revocation_list()
+
+        if self.is_token_revoked(token=token):
+            return TokenRevokedError("token was already revoked")
+
+        kid = jwt.get_unverified_header(jwt=token).get(self.JWS_HEADER_PARAM_KEY_ID_KEY)
+        if kid and self.get_key_from_cache(kid) is None and self._can_force_refresh("jwks"):
+            # unknown key ID, the signing keys may have been rotated
+            await self.refresh_jwks()
+
+        claims, error = self.decode(token=token, kid=kid)
+        if error:
+            return error
+
+        if resource is not None and action is not None:
+            await self._prefetch_permission_data(claims=claims, namespace=namespace)
+
+        return self._validate_claims(
+            claims=claims,
+            resource=resource,
+            action=action,
+            namespace=namespace,
+            user_id=user_id,
+            **kwargs,
+        )
+
+    def validate_token(
+        self,
+        token: str,
+        resource: Optional[str] = None,
+        action: Optional[PermissionAction] = None,
+        namespace: Optional[str] = None,
+        user_id: Optional[str] = None,
+        **kwargs,
+    ) -> Optional[Exception]:
+        """Synchronous variant that only consults what is already cached"""
+        if self.is_token_revoked(token=token):
+            return TokenRevokedError("token was already revoked")
+
+        claims, error = self.decode(token=token)
+        if error:
+            return error
+
+        return self._validate_claims(
+            claims=claims,
+            resource=resource,
+            action=action,
+            namespace=namespace,
+            user_id=user_id,
+            **kwargs,
+        )
+
+    def decode(
+        self, token: str, kid: Optional[str] = None
+    ) -> Tuple[Optional[JWTClaims], Optional[Exception]]:
+        if kid is None:
+            kid = jwt.get_unverified_header(jwt=token).get(self.JWS_HEADER_PARAM_KEY_ID_KEY)
+        if not kid:
+            return None, KeyError(self.JWS_HEADER_PARAM_KEY_ID_KEY)
+
+        if (key := self.get_key_from_cache(kid)) is None:
+            return None, KeyError(kid)
+
+        claims = jwt.decode(jwt=token, key=key, algorithms=self.algorithms, options=self.options)
+
+        if "user_id" not in claims and (sub := claims.get("sub")):
+            claims["user_id"] = sub
+
+        return claims, None
+
+    def has_valid_permissions(
+        self,
+        claims: JWTClaims,
+        permission: PermissionStruct,
+        namespace: Optional[str] = None,
+        user_id: Optional[str] = None,
+        **kwargs,
+    ) -> bool:
+        user_id = claims.get("user_id", user_id)
+
+        target = create_permission_struct(
+            action=permission.action,
+            resource=replace_resource(
+                resource=permission.resource,
+                namespace=namespace,
+                token_namespace=claims.get("namespace", None),
+                publisher_namespace=self.publisher_namespace,
+                user_id=user_id,
+            ),
+        )
+
+        # Check claims.permissions
+        claims_permissions = [
+            create_permission_struct(action=p.get("Action"), resource=p.get("Resource"))
+            for p in claims.get("permissions", None) or []
+        ]
+        if self._validate_permission(target, claims_permissions, **kwargs):
+            return True
+
+        # Check claim.namespace_roles
+        if user_id:
+            nr_permissions: List[PermissionStruct] = []
+            for nr in claims.get("namespace_roles", None) or []:
+                if role_id := nr.get("roleId", None):
+                    nr_permissions.extend(
+                        self._get_modified_role_permissions(role_id, nr.get("namespace", None), user_id)
+                    )
+            if self._validate_permission(target, nr_permissions, **kwargs):
+                return True
+
+        # Check claim.roles
+        r_permissions: List[PermissionStruct] = []
+        for role_id in claims.get("roles", None) or []:
+            r_permissions.extend(self._get_modified_role_permissions(role_id, namespace, user_id))
+        return self._validate_permission(target, r_permissions, **kwargs)
+
+    def _validate_claims(
+        self,
+        claims: JWTClaims,
+        resource: Optional[str],
+        action: Optional[PermissionAction],
+        namespace: Optional[str],
+        user_id: Optional[str],
+        **kwargs,
+    ) -> Optional[Exception]:
+        # Check if user was revoked.
+        if claims_user_id := claims.get("user_id", user_id):
+            if self.is_user_revoked(user_id=claims_user_id, issued_at=claims.get("iat")):
+                return UserRevokedError("user was already revoked")
+
+        # Check if the claims has valid permissions.
+        if (
+            resource is not None
+            and action is not None
+            and not self.has_valid_permissions(
+                claims=claims,
+                permission=create_permission_struct(action, resource),
+                namespace=namespace,
+                user_id=user_id,
+                **kwargs,
+            )
+        ):
+            return InsufficientPermissionsError(
+                f"insufficient permission: resource: {resource}, action: {action}"
+            )
+
+        return None
+
+    def _validate_permission(
+        self, target: PermissionStruct, permissions: List[PermissionStruct], **kwargs
+    ) -> bool:
+        return bool(permissions) and validate_permission(
+            target=target,
+            permissions=permissions,
+            namespace_context_cache=self._namespace_context_cache,
+            **kwargs,
+        )
+
+    def _get_modified_role_permissions(
+        self, role_id: str, namespace: Optional[str], user_id: Optional[str]
+    ) -> List[PermissionStruct]:
+        role = self.get_role_from_cache(role_id)
+        result = []
+        for permission in getattr(role, "permissions", None) or []:
+            action = getattr(permission, "action", None)
+            resource = getattr(permission, "resource", None)
+            if action is not None and resource is not None:
+                result.append(
+                    create_permission_struct(
+                        action=action,
+                        resource=replace_resource(
+                            resource=resource, namespace=namespace, user_id=user_id
+                        ),
+                    )
+                )
+        return result
+
+    async def _prefetch_permission_data(self, claims: JWTClaims, namespace: Optional[str]) -> None:
+        role_ids: Set[str] = set(claims.get("roles", None) or [])
+        role_ids.update(
+            role_id
+            for nr in claims.get("namespace_roles", None) or []
+            if (role_id := nr.get("roleId", None))
+        )
+        missing: List[Awaitable[None]] = [
+            self.refresh_role(role_id) for role_id in role_ids if role_id not in self._roles
+        ]
+        if namespace and namespace not in self._namespace_contexts:
+            missing.append(self.refresh_namespace_context(namespace))
+        if missing:
+            await asyncio.gather(*missing)
+
+    def _can_force_refresh(self, cache: str) -> bool:
+        # an in-flight refresh is always joined, otherwise forced refreshes are rate limited
+        return cache in self._single_flight or (
+            self._age(self._attempted_at.get(cache, None)) >= self.min_refresh_interval
+        )
+
+    @staticmethod
+    def _age(fetched_at: Optional[float]) -> float:
+        return float("inf") if fetched_at is None else time.monotonic() - fetched_at
+
+    @staticmethod
+    def _oldest_age(entries: Iterable[Tuple[Any, float]]) -> float:
+        now = time.monotonic()
+        return max((now - fetched_at for _, fetched_at in entries), default=0.0)
+
+
+async def warm_up_token_validator(token_validator: Any) -> None:
+    """Fetch the JWKS and revocation list of `token_validator` ahead of the first request.
+
+    Works with `AsyncCachingTokenValidator` and with the SDK's (synchronous)
+    `CachingTokenValidator`, whose caches are then updated in a worker thread.
+    Other validators are left alone.
+    """
+    if isinstance(token_validator, AsyncCachingTokenValidator):
+        await token_validator.wait_until_ready()
+        return
+    caches = [
+        cache
+        for cache in (
+            getattr(token_validator, "jwks_cache", None),
+            getattr(token_validator, "revocation_list_cache", None),
+        )
+        if cache is not None
+    ]
+    if caches:
+        await asyncio.gather(*(asyncio.to_thread(cache.update) for cache in caches))
+
+
+__all__ = [
+    "AsyncCachingTokenValidator",
+    "SingleFlight",
+    "warm_up_token_validator",
+]
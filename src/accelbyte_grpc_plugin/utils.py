@@ -2,10 +2,13 @@
 # This is licensed software from AccelByte Inc, for limitations
 # and restrictions contact your company contract manager.
 
+import secrets
 from logging import Logger
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Optional, Set, Tuple
 
 from environs import Env
+from google.protobuf.descriptor import MethodDescriptor
+from google.protobuf.descriptor_pool import Default as DescriptorPool
 from grpc import HandlerCallDetails
 from opentelemetry.propagate import get_global_textmap
 
@@ -42,6 +45,93 @@ def get_propagator_header_keys() -> Set[str]:
     return get_global_textmap().fields
 
 
+class MetadataView:
+    """Reads a fixed set of keys from the invocation metadata of a call, in place.
+
+    Unlike `get_headers_from_metadata`, nothing is copied: `get` scans the metadata
+    for one key and `select` only builds a dict when one of the view's keys is
+    present. The keys are chosen once, e.g. at startup.
+    """
+
+    __slots__ = ("keys",)
+
+    def __init__(self, keys: Iterable[str] = ()) -> None:
+        # gRPC metadata keys are lowercase
+        self.keys: FrozenSet[str] = frozenset(key.lower() for key in keys)
+
+    @staticmethod
+    def get(handler_call_details: HandlerCallDetails, key: str, default: Any = None) -> Any:
+        # (key, value) namedtuples, indexing them is cheaper than unpacking
+        for metadatum in getattr(handler_call_details, "invocation_metadata", None) or ():
+            if metadatum[0] == key:
+                return metadatum[1]
+        return default
+
+    def select(self, handler_call_details: HandlerCallDetails) -> Optional[Dict[str, Any]]:
+        """The view's keys present in the metadata, or None when there are none"""
+        keys = self.keys
+        selected: Optional[Dict[str, Any]] = None
+        if keys:
+            for metadatum in getattr(handler_call_details, "invocation_metadata", None) or ():
+                if metadatum[0] in keys:
+                    if selected is None:
+                        selected = {}
+                    selected[metadatum[0]] = metadatum[1]
+        return selected
+
+    @classmethod
+    def for_propagator(cls) -> "MetadataView":
+        """A view of the fields of the global OpenTelemetry propagator"""
+        return cls(get_propagator_header_keys())
+
+
+class WarmUpCalls:
+    """Tells the synthetic calls of a warm-up (see `WarmUpOpt`) apart from real traffic.
+
+    They carry `METADATA_KEY`, so the metrics, the limiters and the caches filled from
+    requests can leave them out. The metadata is only read while a warm-up is
+    running: once the app is ready, checking a call costs one attribute read.
+
+    The marker's value must be `token`, a random value that never leaves this
+    process, so a client on the public port cannot pass its calls off as warm-up
+    ones while a warm-up runs.
+    """
+
+    METADATA_KEY: str = "x-warm-up"
+    token: str = secrets.token_hex(16)
+    # warm-ups running in this process
+    running: int = 0
+
+    @classmethod
+    def is_marker(cls, value: Any) -> bool:
+        return isinstance(value, str) and secrets.compare_digest(value.encode(), cls.token.encode())
+
+    @classmethod
+    def is_warm_up(cls, handler_call_details: HandlerCallDetails) -> bool:
+        return cls.running > 0 and cls.is_marker(MetadataView.get(handler_call_details, cls.METADATA_KEY))
+
+    @classmethod
+    def is_warm_up_context(cls, context: Any) -> bool:
+        """Same as `is_warm_up`, from the servicer context of the call"""
+        if cls.running <= 0 or context is None:
+            return False
+        for metadatum in context.invocation_metadata() or ():
+            if metadatum[0] == cls.METADATA_KEY:
+                return cls.is_marker(metadatum[1])
+        return False
+
+
+def iter_method_descriptors(service_names: Iterable[str]) -> Iterator[Tuple[str, MethodDescriptor]]:
+    """Yield (full method path, descriptor) for every method of the given registered services"""
+    for service_name in service_names:
+        try:
+            service_descriptor = DescriptorPool().FindServiceByName(service_name)
+        except KeyError:
+            continue
+        for method_descriptor in service_descriptor.methods:
+            yield f"/{service_descriptor.full_name}/{method_descriptor.name}", method_descriptor
+
+
 def instrument_sdk_http_client(sdk: AccelByteSDK, logger: Optional[Logger] = None) -> None:
     http_client = sdk.get_http_client(raise_when_none=False)
     if http_client is not None:
@@ -69,8 +159,11 @@ def instrument_sdk_http_client(sdk: AccelByteSDK, logger: Optional[Logger] = Non
 
 
 __all__ = [
+    "MetadataView",
+    "WarmUpCalls",
     "create_env",
     "get_headers_from_metadata",
     "get_propagator_header_keys",
+    "iter_method_descriptors",
     "instrument_sdk_http_client",
 ]
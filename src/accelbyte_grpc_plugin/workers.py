@@ -0,0 +1,281 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from logging import Logger
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+WORKER_ID_ENV: str = "PLUGIN_GRPC_SERVER_WORKER_ID"
+PROMETHEUS_MULTIPROC_DIR_ENV: str = "PROMETHEUS_MULTIPROC_DIR"
+
+DEFAULT_GAUGE_FUNCTION_INTERVAL: float = 5.0
+
+
+def get_worker_id() -> Optional[int]:
+    """ID of the current worker process, or None when not running in a worker pool"""
+    value = os.environ.get(WORKER_ID_ENV, None)
+    return int(value) if value else None
+
+
+def default_worker_count() -> int:
+    # the CPUs this process may run on, which honours cpusets unlike os.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def is_prometheus_multiprocess() -> bool:
+    return bool(os.environ.get(PROMETHEUS_MULTIPROC_DIR_ENV, None))
+
+
+def setup_prometheus_multiprocess_dir(path: Optional[str] = None) -> str:
+    """Point prometheus_client at an empty directory shared by the workers.
+
+    Must run before the workers start (they inherit the environment). Uses
+    `PROMETHEUS_MULTIPROC_DIR` when set, else a new temporary directory.
+    """
+    path = path or os.environ.get(PROMETHEUS_MULTIPROC_DIR_ENV, None) or tempfile.mkdtemp(prefix="prometheus-")
+    os.makedirs(path, exist_ok=True)
+    # files left over from a previous run would be aggregated as well
+    for name in os.listdir(path):
+        entry = os.path.join(path, name)
+        if os.path.isdir(entry):
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            os.remove(entry)
+    os.environ[PROMETHEUS_MULTIPROC_DIR_ENV] = path
+    return path
+
+
+class _GaugeFunctionWriter:
+    """Writes the values of gauge functions every `interval` seconds, from a daemon thread"""
+
+    def __init__(self, interval: float = DEFAULT_GAUGE_FUNCTION_INTERVAL) -> None:
+        self.interval = interval
+        self._functions: List[Tuple[Any, Callable[[], float]]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, gauge: Any, function: Callable[[], float]) -> None:
+        with self._lock:
+            self._functions.append((gauge, function))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="gauge-functions", daemon=True)
+                self._thread.start()
+        self._write(gauge, function)
+
+    def write_all(self) -> None:
+        with self._lock:
+            functions = list(self._functions)
+        for gauge, function in functions:
+            self._write(gauge, function)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self.write_all()
+
+    @staticmethod
+    def _write(gauge: Any, function: Callable[[], float]) -> None:
+        try:
+            gauge.set(function())
+        except Exception:
+            # e.g. read while the event loop thread was changing what it measures: next time
+            pass
+
+
+_gauge_function_writer = _GaugeFunctionWriter()
+
+
+def set_gauge_function(gauge: Any, function: Callable[[], float]) -> None:
+    """`gauge.set_function(function)`, which also works for the workers of a pool.
+
+    In multiprocess mode the supervisor serves the values the workers wrote to
+    PROMETHEUS_MULTIPROC_DIR, and never calls the workers' gauge functions: there
+    the value of `function` is written every few seconds instead. Give such gauges a
+    `multiprocess_mode` (e.g. `livesum` for sizes, `livemax` for ages).
+    """
+    if is_prometheus_multiprocess():
+        _gauge_function_writer.add(gauge, function)
+    else:
+        gauge.set_function(function)
+
+
+def write_gauge_functions() -> None:
+    """Write the values of the gauge functions set in multiprocess mode now, e.g. before exiting"""
+    _gauge_function_writer.write_all()
+
+
+class WorkerIdLogFilter(logging.Filter):
+    """Adds the worker ID to log records, as `worker_id` and as a Loki tag"""
+
+    def __init__(self, worker_id: int) -> None:
+        super().__init__()
+        self.worker_id = worker_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.worker_id = self.worker_id
+        tags = getattr(record, "tags", None)
+        record.tags = {**tags, "worker_id": self.worker_id} if isinstance(tags, dict) else {"worker_id": self.worker_id}
+        return True
+
+
+def _run_worker(target: Callable[[], None], worker_id: int) -> None:
+    os.environ[WORKER_ID_ENV] = str(worker_id)
+    target()
+
+
+class WorkerPool:
+    """Runs `target` in `workers` processes and restarts the ones that exit.
+
+    Workers are spawned, not forked, so none of them inherits gRPC or event loop
+    state from the supervisor; `target` must therefore be importable (a module-level
+    function). Each worker binds the same port with SO_REUSEPORT (see `App`) and the
+    kernel spreads the connections over them. A worker that keeps crashing soon after
+    it started is restarted with an exponential backoff. SIGTERM and SIGINT stop the
+    pool: the workers get SIGTERM, then SIGKILL after `shutdown_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[], None],
+        workers: int,
+        restart_delay: float = 1.0,
+        max_restart_delay: float = 30.0,
+        stable_after: float = 60.0,
+        shutdown_timeout: float = 30.0,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.target = target
+        self.workers = workers
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.stable_after = stable_after
+        self.shutdown_timeout = shutdown_timeout
+        self.logger = logger
+
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._started_at: Dict[int, float] = {}
+        self._delays: Dict[int, float] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = threading.Event()
+
+    def run(self) -> None:
+        previous_handlers = {
+            signum: signal.signal(signum, self._handle_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for worker_id in range(self.workers):
+                self._start(worker_id)
+            while not self._stopping.is_set():
+                self._supervise()
+        finally:
+            self._shutdown()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _handle_signal(self, signum, frame) -> None:
+        self._log(logging.INFO, f"received {signal.Signals(signum).name}, stopping workers")
+        self.stop()
+
+    def _start(self, worker_id: int) -> None:
+        process = self._context.Process(
+            target=_run_worker,
+            args=(self.target, worker_id),
+            name=f"worker-{worker_id}",
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._started_at[worker_id] = time.monotonic()
+        self._log(logging.INFO, f"worker {worker_id} started (pid {process.pid})")
+
+    def _supervise(self) -> None:
+        now = time.monotonic()
+        timeout = 0.5
+        if self._restart_at:
+            timeout = max(0.0, min(timeout, min(self._restart_at.values()) - now))
+        sentinels = {process.sentinel: worker_id for worker_id, process in self._processes.items()}
+        for sentinel in multiprocessing.connection.wait(list(sentinels), timeout=timeout):
+            if not self._stopping.is_set():
+                self._reap(sentinels[sentinel])
+
+        now = time.monotonic()
+        for worker_id, restart_at in list(self._restart_at.items()):
+            if restart_at <= now and not self._stopping.is_set():
+                del self._restart_at[worker_id]
+                self._start(worker_id)
+
+    def _reap(self, worker_id: int) -> None:
+        process = self._processes.pop(worker_id)
+        process.join()
+        self._mark_dead(process)
+        uptime = time.monotonic() - self._started_at.pop(worker_id)
+        if uptime >= self.stable_after:
+            delay = self.restart_delay
+        else:
+            delay = min(self.max_restart_delay, self._delays.get(worker_id, self.restart_delay / 2) * 2)
+        self._delays[worker_id] = delay
+        self._restart_at[worker_id] = time.monotonic() + delay
+        self._log(
+            logging.WARNING,
+            f"worker {worker_id} (pid {process.pid}) exited with code {process.exitcode} "
+            f"after {uptime:.1f}s, restarting in {delay:.1f}s",
+        )
+
+    def _shutdown(self) -> None:
+        self._restart_at.clear()
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in self._processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+            self._mark_dead(process)
+        self._processes.clear()
+        self._log(logging.INFO, "workers stopped")
+
+    @staticmethod
+    def _mark_dead(process: multiprocessing.Process) -> None:
+        if is_prometheus_multiprocess() and process.pid is not None:
+            from prometheus_client import multiprocess
+
+            # drops the dead worker's live gauges from the aggregation
+            multiprocess.mark_process_dead(process.pid)
+
+    def _log(self, level: int, message: str) -> None:
+        if self.logger:
+            self.logger.log(level, message)
+
+
+__all__ = [
+    "DEFAULT_GAUGE_FUNCTION_INTERVAL",
+    "PROMETHEUS_MULTIPROC_DIR_ENV",
+    "WORKER_ID_ENV",
+    "WorkerIdLogFilter",
+    "WorkerPool",
+    "default_worker_count",
+    "get_worker_id",
+    "is_prometheus_multiprocess",
+    "set_gauge_function",
+    "setup_prometheus_multiprocess_dir",
+    "write_gauge_functions",
+]
@@ -5,7 +5,7 @@
 import asyncio
 import logging
 from logging import Logger
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from environs import Env
 
@@ -16,20 +16,57 @@ from accelbyte_py_sdk.core import (
     InMemoryTokenRepository,
     HttpxHttpClient,
 )
-from accelbyte_py_sdk.services import auth as auth_service
 
 from accelbyte_grpc_plugin import (
     App,
     AppOpt,
     AppGRPCInterceptorOpt,
     AppGRPCServiceOpt,
+    AppReadinessGateOpt,
+    AppStartupHookOpt,
 )
+from accelbyte_grpc_plugin import event_loop
+from accelbyte_grpc_plugin.opts.grpc_server import GRPCServerOptions, GRPCServerOptionsOpt
+from accelbyte_grpc_plugin.startup import StartupTimeline
 from accelbyte_grpc_plugin.utils import instrument_sdk_http_client
+from accelbyte_grpc_plugin.workers import (
+    WorkerIdLogFilter,
+    WorkerPool,
+    default_worker_count,
+    get_worker_id,
+    setup_prometheus_multiprocess_dir,
+)
 
-from section_pb2_grpc import add_SectionServicer_to_server
-from .services.section_service import AsyncSectionService
+from .deadlines import DEFAULT_DEADLINE_DEGRADE_BELOW, DEFAULT_DEADLINE_DEGRADED_TTL, DeadlineGuard
+from .payload_logging import (
+    DEFAULT_PAYLOAD_LOG_MAX_BYTES,
+    DEFAULT_PAYLOAD_LOG_MAX_PENDING,
+    DEFAULT_PAYLOAD_LOG_SAMPLE_RATE,
+    PayloadLogger,
+)
+from .rotation.strategies import (
+    DEFAULT_ITEM_COUNT,
+    DEFAULT_SLOT_DURATION,
+    RotationEngine,
+    TimeSlotStrategy,
+    WeightedSampleStrategy,
+    WeightedStrategy,
+    create_strategy,
+)
+from .rotation.sampling import NUMPY, create_weighted_sampler
+from .rotation.backfill import DEFAULT_MAX_POOLS, BackfillEngine, CandidatePoolRegistry
+from .rotation.cache import DEFAULT_ROTATION_CACHE_MAX_SIZE, RotationCache
+from .services.section_service import (
+    AsyncSectionService,
+    add_section_servicer_to_server,
+    create_warm_up_requests,
+)
 from .utils import create_env
 
+if TYPE_CHECKING:
+    from .catalog import CatalogStore
+    from .entitlements import EntitlementLookup
+
 DEFAULT_APP_PORT: int = 6565
 
 DEFAULT_AB_BASE_URL: str = "https://test.accelbyte.io"
@@ -41,19 +78,63 @@ DEFAULT_ENABLE_REFLECTION: bool = True
 DEFAULT_ENABLE_ZIPKIN: bool = True
 
 DEFAULT_PLUGIN_GRPC_SERVER_AUTH_ENABLED: bool = True
-
+DEFAULT_PLUGIN_GRPC_SERVER_AUTH_ASYNC_ENABLED: bool = False
+DEFAULT_PLUGIN_GRPC_SERVER_AUTH_CACHE_ENABLED: bool = True
+DEFAULT_PLUGIN_GRPC_SERVER_AUTH_CACHE_MAX_SIZE: int = 10_000
+DEFAULT_PLUGIN_GRPC_SERVER_AUTH_CACHE_MAX_TTL: float = 300.0
+
+DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_ENABLED: bool = False
+DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_ALGORITHM: str = "gradient"
+DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_INITIAL: int = 20
+DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_MIN: int = 4
+DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_MAX: int = 1000
+DEFAULT_PLUGIN_GRPC_SERVER_RATE_LIMIT_ENABLED: bool = False
+DEFAULT_PLUGIN_GRPC_SERVER_RATE_LIMIT_KEY: str = "user"
+DEFAULT_PLUGIN_GRPC_SERVER_RATE_LIMIT_RATE: float = 10.0
+DEFAULT_PLUGIN_GRPC_SERVER_RATE_LIMIT_BURST: int = 20
 DEFAULT_PLUGIN_GRPC_SERVER_LOGGING_ENABLED: bool = False
 DEFAULT_PLUGIN_GRPC_SERVER_METRICS_ENABLED: bool = True
+DEFAULT_PLUGIN_GRPC_SERVER_FUSED_INTERCEPTORS_ENABLED: bool = False
+
+DEFAULT_PLUGIN_GRPC_SERVER_PAYLOAD_LOGGING_OFFLOAD_ENABLED: bool = False
+
+DEFAULT_PLUGIN_GRPC_SERVER_WARM_UP_ENABLED: bool = True
+
+DEFAULT_PLUGIN_GRPC_SERVER_WORKERS_ENABLED: bool = False
+DEFAULT_PLUGIN_GRPC_SERVER_EVENT_LOOP: str = event_loop.ASYNCIO
+
+DEFAULT_ROTATION_STRATEGY: str = TimeSlotStrategy.name
+DEFAULT_ROTATION_SAMPLER: str = NUMPY
+DEFAULT_ROTATION_CACHE_ENABLED: bool = True
+DEFAULT_ROTATION_CACHE_SERIALIZE: bool = True
+
+DEFAULT_IAM_LOGIN_RETRY_DELAY: float = 1.0
+DEFAULT_IAM_LOGIN_MAX_RETRY_DELAY: float = 30.0
+
+DEFAULT_CATALOG_ENABLED: bool = False
+DEFAULT_ENTITLEMENTS_ENABLED: bool = False
+
+DEFAULT_DEADLINES_ENABLED: bool = False
 
 
 async def main(**kwargs) -> None:
+    # measured from process start, so interpreter start-up and imports are included
+    timeline = StartupTimeline()
+    timeline.mark("imports")
+
     env = create_env(**kwargs)
 
     port: int = env.int("PORT", DEFAULT_APP_PORT)
 
     logger = logging.getLogger("app")
     logger.setLevel(logging.INFO)
-    logger.addHandler(logging.StreamHandler())
+    handler = logging.StreamHandler()
+    worker_id = get_worker_id()
+    if worker_id is not None:
+        logger.addFilter(WorkerIdLogFilter(worker_id))
+        handler.setFormatter(logging.Formatter("[worker %(worker_id)s] %(message)s"))
+    logger.addHandler(handler)
+    logger.info(f"running on the {type(asyncio.get_running_loop()).__module__.partition('.')[0]} event loop")
 
     config = DictConfigRepository(dict(env.dump()))
     token = InMemoryTokenRepository()
@@ -71,33 +152,81 @@ async def main(**kwargs) -> None:
 
     instrument_sdk_http_client(sdk=sdk, logger=logger)
 
-    _, error = await auth_service.login_client_async(sdk=sdk)
-    if error:
-        raise Exception(str(error))
+    # the server starts (NOT_SERVING) while the IAM login runs in the background
+    logged_in = asyncio.Event()
+    opts = create_options(sdk=sdk, env=env, logger=logger, logged_in=logged_in)
+    opts.insert(0, AppReadinessGateOpt(create_iam_login(sdk=sdk, logger=logger, logged_in=logged_in)))
 
-    sdk.timer = auth_service.LoginClientTimer(5, refresh_rate=0.8, repeats=-1, autostart=True, sdk=sdk)
+    catalog = create_catalog(sdk=sdk, env=env, logger=logger)
+    if catalog is not None:
+        async def start_catalog() -> None:
+            # not a readiness gate: until it loads, every item counts as available
+            await logged_in.wait()
+            catalog.start()
+
+        opts.append(AppStartupHookOpt(start_catalog))
 
-    opts = create_options(sdk=sdk, env=env, logger=logger)
     opts.append(
         AppGRPCServiceOpt(
             service=AsyncSectionService(
                 sdk=sdk,
                 logger=logger,
+                payload_logger=create_payload_logger(env=env, logger=logger),
+                rotation_engine=create_rotation_engine(env=env, catalog=catalog, logger=logger),
+                rotation_cache=create_rotation_cache(env=env),
+                backfill_engine=create_backfill_engine(env=env, catalog=catalog),
+                catalog=catalog,
+                entitlements=create_entitlement_lookup(sdk=sdk, env=env),
+                deadlines=create_deadline_guard(env=env),
             ),
             service_full_name=AsyncSectionService.full_name,
-            add_service_func=add_SectionServicer_to_server,
+            add_service_func=add_section_servicer_to_server,
         )
     )
 
-    app = App(port=port, env=env, logger=logger, opts=opts)
+    warm_up = create_warm_up_opt(sdk=sdk, env=env)
+    if warm_up is not None:
+        opts.append(warm_up)
+
+    with env.prefixed("PLUGIN_GRPC_SERVER_"):
+        fuse = env.bool("FUSED_INTERCEPTORS_ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_FUSED_INTERCEPTORS_ENABLED)
+
+    app = App(port=port, env=env, logger=logger, opts=opts, timeline=timeline, fuse_interceptors=fuse)
 
     logger.info(f"using {get_version(latest=True, full=True)}")
 
     await app.run()
 
 
-def create_options(sdk: AccelByteSDK, env: Env, logger: Logger) -> List[AppOpt]:
-    options: List[AppOpt] = []
+def create_iam_login(sdk: AccelByteSDK, logger: Logger, logged_in: asyncio.Event):
+    async def iam_login() -> None:
+        from accelbyte_py_sdk.services import auth as auth_service
+
+        delay = DEFAULT_IAM_LOGIN_RETRY_DELAY
+        while True:
+            try:
+                _, error = await auth_service.login_client_async(sdk=sdk)
+            except Exception as exception:
+                error = f"{type(exception).__name__}: {exception}"
+            if not error:
+                break
+            logger.warning(f"IAM login failed, retrying in {delay:.0f}s: {error}")
+            await asyncio.sleep(delay)
+            delay = min(DEFAULT_IAM_LOGIN_MAX_RETRY_DELAY, delay * 2)
+
+        sdk.timer = auth_service.LoginClientTimer(5, refresh_rate=0.8, repeats=-1, autostart=True, sdk=sdk)
+        logged_in.set()
+
+    return iam_login
+
+
+def create_options(
+    sdk: AccelByteSDK,
+    env: Env,
+    logger: Logger,
+    logged_in: Optional[asyncio.Event] = None,
+) -> List[AppOpt]:
+    options: List[AppOpt] = [GRPCServerOptionsOpt(options=GRPCServerOptions.from_env(env))]
 
     with env.prefixed("AB_"):
         namespace = env.str("NAMESPACE", DEFAULT_AB_NAMESPACE)
@@ -129,19 +258,77 @@ def create_options(sdk: AccelByteSDK, env: Env, logger: Logger) -> List[AppOpt]:
             options.append(ZipkinOpt())
 
     with env.prefixed("PLUGIN_GRPC_SERVER_"):
+        with env.prefixed("CONCURRENCY_LIMIT_"):
+            if env.bool("ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_ENABLED):
+                from accelbyte_grpc_plugin.interceptors.concurrency import (
+                    ConcurrencyLimitServerInterceptor,
+                    create_concurrency_limit,
+                )
+
+                # first, so shed calls skip the interceptors below
+                limit = create_concurrency_limit(
+                    env.str("ALGORITHM", DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_ALGORITHM),
+                    initial_limit=env.int("INITIAL", DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_INITIAL),
+                    min_limit=env.int("MIN", DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_MIN),
+                    max_limit=env.int("MAX", DEFAULT_PLUGIN_GRPC_SERVER_CONCURRENCY_LIMIT_MAX),
+                )
+                options.append(
+                    AppGRPCInterceptorOpt(interceptor=ConcurrencyLimitServerInterceptor(limit=limit))
+                )
+
         with env.prefixed("AUTH_"):
             if env.bool("ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_AUTH_ENABLED):
-                from accelbyte_py_sdk.token_validation.caching import CachingTokenValidator
-                from accelbyte_grpc_plugin.interceptors.authorization import AuthorizationServerInterceptor
+                from accelbyte_grpc_plugin.interceptors.authorization import (
+                    AuthorizationServerInterceptor,
+                    TokenCache,
+                )
+                from accelbyte_grpc_plugin.opts.authorization_policy import AuthorizationPolicyOpt
+
+                if env.bool("ASYNC_ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_AUTH_ASYNC_ENABLED):
+                    from accelbyte_grpc_plugin.token_validation import AsyncCachingTokenValidator
+
+                    token_validator = AsyncCachingTokenValidator(sdk=sdk, logger=logger)
+                    if logged_in is not None:
+                        async def start_token_validator() -> None:
+                            # its fetches fail until logged in, and would only be tried again after an interval
+                            await logged_in.wait()
+                            token_validator.start()
+
+                        options.append(AppStartupHookOpt(start_token_validator))
+                    else:
+                        token_validator.start()
+                else:
+                    from accelbyte_py_sdk.token_validation.caching import CachingTokenValidator
+
+                    token_validator = CachingTokenValidator(sdk=sdk)
+
+                token_cache = None
+                if env.bool("CACHE_ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_AUTH_CACHE_ENABLED):
+                    token_cache = TokenCache(
+                        max_size=env.int("CACHE_MAX_SIZE", DEFAULT_PLUGIN_GRPC_SERVER_AUTH_CACHE_MAX_SIZE),
+                        max_ttl=env.float("CACHE_MAX_TTL", DEFAULT_PLUGIN_GRPC_SERVER_AUTH_CACHE_MAX_TTL),
+                    )
 
+                authorization_interceptor = AuthorizationServerInterceptor(
+                    namespace=namespace,
+                    token_validator=token_validator,
+                    token_cache=token_cache,
+                )
                 options.append(
-                    AppGRPCInterceptorOpt(
-                        interceptor=AuthorizationServerInterceptor(
-                            namespace=namespace,
-                            token_validator=CachingTokenValidator(sdk=sdk),
-                        )
-                    )
+                    AppGRPCInterceptorOpt(interceptor=authorization_interceptor)
                 )
+                options.append(
+                    AuthorizationPolicyOpt(interceptor=authorization_interceptor)
+                )
+
+                async def token_validator_warm_up() -> None:
+                    from accelbyte_grpc_plugin.token_validation import warm_up_token_validator
+
+                    if logged_in is not None:
+                        await logged_in.wait()
+                    await warm_up_token_validator(token_validator)
+
+                options.append(AppReadinessGateOpt(token_validator_warm_up))
         if env.bool("LOGGING_ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_LOGGING_ENABLED):
             from accelbyte_grpc_plugin.interceptors.logging import (
                 DebugLoggingServerInterceptor,
@@ -155,18 +342,245 @@ def create_options(sdk: AccelByteSDK, env: Env, logger: Logger) -> List[AppOpt]:
 
         if env.bool("METRICS_ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_METRICS_ENABLED):
             from accelbyte_grpc_plugin.interceptors.metrics import (
+                DEFAULT_LATENCY_BUCKETS,
                 MetricsServerInterceptor,
             )
+            from accelbyte_grpc_plugin.opts.metrics import MetricsBindMethodsOpt
 
+            metrics_interceptor = MetricsServerInterceptor(
+                latency_buckets=env.list(
+                    "METRICS_LATENCY_BUCKETS", list(DEFAULT_LATENCY_BUCKETS), subcast=float
+                ),
+            )
             options.append(
-                AppGRPCInterceptorOpt(interceptor=MetricsServerInterceptor())
+                AppGRPCInterceptorOpt(interceptor=metrics_interceptor)
             )
+            options.append(
+                MetricsBindMethodsOpt(interceptor=metrics_interceptor)
+            )
+
+        with env.prefixed("RATE_LIMIT_"):
+            if env.bool("ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_RATE_LIMIT_ENABLED):
+                from accelbyte_grpc_plugin.interceptors.rate_limit import (
+                    RateLimit,
+                    RateLimitServerInterceptor,
+                )
+
+                # last, so the metrics interceptor sees the rejected calls and the token was validated
+                rate = env.float("RATE", DEFAULT_PLUGIN_GRPC_SERVER_RATE_LIMIT_RATE)
+                burst = env.int("BURST", DEFAULT_PLUGIN_GRPC_SERVER_RATE_LIMIT_BURST)
+                method_rates = env.dict("METHOD_RATES", {}, subcast_values=float)
+                method_bursts = env.dict("METHOD_BURSTS", {}, subcast_values=int)
+                # calls without a key (e.g. no userId) are only limited when this is set
+                keyless_rate = env.float("KEYLESS_RATE", None)
+                keyless_burst = env.int("KEYLESS_BURST", burst)
+                options.append(
+                    AppGRPCInterceptorOpt(
+                        interceptor=RateLimitServerInterceptor(
+                            key=env.str("KEY", DEFAULT_PLUGIN_GRPC_SERVER_RATE_LIMIT_KEY),
+                            default_limit=RateLimit(rate, burst),
+                            limits={
+                                method: RateLimit(method_rates.get(method, rate), method_bursts.get(method, burst))
+                                for method in {*method_rates, *method_bursts}
+                            },
+                            max_buckets=env.int("MAX_BUCKETS", RateLimitServerInterceptor.DEFAULT_MAX_BUCKETS),
+                            keyless_limit=RateLimit(keyless_rate, keyless_burst) if keyless_rate is not None else None,
+                        )
+                    )
+                )
 
     return options
 
 
+def create_warm_up_opt(sdk: AccelByteSDK, env: Env) -> Optional[AppOpt]:
+    with env.prefixed("AB_"):
+        namespace = env.str("NAMESPACE", DEFAULT_AB_NAMESPACE)
+
+    with env.prefixed("PLUGIN_GRPC_SERVER_WARM_UP_"):
+        if not env.bool("ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_WARM_UP_ENABLED):
+            return None
+        rounds = env.int("ROUNDS", None)
+
+    from accelbyte_grpc_plugin.opts.warm_up import DEFAULT_WARM_UP_ROUNDS, WarmUpOpt
+
+    def metadata():
+        # the app's own token; it may lack the permissions, which still warms up validation
+        access_token, _ = sdk.get_access_token()
+        return [("authorization", f"Bearer {access_token}")] if access_token else []
+
+    return WarmUpOpt(
+        requests=create_warm_up_requests(namespace=namespace),
+        metadata=metadata,
+        rounds=rounds if rounds is not None else DEFAULT_WARM_UP_ROUNDS,
+    )
+
+
+def create_payload_logger(env: Env, logger: Logger) -> PayloadLogger:
+    with env.prefixed("PLUGIN_GRPC_SERVER_PAYLOAD_LOGGING_"):
+        return PayloadLogger(
+            logger=logger,
+            sample_rate=env.float("SAMPLE_RATE", DEFAULT_PAYLOAD_LOG_SAMPLE_RATE),
+            max_bytes=env.int("MAX_BYTES", DEFAULT_PAYLOAD_LOG_MAX_BYTES),
+            offload=env.bool("OFFLOAD_ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_PAYLOAD_LOGGING_OFFLOAD_ENABLED),
+            max_pending=env.int("MAX_PENDING", DEFAULT_PAYLOAD_LOG_MAX_PENDING),
+        )
+
+
+def create_rotation_engine(
+    env: Env, catalog: Optional["CatalogStore"] = None, logger: Optional[Logger] = None
+) -> RotationEngine:
+    with env.prefixed("ROTATION_"):
+        slot_duration = env.int("SLOT_DURATION", DEFAULT_SLOT_DURATION)
+        count = env.int("ITEM_COUNT", DEFAULT_ITEM_COUNT)
+        weights = env.dict("WEIGHTS", {}, subcast_values=float)
+        excluded = env.list("EXCLUDED", [])
+        sampler = env.str("SAMPLER", DEFAULT_ROTATION_SAMPLER)
+
+        def strategy(name: str):
+            kwargs = {"slot_duration": slot_duration, "count": count}
+            if name in (WeightedStrategy.name, WeightedSampleStrategy.name):
+                kwargs["weights"] = weights
+            if name == WeightedSampleStrategy.name:
+                # one sampler per strategy, as it caches the section weights it computed
+                kwargs["excluded"] = excluded
+                kwargs["sampler"] = create_weighted_sampler(sampler, logger=logger)
+                kwargs["catalog"] = catalog
+            return create_strategy(name, **kwargs)
+
+        section_strategies = env.dict("SECTION_STRATEGIES", {})
+        return RotationEngine(
+            default_strategy=strategy(env.str("STRATEGY", DEFAULT_ROTATION_STRATEGY)),
+            section_strategies={k: strategy(v) for k, v in section_strategies.items()},
+        )
+
+
+def create_rotation_cache(env: Env) -> Optional[RotationCache]:
+    with env.prefixed("ROTATION_CACHE_"):
+        if not env.bool("ENABLED", DEFAULT_ROTATION_CACHE_ENABLED):
+            return None
+        return RotationCache(
+            max_size=env.int("MAX_SIZE", DEFAULT_ROTATION_CACHE_MAX_SIZE),
+            serialize=env.bool("SERIALIZE", DEFAULT_ROTATION_CACHE_SERIALIZE),
+        )
+
+
+def create_deadline_guard(env: Env) -> Optional[DeadlineGuard]:
+    with env.prefixed("DEADLINES_"):
+        if not env.bool("ENABLED", DEFAULT_DEADLINES_ENABLED):
+            return None
+        return DeadlineGuard(
+            degrade_below=env.float("DEGRADE_BELOW", DEFAULT_DEADLINE_DEGRADE_BELOW),
+            degraded_ttl=env.int("DEGRADED_TTL", DEFAULT_DEADLINE_DEGRADED_TTL),
+        )
+
+
+def create_backfill_engine(env: Env, catalog: Optional["CatalogStore"] = None) -> BackfillEngine:
+    with env.prefixed("BACKFILL_"):
+        return BackfillEngine(
+            pools=CandidatePoolRegistry(max_pools=env.int("MAX_POOLS", DEFAULT_MAX_POOLS)),
+            catalog=catalog,
+        )
+
+
+def create_catalog(sdk: AccelByteSDK, env: Env, logger: Logger) -> Optional["CatalogStore"]:
+    with env.prefixed("AB_"):
+        namespace = env.str("NAMESPACE", DEFAULT_AB_NAMESPACE)
+
+    with env.prefixed("CATALOG_"):
+        if not env.bool("ENABLED", DEFAULT_CATALOG_ENABLED):
+            return None
+
+        from .catalog import (
+            DEFAULT_CATALOG_FULL_REFRESH_INTERVAL,
+            DEFAULT_CATALOG_PAGE_SIZE,
+            DEFAULT_CATALOG_REFRESH_INTERVAL,
+            CatalogStore,
+        )
+
+        return CatalogStore(
+            sdk=sdk,
+            namespace=namespace,
+            store_id=env.str("STORE_ID", None),
+            region=env.str("REGION", None),
+            page_size=env.int("PAGE_SIZE", DEFAULT_CATALOG_PAGE_SIZE),
+            refresh_interval=env.float("REFRESH_INTERVAL", DEFAULT_CATALOG_REFRESH_INTERVAL),
+            full_refresh_interval=env.float("FULL_REFRESH_INTERVAL", DEFAULT_CATALOG_FULL_REFRESH_INTERVAL),
+            logger=logger,
+        )
+
+
+def create_entitlement_lookup(sdk: AccelByteSDK, env: Env) -> Optional["EntitlementLookup"]:
+    with env.prefixed("AB_"):
+        namespace = env.str("NAMESPACE", DEFAULT_AB_NAMESPACE)
+
+    with env.prefixed("ENTITLEMENTS_"):
+        if not env.bool("ENABLED", DEFAULT_ENTITLEMENTS_ENABLED):
+            return None
+
+        from .entitlements import (
+            DEFAULT_ENTITLEMENTS_BATCH_WINDOW,
+            DEFAULT_ENTITLEMENTS_CACHE_MAX_SIZE,
+            DEFAULT_ENTITLEMENTS_CACHE_TTL,
+            DEFAULT_ENTITLEMENTS_MAX_BATCH_SIZE,
+            DEFAULT_ENTITLEMENTS_MAX_CONCURRENCY,
+            EntitlementLookup,
+        )
+
+        return EntitlementLookup(
+            sdk=sdk,
+            namespace=namespace,
+            cache_ttl=env.float("CACHE_TTL", DEFAULT_ENTITLEMENTS_CACHE_TTL),
+            max_cache_size=env.int("CACHE_MAX_SIZE", DEFAULT_ENTITLEMENTS_CACHE_MAX_SIZE),
+            batch_window=env.float("BATCH_WINDOW", DEFAULT_ENTITLEMENTS_BATCH_WINDOW),
+            max_batch_size=env.int("MAX_BATCH_SIZE", DEFAULT_ENTITLEMENTS_MAX_BATCH_SIZE),
+            max_concurrency=env.int("MAX_CONCURRENCY", DEFAULT_ENTITLEMENTS_MAX_CONCURRENCY),
+        )
+
+
+def run_worker_pool(env: Env, workers: int) -> None:
+    logger = logging.getLogger("app")
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("[supervisor] %(message)s"))
+    logger.addHandler(handler)
+
+    # must be set before the workers start so that they write their metrics there
+    setup_prometheus_multiprocess_dir()
+    with env.prefixed("ENABLE_"):
+        if env.bool("PROMETHEUS", DEFAULT_ENABLE_PROMETHEUS):
+            from accelbyte_grpc_plugin.opts.prometheus import (
+                create_multiprocess_registry,
+                get_metrics_server_settings,
+                start_metrics_server,
+            )
+
+            addr, port, endpoint, _ = get_metrics_server_settings(env)
+            start_metrics_server(
+                addr=addr, port=port, endpoint=endpoint, registry=create_multiprocess_registry()
+            )
+            logger.info(f"metrics server listening on {addr}:{port}{endpoint}")
+
+    logger.info(f"starting {workers} workers")
+    WorkerPool(target=run_worker, workers=workers, logger=logger).run()
+
+
+def run_worker() -> None:
+    env = create_env()
+    with env.prefixed("PLUGIN_GRPC_SERVER_"):
+        name = env.str("EVENT_LOOP", DEFAULT_PLUGIN_GRPC_SERVER_EVENT_LOOP)
+    event_loop.run(main(), event_loop=name, logger=logging.getLogger("app"))
+
+
 def run() -> None:
-    asyncio.run(main())
+    env = create_env()
+    with env.prefixed("PLUGIN_GRPC_SERVER_"):
+        workers_enabled = env.bool("WORKERS_ENABLED", DEFAULT_PLUGIN_GRPC_SERVER_WORKERS_ENABLED)
+        workers = env.int("WORKERS", default_worker_count())
+
+    if workers_enabled and get_worker_id() is None:
+        run_worker_pool(env=env, workers=workers)
+    else:
+        run_worker()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,331 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from logging import Logger
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Gauge, Histogram
+
+import accelbyte_py_sdk.api.platform as platform_service
+from accelbyte_grpc_plugin.workers import set_gauge_function
+from accelbyte_py_sdk import AccelByteSDK
+
+DEFAULT_CATALOG_PAGE_SIZE: int = 200
+DEFAULT_CATALOG_REFRESH_INTERVAL: float = 60.0
+DEFAULT_CATALOG_FULL_REFRESH_INTERVAL: float = 3600.0
+
+ACTIVE: str = "ACTIVE"
+
+
+class CatalogItem(NamedTuple):
+    """What the rotation and backfill rules need to know about an item.
+
+    Repeated strings (category paths, tags, currency codes, types) are interned,
+    times are Unix seconds and 0 means unbounded.
+    """
+
+    item_id: str
+    sku: str
+    name: str
+    item_type: str
+    category_path: str
+    tags: Tuple[str, ...]
+    active: bool
+    purchasable: bool
+    currency_code: str
+    price: int
+    available_from: int
+    available_until: int
+    updated_at: int
+
+    def is_available(self, now: float) -> bool:
+        return (
+            self.active
+            and self.purchasable
+            and self.available_from <= now
+            and (not self.available_until or now < self.available_until)
+        )
+
+
+class CatalogIndex:
+    """Immutable snapshot of the catalog, indexed by item ID and by SKU"""
+
+    __slots__ = ("items", "skus", "updated_at")
+
+    def __init__(self, items: Mapping[str, CatalogItem]) -> None:
+        self.items: Mapping[str, CatalogItem] = items
+        self.skus: Dict[str, CatalogItem] = {item.sku: item for item in items.values() if item.sku}
+        # high-water mark of the items' update times, where incremental refreshes resume
+        self.updated_at: int = max((item.updated_at for item in items.values()), default=0)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.items
+
+    def get(self, item_id: str) -> Optional[CatalogItem]:
+        return self.items.get(item_id, None)
+
+    def get_by_sku(self, sku: str) -> Optional[CatalogItem]:
+        return self.skus.get(sku, None)
+
+    def is_available(self, item_id: str, now: float) -> bool:
+        """Items the catalog does not know about are given the benefit of the doubt"""
+        item = self.items.get(item_id, None)
+        return item is None or item.is_available(now)
+
+
+EMPTY_CATALOG_INDEX = CatalogIndex({})
+
+
+def parse_timestamp(value: Optional[str]) -> int:
+    """Unix seconds of a platform timestamp (`2006-01-02T15:04:05.000Z`), 0 if unset or invalid"""
+    if not value:
+        return 0
+    # Python 3.10 parses neither the `Z` suffix nor nanosecond fractions, and seconds are enough
+    value = value.removesuffix("Z").partition(".")[0]
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _intern(value: Optional[str]) -> str:
+    return sys.intern(value) if value else ""
+
+
+def create_catalog_item(info: Any, region: Optional[str] = None) -> CatalogItem:
+    """Compact a platform `FullItemInfo` into a `CatalogItem`, using the prices of `region`
+    (or of the first region listed when not set)."""
+    region_data = getattr(info, "region_data", None) or {}
+    prices = region_data.get(region, None) if region else next(iter(region_data.values()), None)
+    price = prices[0] if prices else None
+
+    available_from = 0
+    available_until = 0
+    currency_code = ""
+    amount = 0
+    if price is not None:
+        currency_code = _intern(getattr(price, "currency_code", None))
+        discounted_price = getattr(price, "discounted_price", None)
+        amount = discounted_price if discounted_price is not None else (getattr(price, "price", None) or 0)
+        available_from = parse_timestamp(getattr(price, "purchase_at", None))
+        available_until = parse_timestamp(getattr(price, "expire_at", None))
+
+    purchasable = getattr(info, "purchasable", None)
+    return CatalogItem(
+        item_id=info.item_id,
+        sku=getattr(info, "sku", None) or "",
+        name=getattr(info, "name", None) or "",
+        item_type=_intern(str(getattr(info, "item_type", None) or "")),
+        category_path=_intern(getattr(info, "category_path", None)),
+        tags=tuple(_intern(tag) for tag in (getattr(info, "tags", None) or ())),
+        active=str(getattr(info, "status", ACTIVE)) == ACTIVE,
+        purchasable=purchasable is None or bool(purchasable),
+        currency_code=currency_code,
+        price=amount,
+        available_from=available_from,
+        available_until=available_until,
+        updated_at=parse_timestamp(getattr(info, "updated_at", None)),
+    )
+
+
+class CatalogStore:
+    """In-memory store catalog, kept up to date by a background task.
+
+    The whole store is loaded on start and every `full_refresh_interval` seconds, which
+    also drops deleted items. In between, every `refresh_interval` seconds only the items
+    updated since the last refresh are fetched (newest first, stopping at the first one
+    older than the index), and the index is only rebuilt when one of them changed.
+    Each refresh builds a new `CatalogIndex` and swaps it in with a single
+    assignment, so readers on the request path never wait and never see a
+    partially applied refresh. Failed refreshes keep serving the previous index.
+    """
+
+    def __init__(
+        self,
+        sdk: AccelByteSDK,
+        namespace: Optional[str] = None,
+        store_id: Optional[str] = None,
+        region: Optional[str] = None,
+        page_size: int = DEFAULT_CATALOG_PAGE_SIZE,
+        refresh_interval: float = DEFAULT_CATALOG_REFRESH_INTERVAL,
+        full_refresh_interval: float = DEFAULT_CATALOG_FULL_REFRESH_INTERVAL,
+        logger: Optional[Logger] = None,
+        registry: Optional[CollectorRegistry] = REGISTRY,
+    ) -> None:
+        self.sdk = sdk
+        self.namespace = namespace
+        self.store_id = store_id
+        self.region = region
+        self.page_size = page_size
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.logger = logger
+
+        self.index: CatalogIndex = EMPTY_CATALOG_INDEX
+        self._loaded = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._refreshed_at: Optional[float] = None
+        self._full_refreshed_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.refresh_duration = Histogram(
+            name="catalog_refresh_duration_seconds",
+            registry=registry,
+            documentation="duration of store catalog refreshes",
+            labelnames=["kind", "outcome"],
+        )
+        self.size = Gauge(
+            name="catalog_items",
+            registry=registry,
+            documentation="number of items in the store catalog index",
+            # every worker holds the whole catalog
+            multiprocess_mode="livemax",
+        )
+        set_gauge_function(self.size, lambda: len(self.index))
+        self.staleness = Gauge(
+            name="catalog_staleness_seconds",
+            registry=registry,
+            documentation="seconds since the store catalog index was last refreshed",
+            multiprocess_mode="livemax",
+        )
+        set_gauge_function(
+            self.staleness,
+            lambda: time.monotonic() - self._refreshed_at if self._refreshed_at is not None else float("inf"),
+        )
+
+    # lifecycle
+
+    def start(self) -> None:
+        """Start the background refresh task; must be called from the running event loop"""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_forever())
+
+    async def wait_until_ready(self) -> None:
+        await self._loaded.wait()
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._loaded.is_set()
+
+    # refreshes
+
+    async def refresh(self, full: bool = False) -> None:
+        async with self._lock:
+            kind = "full" if full or not self.is_ready else "incremental"
+            start = time.perf_counter()
+            outcome = "success"
+            try:
+                if kind == "full":
+                    await self._load_all()
+                else:
+                    await self._load_updated()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                outcome = "error"
+                if self.logger:
+                    self.logger.warning(f"failed to refresh the catalog: {type(error).__name__}: {error}")
+            finally:
+                self.refresh_duration.labels(kind=kind, outcome=outcome).observe(
+                    time.perf_counter() - start
+                )
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            full = (
+                self._full_refreshed_at is None
+                or time.monotonic() - self._full_refreshed_at >= self.full_refresh_interval
+            )
+            await self.refresh(full=full)
+            await asyncio.sleep(self.refresh_interval if self.is_ready else min(self.refresh_interval, 5.0))
+
+    async def _load_all(self) -> None:
+        items: Dict[str, CatalogItem] = {}
+        async for page in self.iter_pages(sort_by="updatedAt:asc"):
+            for item in page:
+                items[item.item_id] = item
+        self._swap(items)
+        self._full_refreshed_at = time.monotonic()
+
+    async def _load_updated(self) -> None:
+        index = self.index
+        since = index.updated_at
+        updated: List[CatalogItem] = []
+        async for page in self.iter_pages(sort_by="updatedAt:desc"):
+            for item in page:
+                if item.updated_at < since:
+                    break
+                # items stamped with the mark itself come back every time: only keep those that changed
+                known = index.get(item.item_id)
+                if known is not None and (known == item or known.updated_at > item.updated_at):
+                    continue
+                updated.append(item)
+            else:
+                continue
+            break
+        if not updated:
+            self._refreshed_at = time.monotonic()
+            return
+        items = dict(self.index.items)
+        for item in updated:
+            items[item.item_id] = item
+        self._swap(items)
+
+    def _swap(self, items: Dict[str, CatalogItem]) -> None:
+        self.index = CatalogIndex(items)
+        self._refreshed_at = time.monotonic()
+        self._loaded.set()
+
+    async def iter_pages(self, sort_by: str):
+        offset = 0
+        while True:
+            infos, has_next = await self.fetch_page(offset=offset, limit=self.page_size, sort_by=sort_by)
+            yield [create_catalog_item(info, region=self.region) for info in infos]
+            if not has_next or not infos:
+                return
+            offset += len(infos)
+
+    async def fetch_page(self, offset: int, limit: int, sort_by: str) -> Tuple[Iterable[Any], bool]:
+        result, error = await platform_service.query_items_v2_async(
+            namespace=self.namespace,
+            store_id=self.store_id,
+            sort_by=[sort_by],
+            offset=offset,
+            limit=limit,
+            sdk=self.sdk,
+        )
+        if error:
+            raise Exception(error)
+        data = result.data or []
+        paging = getattr(result, "paging", None)
+        return data, bool(paging is not None and getattr(paging, "next_", None))
+
+
+__all__ = [
+    "CatalogIndex",
+    "CatalogItem",
+    "CatalogStore",
+    "DEFAULT_CATALOG_FULL_REFRESH_INTERVAL",
+    "DEFAULT_CATALOG_PAGE_SIZE",
+    "DEFAULT_CATALOG_REFRESH_INTERVAL",
+    "EMPTY_CATALOG_INDEX",
+    "create_catalog_item",
+    "parse_timestamp",
+]
@@ -0,0 +1,78 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+from typing import Optional
+
+from grpc import StatusCode
+from prometheus_client import REGISTRY, CollectorRegistry, Counter
+
+DEFAULT_DEADLINE_DEGRADE_BELOW: float = 0.05
+DEFAULT_DEADLINE_DEGRADED_TTL: int = 60
+
+DEGRADED_CACHED: str = "cached"
+DEGRADED_FALLBACK: str = "fallback"
+DEGRADED_OWNED_FLAGS: str = "owned_flags"
+
+
+class DeadlineGuard:
+    """Reads what is left of a call's deadline so handlers can cut their work short.
+
+    Calls that are cancelled or past their deadline are not worth answering: the
+    caller already gave up, so `check` reports the status to abort them with and
+    counts them as skipped. Calls with less than `degrade_below` seconds left are
+    `low`: handlers answer them from what they have at hand (the last cached
+    rotation, the request alone) instead of computing or looking it up. Calls
+    without a deadline are never low.
+    """
+
+    def __init__(
+        self,
+        degrade_below: float = DEFAULT_DEADLINE_DEGRADE_BELOW,
+        degraded_ttl: int = DEFAULT_DEADLINE_DEGRADED_TTL,
+        registry: Optional[CollectorRegistry] = REGISTRY,
+    ) -> None:
+        self.degrade_below = degrade_below
+        # how long clients may keep a degraded rotation before asking again
+        self.degraded_ttl = degraded_ttl
+
+        self.skipped = Counter(
+            name="section_deadline_skipped_calls",
+            registry=registry,
+            documentation="calls whose work was skipped because they were cancelled or past their deadline",
+            labelnames=["method", "reason"],
+        )
+        self.degraded = Counter(
+            name="section_deadline_degraded_responses",
+            registry=registry,
+            documentation="responses degraded because little of the call's deadline was left",
+            labelnames=["method", "source"],
+        )
+
+    def check(self, context, method: str) -> Optional[StatusCode]:
+        """None if the call is still worth answering, else the status to abort it with"""
+        if context.cancelled():
+            self.skipped.labels(method=method, reason="cancelled").inc()
+            return StatusCode.CANCELLED
+        remaining = context.time_remaining()
+        if remaining is not None and remaining <= 0.0:
+            self.skipped.labels(method=method, reason="deadline_exceeded").inc()
+            return StatusCode.DEADLINE_EXCEEDED
+        return None
+
+    def low(self, context) -> bool:
+        remaining = context.time_remaining()
+        return remaining is not None and remaining < self.degrade_below
+
+    def count_degraded(self, method: str, source: str) -> None:
+        self.degraded.labels(method=method, source=source).inc()
+
+
+__all__ = [
+    "DEFAULT_DEADLINE_DEGRADED_TTL",
+    "DEFAULT_DEADLINE_DEGRADE_BELOW",
+    "DEGRADED_CACHED",
+    "DEGRADED_FALLBACK",
+    "DEGRADED_OWNED_FLAGS",
+    "DeadlineGuard",
+]
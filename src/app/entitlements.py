@@ -0,0 +1,224 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, Union
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram
+
+import accelbyte_py_sdk.api.platform as platform_service
+from accelbyte_py_sdk import AccelByteSDK
+
+DEFAULT_ENTITLEMENTS_CACHE_TTL: float = 5.0
+DEFAULT_ENTITLEMENTS_CACHE_MAX_SIZE: int = 10_000
+DEFAULT_ENTITLEMENTS_BATCH_WINDOW: float = 0.002
+DEFAULT_ENTITLEMENTS_MAX_BATCH_SIZE: int = 64
+DEFAULT_ENTITLEMENTS_MAX_CONCURRENCY: int = 16
+DEFAULT_ENTITLEMENTS_PAGE_SIZE: int = 100
+
+OwnedItemIds = FrozenSet[str]
+
+
+class EntitlementLookup:
+    """Item IDs a user owns, for Backfill to exclude on top of the request's `owned` flags.
+
+    Lookups are served from a short-TTL per-user cache. Misses are coalesced: a user
+    already being looked up joins the pending lookup, and the distinct users missed
+    within `batch_window` seconds (up to `max_batch_size`) are fetched as one batch.
+    The platform has no multi-user entitlement query, so `fetch_owned_item_ids` runs
+    a batch as per-user queries capped at `max_concurrency`; override it to plug in a
+    bulk source.
+    """
+
+    def __init__(
+        self,
+        sdk: AccelByteSDK,
+        namespace: Optional[str] = None,
+        cache_ttl: float = DEFAULT_ENTITLEMENTS_CACHE_TTL,
+        max_cache_size: int = DEFAULT_ENTITLEMENTS_CACHE_MAX_SIZE,
+        batch_window: float = DEFAULT_ENTITLEMENTS_BATCH_WINDOW,
+        max_batch_size: int = DEFAULT_ENTITLEMENTS_MAX_BATCH_SIZE,
+        max_concurrency: int = DEFAULT_ENTITLEMENTS_MAX_CONCURRENCY,
+        page_size: int = DEFAULT_ENTITLEMENTS_PAGE_SIZE,
+        registry: Optional[CollectorRegistry] = REGISTRY,
+    ) -> None:
+        self.sdk = sdk
+        self.namespace = namespace
+        self.cache_ttl = cache_ttl
+        self.max_cache_size = max_cache_size
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.page_size = page_size
+
+        # user ID -> (owned item IDs, expires at)
+        self._cache: "OrderedDict[str, Tuple[OwnedItemIds, float]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._batch: List[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.lookups = Counter(
+            name="entitlement_lookups",
+            registry=registry,
+            documentation="entitlement lookups by how they were served",
+            labelnames=["result"],
+        )
+        self.hits = self.lookups.labels(result="hit")
+        self.misses = self.lookups.labels(result="miss")
+        self.coalesced = self.lookups.labels(result="coalesced")
+        self.batch_size = Histogram(
+            name="entitlement_lookup_batch_size",
+            registry=registry,
+            documentation="number of users fetched per entitlement lookup batch",
+            buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+        )
+        self.latency = Histogram(
+            name="entitlement_lookup_duration_seconds",
+            registry=registry,
+            documentation="duration of entitlement lookup batches",
+            labelnames=["outcome"],
+        )
+
+    async def get_owned_item_ids(self, user_id: str) -> OwnedItemIds:
+        cached = self._cache.get(user_id, None)
+        if cached is not None:
+            if cached[1] > time.monotonic():
+                self._cache.move_to_end(user_id)
+                self.hits.inc()
+                return cached[0]
+            del self._cache[user_id]
+
+        future = self._pending.get(user_id, None)
+        if future is not None:
+            self.coalesced.inc()
+        else:
+            self.misses.inc()
+            future = self._enqueue(user_id)
+        # a cancelled caller must not cancel the lookup the other callers wait for
+        return await asyncio.shield(future)
+
+    def invalidate(self, user_id: str) -> None:
+        self._cache.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    async def close(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _enqueue(self, user_id: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # callers may have gone away by the time a lookup fails
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending[user_id] = future
+        self._batch.append(user_id)
+        if len(self._batch) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        futures = {user_id: self._pending[user_id] for user_id in batch}
+        task = asyncio.get_running_loop().create_task(self._resolve_batch(futures))
+        self._tasks.add(task)
+        task.add_done_callback(lambda task: self._finish_batch(task, futures))
+
+    def _finish_batch(self, task: asyncio.Task, futures: Dict[str, asyncio.Future]) -> None:
+        self._tasks.discard(task)
+        # e.g. cancelled on shutdown, possibly before it even started (so a `finally:` in the task
+        # would not run): later lookups must not join futures nobody resolves
+        for user_id, future in futures.items():
+            if self._pending.get(user_id, None) is future:
+                del self._pending[user_id]
+            if not future.done():
+                future.set_exception(LookupError(f"entitlement lookup for user {user_id} was cancelled"))
+
+    async def _resolve_batch(self, futures: Dict[str, asyncio.Future]) -> None:
+        user_ids = list(futures)
+        self.batch_size.observe(len(user_ids))
+        start = time.perf_counter()
+        outcome = "success"
+        try:
+            results = await self.fetch_owned_item_ids(user_ids)
+        except Exception as error:
+            results = {user_id: error for user_id in user_ids}
+        elapsed = time.perf_counter() - start
+
+        expires_at = time.monotonic() + self.cache_ttl
+        for user_id, future in futures.items():
+            self._pending.pop(user_id, None)
+            result = results.get(user_id, None)
+            if isinstance(result, BaseException) or result is None:
+                outcome = "error"
+                error = result or LookupError(f"no entitlements returned for user {user_id}")
+                if not future.done():
+                    future.set_exception(error)
+                continue
+            self._cache[user_id] = (result, expires_at)
+            self._cache.move_to_end(user_id)
+            if not future.done():
+                future.set_result(result)
+        while len(self._cache) > self.max_cache_size:
+            self._cache.popitem(last=False)
+        self.latency.labels(outcome=outcome).observe(elapsed)
+
+    async def fetch_owned_item_ids(
+        self, user_ids: Sequence[str]
+    ) -> Dict[str, Union[OwnedItemIds, BaseException]]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(user_id: str) -> OwnedItemIds:
+            async with semaphore:
+                return await self.fetch_user_owned_item_ids(user_id)
+
+        results = await asyncio.gather(*(fetch(user_id) for user_id in user_ids), return_exceptions=True)
+        return dict(zip(user_ids, results))
+
+    async def fetch_user_owned_item_ids(self, user_id: str) -> OwnedItemIds:
+        item_ids: Set[str] = set()
+        offset = 0
+        while True:
+            result, error = await platform_service.query_user_entitlements_async(
+                user_id=user_id,
+                active_only=True,
+                offset=offset,
+                limit=self.page_size,
+                namespace=self.namespace,
+                sdk=self.sdk,
+            )
+            if error:
+                raise Exception(error)
+            data = result.data or []
+            item_ids.update(entitlement.item_id for entitlement in data if entitlement.item_id)
+            paging = getattr(result, "paging", None)
+            if not data or paging is None or not getattr(paging, "next_", None):
+                return frozenset(item_ids)
+            offset += len(data)
+
+
+__all__ = [
+    "DEFAULT_ENTITLEMENTS_BATCH_WINDOW",
+    "DEFAULT_ENTITLEMENTS_CACHE_MAX_SIZE",
+    "DEFAULT_ENTITLEMENTS_CACHE_TTL",
+    "DEFAULT_ENTITLEMENTS_MAX_BATCH_SIZE",
+    "DEFAULT_ENTITLEMENTS_MAX_CONCURRENCY",
+    "DEFAULT_ENTITLEMENTS_PAGE_SIZE",
+    "EntitlementLookup",
+    "OwnedItemIds",
+]
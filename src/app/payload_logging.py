@@ -0,0 +1,139 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import json
+import logging
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import Logger
+from typing import Optional, Union
+
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.message import Message
+
+DEFAULT_PAYLOAD_LOG_MAX_BYTES: int = 16 * 1024
+DEFAULT_PAYLOAD_LOG_SAMPLE_RATE: float = 1.0
+DEFAULT_PAYLOAD_LOG_MAX_PENDING: int = 1000
+
+
+def count_items(payload: Message) -> int:
+    """Count the elements of every repeated message field, nested messages included"""
+    count = 0
+    for field, value in payload.ListFields():
+        if field.message_type is None:
+            continue
+        if field.label == field.LABEL_REPEATED:
+            count += len(value)
+        else:
+            count += count_items(value)
+    return count
+
+
+def serialize_payload(payload: Message, max_bytes: int = 0) -> str:
+    if max_bytes > 0:
+        # the JSON form is never smaller than the wire form, skip serializing what would be dropped
+        size = payload.ByteSize()
+        if size > max_bytes:
+            return summarize_payload(payload, size)
+    payload_json = json.dumps(MessageToDict(payload, preserving_proto_field_name=True))
+    if 0 < max_bytes < len(payload_json):
+        return summarize_payload(payload, payload.ByteSize())
+    return payload_json
+
+
+def summarize_payload(payload: Message, size: int) -> str:
+    return json.dumps({"truncated": True, "bytes": size, "items": count_items(payload)})
+
+
+class LazyPayload:
+    """Serialized only when a handler formats the log record"""
+
+    __slots__ = ("payload", "max_bytes")
+
+    def __init__(self, payload: Message, max_bytes: int = 0) -> None:
+        self.payload = payload
+        self.max_bytes = max_bytes
+
+    def __str__(self) -> str:
+        return serialize_payload(self.payload, self.max_bytes)
+
+
+class PayloadLogger:
+    """Logs request and response payloads, sampled and size-capped.
+
+    With `offload`, payloads are serialized and logged on a dedicated thread
+    rather than on the event loop. At most `max_pending` of them wait for it;
+    beyond that they are dropped (and counted in `dropped`), so a slow log
+    handler cannot pile up payloads in memory.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        sample_rate: float = DEFAULT_PAYLOAD_LOG_SAMPLE_RATE,
+        max_bytes: int = DEFAULT_PAYLOAD_LOG_MAX_BYTES,
+        offload: bool = False,
+        level: Union[int, str] = logging.INFO,
+        max_pending: int = DEFAULT_PAYLOAD_LOG_MAX_PENDING,
+    ) -> None:
+        self.logger = logger
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.offload = offload
+        if isinstance(level, str):
+            # unknown names map to "Level <name>"
+            name, level = level, logging.getLevelName(level)
+            if not isinstance(level, int):
+                raise ValueError(f"unknown log level: {name!r}")
+        self.level = level
+        self.max_pending = max_pending
+        self.dropped = 0
+
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # noinspection PyShadowingBuiltins
+    def log(self, format: str, payload: Message) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        if self.offload:
+            if not self._pending.acquire(blocking=False):
+                self.dropped += 1
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="payload-logging")
+            self._executor.submit(self._log_serialized, format, payload).add_done_callback(self._done)
+            return
+        self.logger.log(self.level, format, LazyPayload(payload, self.max_bytes))
+
+    def close(self) -> None:
+        """Log the pending payloads and stop the thread"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # noinspection PyShadowingBuiltins
+    def _log_serialized(self, format: str, payload: Message) -> None:
+        self.logger.log(self.level, format, serialize_payload(payload, self.max_bytes))
+
+    def _done(self, future: "Future[None]") -> None:
+        self._pending.release()
+        if future.cancelled():
+            return
+        if (error := future.exception()) is not None:
+            self.logger.warning(f"failed to log payload: {type(error).__name__}: {error}")
+
+
+__all__ = [
+    "DEFAULT_PAYLOAD_LOG_MAX_BYTES",
+    "DEFAULT_PAYLOAD_LOG_MAX_PENDING",
+    "DEFAULT_PAYLOAD_LOG_SAMPLE_RATE",
+    "LazyPayload",
+    "PayloadLogger",
+    "count_items",
+    "serialize_payload",
+]
@@ -0,0 +1,184 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import math
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import mmh3
+
+from section_pb2 import BackfillRequest, BackfilledItemObject, SectionObject
+
+from .strategies import section_fingerprint
+
+if TYPE_CHECKING:
+    from ..catalog import CatalogIndex, CatalogStore
+
+DEFAULT_MAX_POOLS: int = 4096
+
+
+class CandidatePool(NamedTuple):
+    fingerprint: int
+    item_ids: Tuple[str, ...]
+    item_skus: Tuple[str, ...]
+
+
+class CandidatePoolRegistry:
+    """Items configured per section, learned from the sections seen by GetRotationItems.
+
+    BackfillRequest only carries the items currently shown, so the replacement
+    candidates come from here. The pool of a section is rebuilt only when its
+    fingerprint changes.
+    """
+
+    def __init__(self, max_pools: int = DEFAULT_MAX_POOLS) -> None:
+        self.max_pools = max_pools
+        self._pools: "OrderedDict[str, CandidatePool]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def get(self, section_id: str) -> Optional[CandidatePool]:
+        return self._pools.get(section_id, None)
+
+    def update(self, section: SectionObject, fingerprint: Optional[int] = None) -> CandidatePool:
+        if fingerprint is None:
+            fingerprint = section_fingerprint(section)
+        pool = self._pools.get(section.sectionId, None)
+        if pool is None or pool.fingerprint != fingerprint:
+            items = section.items
+            pool = CandidatePool(
+                fingerprint=fingerprint,
+                item_ids=tuple(item.itemId for item in items),
+                item_skus=tuple(item.itemSku for item in items),
+            )
+            self._pools[section.sectionId] = pool
+        self._pools.move_to_end(section.sectionId)
+        while len(self._pools) > self.max_pools:
+            self._pools.popitem(last=False)
+        return pool
+
+
+class BackfillEngine:
+    """Replaces owned items with distinct candidates the user neither owns nor already sees.
+
+    The candidates are the section's items when GetRotationItems has seen the section.
+    The platform only calls it for CUSTOM rotations, while Backfill is called for
+    FIXED_PERIOD ones, so otherwise they are the store's items from the `catalog`.
+    Without either, an owned item is replaced with one of the shown items the user
+    does not own, rather than not at all.
+
+    Candidates are visited in a per-user permutation of the pool (a seeded offset and
+    a stride coprime with the pool size), so retries of the same request get the same
+    replacements while different users get different ones. Exclusion is set-based, so
+    the cost is linear in the shown items plus the candidates visited. With a
+    `catalog`, candidates it knows to be unavailable right now are skipped too.
+    """
+
+    def __init__(
+        self,
+        pools: Optional[CandidatePoolRegistry] = None,
+        catalog: Optional["CatalogStore"] = None,
+    ) -> None:
+        self.pools = pools if pools is not None else CandidatePoolRegistry()
+        self.catalog = catalog
+        # the store's items as a pool, for the catalog index it was built from
+        self._catalog_pool: Optional[Tuple["CatalogIndex", CandidatePool]] = None
+
+    def backfill(
+        self,
+        request: BackfillRequest,
+        excluded_item_ids: Iterable[str] = (),
+    ) -> List[BackfilledItemObject]:
+        owned_indexes: List[int] = []
+        excluded: Set[str] = set(excluded_item_ids)
+        for item in request.items:
+            excluded.add(item.itemId)
+            if item.owned:
+                owned_indexes.append(item.index)
+        if not owned_indexes:
+            return []
+
+        pool = self.get_pool(request.sectionId)
+        if pool is None:
+            return self.backfill_from_request(request, owned_indexes, excluded_item_ids)
+
+        catalog_index = self.catalog.index if self.catalog is not None else None
+        now = time.time()
+        backfilled: List[BackfilledItemObject] = []
+        candidates = self.iter_candidates(pool, request.userId, request.sectionId)
+        for index in owned_indexes:
+            for i in candidates:
+                item_id = pool.item_ids[i]
+                if item_id in excluded:
+                    continue
+                if catalog_index is not None and not catalog_index.is_available(item_id, now):
+                    continue
+                excluded.add(item_id)
+                backfilled.append(
+                    BackfilledItemObject(itemId=item_id, itemSku=pool.item_skus[i], index=index)
+                )
+                break
+            else:
+                # pool exhausted, the remaining owned slots are left as they are
+                break
+        return backfilled
+
+    def get_pool(self, section_id: str) -> Optional[CandidatePool]:
+        pool = self.pools.get(section_id)
+        if pool is not None or self.catalog is None:
+            return pool
+        index = self.catalog.index
+        if not len(index):
+            return None
+        if self._catalog_pool is None or self._catalog_pool[0] is not index:
+            items = index.items.values()
+            pool = CandidatePool(
+                fingerprint=index.updated_at,
+                item_ids=tuple(item.item_id for item in items),
+                item_skus=tuple(item.sku for item in items),
+            )
+            self._catalog_pool = (index, pool)
+        return self._catalog_pool[1]
+
+    def backfill_from_request(
+        self,
+        request: BackfillRequest,
+        owned_indexes: List[int],
+        excluded_item_ids: Iterable[str] = (),
+    ) -> List[BackfilledItemObject]:
+        """Replacements from the shown items the user does not own, when there is no pool"""
+        owned_item_ids = set(excluded_item_ids)
+        candidates = [
+            item for item in request.items if not item.owned and item.itemId not in owned_item_ids
+        ]
+        if not candidates:
+            return []
+        seed = mmh3.hash64(f"{request.userId}:{request.sectionId}", signed=False)[0]
+        backfilled: List[BackfilledItemObject] = []
+        for i, index in enumerate(owned_indexes):
+            item = candidates[(seed + i) % len(candidates)]
+            backfilled.append(BackfilledItemObject(itemId=item.itemId, itemSku=item.itemSku, index=index))
+        return backfilled
+
+    @staticmethod
+    def iter_candidates(pool: CandidatePool, user_id: str, section_id: str) -> Iterable[int]:
+        size = len(pool.item_ids)
+        if not size:
+            return iter(())
+        seed = mmh3.hash64(f"{user_id}:{section_id}:{pool.fingerprint}", signed=False)[0]
+        offset = seed % size
+        stride = (seed >> 32) % size or 1
+        while math.gcd(stride, size) != 1:
+            stride += 1
+        return ((offset + i * stride) % size for i in range(size))
+
+
+__all__ = [
+    "BackfillEngine",
+    "CandidatePool",
+    "CandidatePoolRegistry",
+    "DEFAULT_MAX_POOLS",
+]
@@ -0,0 +1,155 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge
+
+from accelbyte_grpc_plugin.workers import set_gauge_function
+
+from section_pb2 import GetRotationItemsResponse, SectionObject
+
+from .strategies import RotationSlot, section_fingerprint
+
+RotationCacheKey = Tuple[str, int, int]
+
+DEFAULT_ROTATION_CACHE_MAX_SIZE: int = 4096
+
+
+class RotationCacheEntry(NamedTuple):
+    response: GetRotationItemsResponse
+    data: Optional[bytes]
+    expires_at: float
+
+
+class RotationCache:
+    """LRU cache of rotation responses keyed by section ID, section fingerprint and slot.
+
+    Entries expire when the rotation does (its `expiredAt`). With `serialize` the
+    response is also kept pre-serialized so it can be written to the wire as is.
+    The last entry put for each section can also be looked up by section ID alone
+    (`get_latest`), without fingerprinting the section.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_ROTATION_CACHE_MAX_SIZE,
+        serialize: bool = False,
+        clock: Callable[[], float] = time.time,
+        registry: Optional[CollectorRegistry] = REGISTRY,
+    ) -> None:
+        self.max_size = max_size
+        self.serialize = serialize
+        self.clock = clock
+        self._entries: "OrderedDict[RotationCacheKey, RotationCacheEntry]" = OrderedDict()
+        # section ID -> key of the last entry put for it
+        self._latest: Dict[str, RotationCacheKey] = {}
+
+        self.requests = Counter(
+            name="rotation_cache_requests",
+            registry=registry,
+            documentation="rotation cache lookups",
+            labelnames=["result"],
+        )
+        self.hits = self.requests.labels(result="hit")
+        self.misses = self.requests.labels(result="miss")
+        self.evictions = Counter(
+            name="rotation_cache_evictions",
+            registry=registry,
+            documentation="rotation cache evictions",
+            labelnames=["reason"],
+        )
+        self.expired = self.evictions.labels(reason="expired")
+        self.capacity = self.evictions.labels(reason="capacity")
+        self.hit_ratio = Gauge(
+            name="rotation_cache_hit_ratio",
+            registry=registry,
+            documentation="ratio of rotation cache lookups that were hits",
+            # a ratio per worker, as ratios do not add up
+            multiprocess_mode="liveall",
+        )
+        set_gauge_function(self.hit_ratio, self._hit_ratio)
+        self.size = Gauge(
+            name="rotation_cache_size",
+            registry=registry,
+            documentation="number of entries in the rotation cache",
+            multiprocess_mode="livesum",
+        )
+        set_gauge_function(self.size, lambda: len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def create_key(section: SectionObject, slot: RotationSlot) -> RotationCacheKey:
+        return section.sectionId, section_fingerprint(section), slot.index
+
+    def get(self, key: RotationCacheKey) -> Optional[RotationCacheEntry]:
+        entry = self._entries.get(key, None)
+        if entry is None:
+            self.misses.inc()
+            return None
+        if entry.expires_at <= self.clock():
+            self._remove(key)
+            self.expired.inc()
+            self.misses.inc()
+            return None
+        self._entries.move_to_end(key)
+        self.hits.inc()
+        return entry
+
+    def get_latest(self, section_id: str) -> Optional[RotationCacheEntry]:
+        """The last unexpired entry put for the section, whatever its items or slot were"""
+        key = self._latest.get(section_id, None)
+        if key is None:
+            return None
+        entry = self._entries.get(key, None)
+        if entry is None or entry.expires_at <= self.clock():
+            if entry is not None:
+                self._remove(key)
+                self.expired.inc()
+            else:
+                del self._latest[section_id]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: RotationCacheKey, response: GetRotationItemsResponse) -> RotationCacheEntry:
+        data = response.SerializeToString() if self.serialize else None
+        entry = RotationCacheEntry(response=response, data=data, expires_at=response.expiredAt)
+        if self.max_size <= 0 or entry.expires_at <= self.clock():
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._latest[key[0]] = key
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._latest.get(evicted[0], None) == evicted:
+                del self._latest[evicted[0]]
+            self.capacity.inc()
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._latest.clear()
+
+    def _remove(self, key: RotationCacheKey) -> None:
+        del self._entries[key]
+        if self._latest.get(key[0], None) == key:
+            del self._latest[key[0]]
+
+    def _hit_ratio(self) -> float:
+        hits = self.hits._value.get()
+        total = hits + self.misses._value.get()
+        return hits / total if total else 0.0
+
+
+__all__ = [
+    "DEFAULT_ROTATION_CACHE_MAX_SIZE",
+    "RotationCache",
+    "RotationCacheEntry",
+    "RotationCacheKey",
+]
@@ -0,0 +1,284 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import bisect
+import itertools
+import math
+import random
+from abc import ABC, abstractmethod
+from logging import Logger
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from section_pb2 import SectionObject
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from ..catalog import CatalogIndex
+
+NUMPY: str = "numpy"
+PYTHON: str = "python"
+
+DEFAULT_MAX_CACHED_SECTIONS: int = 1024
+
+
+class SectionWeights:
+    """A section's items in array form, built once per section version (its fingerprint).
+
+    `weights` and `cumulative` are lists or NumPy arrays, whichever the sampler that
+    built them works on. The catalog availability of the items is kept alongside,
+    rebuilt whenever the catalog swaps in a new index, and so are the weights masked
+    by it for the last time asked (the start of the slot, so once per slot).
+    """
+
+    __slots__ = ("fingerprint", "weights", "cumulative", "total", "catalog_index", "availability", "masked")
+
+    def __init__(self, fingerprint: int, weights: Any, cumulative: Any, total: float) -> None:
+        self.fingerprint = fingerprint
+        self.weights = weights
+        self.cumulative = cumulative
+        self.total = total
+        self.catalog_index: Optional["CatalogIndex"] = None
+        # (usable, available from, available until), until is +inf when unbounded
+        self.availability: Optional[Tuple[Any, Any, Any]] = None
+        # (catalog index, time, (weights, cumulative, total)) of the last masking
+        self.masked: Optional[Tuple["CatalogIndex", float, Tuple[Any, Any, float]]] = None
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+
+class WeightedSampler(ABC):
+    """Draws k distinct items with probability proportional to their weight (without replacement).
+
+    Items are drawn from the cumulative weights and already drawn ones are rejected,
+    which is the same as drawing from what is left. When a round of draws falls
+    short, the drawn items' weights are zeroed and the cumulative weights rebuilt,
+    so heavy items cannot starve the draw. Items with no weight, and with a catalog
+    index the items it knows to be unavailable, are never drawn.
+
+    Subclasses only supply the array primitives. The uniforms come from one seeded
+    `random.Random` either way, and sums are accumulated in item order, so every
+    sampler returns the same items for the same section, weights and seed.
+    """
+
+    name: str = ""
+
+    def __init__(self, max_cached_sections: int = DEFAULT_MAX_CACHED_SECTIONS) -> None:
+        self.max_cached_sections = max_cached_sections
+        # section ID -> its weights, for the last version seen
+        self._sections: Dict[str, SectionWeights] = {}
+
+    def get_weights(
+        self,
+        section: SectionObject,
+        get_weight: Callable[[str, str], float],
+        fingerprint: int,
+    ) -> SectionWeights:
+        cached = self._sections.get(section.sectionId, None)
+        if cached is not None and cached.fingerprint == fingerprint:
+            return cached
+
+        weights = self.array([self.clean_weight(get_weight(item.itemId, item.itemSku)) for item in section.items])
+        cumulative, total = self.accumulate(weights)
+        section_weights = SectionWeights(fingerprint, weights, cumulative, total)
+        if len(self._sections) >= self.max_cached_sections:
+            self._sections.clear()
+        self._sections[section.sectionId] = section_weights
+        return section_weights
+
+    def sample(
+        self,
+        section: SectionObject,
+        section_weights: SectionWeights,
+        count: int,
+        seed: int,
+        catalog_index: Optional["CatalogIndex"] = None,
+        now: float = 0.0,
+    ) -> List[int]:
+        """Indices of up to `count` distinct items, fewer if fewer can be drawn"""
+        weights = section_weights.weights
+        cumulative = section_weights.cumulative
+        total = section_weights.total
+        if catalog_index is not None and len(catalog_index):
+            weights, cumulative, total = self.get_masked(section, section_weights, catalog_index, now)
+
+        size = len(weights)
+        count = min(count, size)
+        rng = random.Random(seed)
+        selected: List[int] = []
+        seen = set()
+        while len(selected) < count and total > 0.0:
+            # twice what is missing, so a round rarely ends short while count is small next to the section
+            targets = [rng.random() * total for _ in range(2 * (count - len(selected)))]
+            drawn = len(selected)
+            for index in self.search(cumulative, targets):
+                if index < size and index not in seen:
+                    seen.add(index)
+                    selected.append(index)
+                    if len(selected) == count:
+                        return selected
+            if len(selected) == drawn:
+                # only rounding can leave a round with nothing new: what is left is not worth drawing
+                break
+            weights = self.zero(weights, selected)
+            cumulative, total = self.accumulate(weights)
+        return selected
+
+    def get_masked(
+        self, section: SectionObject, section_weights: SectionWeights, catalog_index: "CatalogIndex", now: float
+    ) -> Tuple[Any, Any, float]:
+        masked = section_weights.masked
+        if masked is None or masked[0] is not catalog_index or masked[1] != now:
+            weights = self.mask(
+                section_weights.weights, self.get_availability(section, section_weights, catalog_index), now
+            )
+            cumulative, total = self.accumulate(weights)
+            masked = section_weights.masked = (catalog_index, now, (weights, cumulative, total))
+        return masked[2]
+
+    def get_availability(
+        self, section: SectionObject, section_weights: SectionWeights, catalog_index: "CatalogIndex"
+    ) -> Tuple[Any, Any, Any]:
+        if section_weights.catalog_index is not catalog_index or section_weights.availability is None:
+            usable, available_from, available_until = [], [], []
+            for item in section.items:
+                catalog_item = catalog_index.get(item.itemId)
+                if catalog_item is None:
+                    # items the catalog does not know about are given the benefit of the doubt
+                    usable.append(True)
+                    available_from.append(0.0)
+                    available_until.append(float("inf"))
+                else:
+                    usable.append(catalog_item.active and catalog_item.purchasable)
+                    available_from.append(float(catalog_item.available_from))
+                    available_until.append(
+                        float(catalog_item.available_until) if catalog_item.available_until else float("inf")
+                    )
+            section_weights.availability = (
+                self.array(usable, bool),
+                self.array(available_from),
+                self.array(available_until),
+            )
+            section_weights.catalog_index = catalog_index
+        return section_weights.availability
+
+    def clear(self) -> None:
+        self._sections.clear()
+
+    @staticmethod
+    def clean_weight(weight: float) -> float:
+        """Weights that are negative, NaN or infinite count as 0: an infinite one would leave nothing to draw by"""
+        return weight if math.isfinite(weight) and weight > 0.0 else 0.0
+
+    @abstractmethod
+    def array(self, values: List[Any], dtype: type = float) -> Any:
+        ...
+
+    @abstractmethod
+    def accumulate(self, weights: Any) -> Tuple[Any, float]:
+        """Running sums of the weights, in item order, and their total"""
+
+    @abstractmethod
+    def search(self, cumulative: Any, targets: List[float]) -> Sequence[int]:
+        """For each target, the first index whose running sum is above it"""
+
+    @abstractmethod
+    def zero(self, weights: Any, indices: List[int]) -> Any:
+        """A copy of the weights with those at the indices set to 0"""
+
+    @abstractmethod
+    def mask(self, weights: Any, availability: Tuple[Any, Any, Any], now: float) -> Any:
+        """A copy of the weights with those of the items unavailable at `now` set to 0"""
+
+
+class PythonWeightedSampler(WeightedSampler):
+    name = PYTHON
+
+    def array(self, values: List[Any], dtype: type = float) -> Any:
+        return values
+
+    def accumulate(self, weights: List[float]) -> Tuple[List[float], float]:
+        cumulative = list(itertools.accumulate(weights))
+        return cumulative, cumulative[-1] if cumulative else 0.0
+
+    def search(self, cumulative: List[float], targets: List[float]) -> Sequence[int]:
+        return [bisect.bisect_right(cumulative, target) for target in targets]
+
+    def zero(self, weights: List[float], indices: List[int]) -> List[float]:
+        weights = list(weights)
+        for index in indices:
+            weights[index] = 0.0
+        return weights
+
+    def mask(self, weights: List[float], availability: Tuple[Any, Any, Any], now: float) -> List[float]:
+        usable, available_from, available_until = availability
+        return [
+            weight if ok and start <= now < end else 0.0
+            for weight, ok, start, end in zip(weights, usable, available_from, available_until)
+        ]
+
+
+class NumpyWeightedSampler(WeightedSampler):
+    name = NUMPY
+
+    def __init__(self, max_cached_sections: int = DEFAULT_MAX_CACHED_SECTIONS) -> None:
+        if numpy is None:
+            raise ImportError("numpy is not installed")
+        super().__init__(max_cached_sections=max_cached_sections)
+
+    def array(self, values: List[Any], dtype: type = float) -> Any:
+        return numpy.array(values, dtype=numpy.bool_ if dtype is bool else numpy.float64)
+
+    def accumulate(self, weights: Any) -> Tuple[Any, float]:
+        # a sequential running sum (not pairwise), so it matches the pure Python one to the bit
+        cumulative = numpy.cumsum(weights)
+        return cumulative, float(cumulative[-1]) if len(cumulative) else 0.0
+
+    def search(self, cumulative: Any, targets: List[float]) -> Sequence[int]:
+        return numpy.searchsorted(cumulative, targets, side="right").tolist()
+
+    def zero(self, weights: Any, indices: List[int]) -> Any:
+        weights = weights.copy()
+        weights[indices] = 0.0
+        return weights
+
+    def mask(self, weights: Any, availability: Tuple[Any, Any, Any], now: float) -> Any:
+        usable, available_from, available_until = availability
+        return numpy.where(usable & (available_from <= now) & (now < available_until), weights, 0.0)
+
+
+SAMPLERS: Dict[str, type] = {
+    NUMPY: NumpyWeightedSampler,
+    PYTHON: PythonWeightedSampler,
+}
+
+
+def create_weighted_sampler(name: str = NUMPY, logger: Optional[Logger] = None, **kwargs) -> WeightedSampler:
+    """NumPy is optional: when it is asked for but not installed, this falls back to pure Python with a warning"""
+    try:
+        sampler_type = SAMPLERS[name]
+    except KeyError:
+        raise ValueError(f"unknown weighted sampler: {name} (expected one of {', '.join(SAMPLERS)})") from None
+    if sampler_type is NumpyWeightedSampler and numpy is None:
+        if logger:
+            logger.warning("numpy is not installed, falling back to the pure Python weighted sampler")
+        sampler_type = PythonWeightedSampler
+    return sampler_type(**kwargs)
+
+
+__all__ = [
+    "DEFAULT_MAX_CACHED_SECTIONS",
+    "NUMPY",
+    "NumpyWeightedSampler",
+    "PYTHON",
+    "PythonWeightedSampler",
+    "SAMPLERS",
+    "SectionWeights",
+    "WeightedSampler",
+    "create_weighted_sampler",
+]
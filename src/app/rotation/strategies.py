@@ -0,0 +1,362 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import bisect
+import itertools
+import random
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Collection, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import mmh3
+
+from section_pb2 import GetRotationItemsRequest, SectionObject
+
+from .sampling import WeightedSampler, create_weighted_sampler
+
+if TYPE_CHECKING:
+    from ..catalog import CatalogStore
+
+DEFAULT_SLOT_DURATION: int = 3600
+DEFAULT_ITEM_COUNT: int = 1
+
+
+class RotationSlot(NamedTuple):
+    index: int
+    start: int
+    end: int
+
+
+class Rotation(NamedTuple):
+    indices: List[int]
+    expired_at: int
+    slot: RotationSlot
+
+
+def compute_slot(now: float, duration: int) -> RotationSlot:
+    """Slots are aligned to the Unix epoch, so every replica agrees on the boundaries"""
+    index = int(now // duration)
+    start = index * duration
+    return RotationSlot(index=index, start=start, end=start + duration)
+
+
+def section_fingerprint(section: SectionObject) -> int:
+    """Cheap content hash of a section: one C-level serialization and a 64-bit murmur hash"""
+    return mmh3.hash64(section.SerializeToString(deterministic=True))[0]
+
+
+def compute_expired_at(section: SectionObject, slot: RotationSlot) -> int:
+    # the rotation cannot outlive the section itself
+    if section.endDate > slot.start:
+        return min(slot.end, section.endDate)
+    return slot.end
+
+
+class RotationStrategy(ABC):
+    name: str = ""
+    # whether every user gets the same rotation for a given section and slot
+    cacheable: bool = True
+
+    def __init__(
+        self,
+        slot_duration: int = DEFAULT_SLOT_DURATION,
+        count: int = DEFAULT_ITEM_COUNT,
+    ) -> None:
+        if slot_duration <= 0:
+            raise ValueError("slot_duration must be positive")
+        self.slot_duration = slot_duration
+        self.count = count
+
+    def slot(self, now: float) -> RotationSlot:
+        return compute_slot(now, self.slot_duration)
+
+    def rotate(self, request: GetRotationItemsRequest, now: float, fingerprint: Optional[int] = None) -> Rotation:
+        slot = self.slot(now)
+        size = len(request.sectionObject.items)
+        indices = self.select(request, slot, size, fingerprint=fingerprint) if size else []
+        return Rotation(
+            indices=indices,
+            expired_at=compute_expired_at(request.sectionObject, slot),
+            slot=slot,
+        )
+
+    @abstractmethod
+    def select(
+        self, request: GetRotationItemsRequest, slot: RotationSlot, size: int, fingerprint: Optional[int] = None
+    ) -> List[int]:
+        """Return the indices of the selected items, `size` is never 0.
+
+        `fingerprint` is the section's, when the caller already computed it.
+        """
+
+
+class TimeSlotStrategy(RotationStrategy):
+    """Spreads the items over a cycle of slots (a day of hourly slots by default) and shows
+    `count` consecutive items starting from the one mapped to the current slot."""
+
+    name = "time_slot"
+
+    def __init__(
+        self,
+        slot_duration: int = DEFAULT_SLOT_DURATION,
+        count: int = DEFAULT_ITEM_COUNT,
+        slots_per_cycle: int = 24,
+    ) -> None:
+        super().__init__(slot_duration=slot_duration, count=count)
+        self.slots_per_cycle = slots_per_cycle
+
+    def select(
+        self, request: GetRotationItemsRequest, slot: RotationSlot, size: int, fingerprint: Optional[int] = None
+    ) -> List[int]:
+        first = (size * (slot.index % self.slots_per_cycle)) // self.slots_per_cycle
+        return [(first + i) % size for i in range(min(self.count, size))]
+
+
+class RoundRobinStrategy(RotationStrategy):
+    """Walks through the items in windows of `count`, one window per slot, wrapping around."""
+
+    name = "round_robin"
+
+    def select(
+        self, request: GetRotationItemsRequest, slot: RotationSlot, size: int, fingerprint: Optional[int] = None
+    ) -> List[int]:
+        count = min(self.count, size)
+        first = (slot.index * count) % size
+        return [(first + i) % size for i in range(count)]
+
+
+class WeightedStrategy(RotationStrategy):
+    """Draws `count` distinct items per slot with probability proportional to their weight.
+
+    Weights are looked up by item ID, then by SKU, and default to `default_weight`.
+    The draw is seeded with the section ID and the slot index, so it is the same on
+    every replica. Cumulative weights are cached per section and only rebuilt when
+    the section's items change.
+    """
+
+    name = "weighted"
+
+    def __init__(
+        self,
+        slot_duration: int = DEFAULT_SLOT_DURATION,
+        count: int = DEFAULT_ITEM_COUNT,
+        weights: Optional[Mapping[str, float]] = None,
+        default_weight: float = 1.0,
+        max_cached_sections: int = 1024,
+    ) -> None:
+        super().__init__(slot_duration=slot_duration, count=count)
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.max_cached_sections = max_cached_sections
+        # section ID -> (items fingerprint, cumulative weights)
+        self._cumulative_weights: Dict[str, Tuple[int, List[float]]] = {}
+
+    def select(
+        self, request: GetRotationItemsRequest, slot: RotationSlot, size: int, fingerprint: Optional[int] = None
+    ) -> List[int]:
+        cumulative = self.get_cumulative_weights(request.sectionObject, fingerprint=fingerprint)
+        total = cumulative[-1]
+        count = min(self.count, size)
+        if total <= 0:
+            return list(range(count))
+
+        rng = random.Random(mmh3.hash64(f"{request.sectionObject.sectionId}:{slot.index}")[0])
+        selected: List[int] = []
+        seen = set()
+        # rejection sampling stays cheap while count is small relative to the section
+        for _ in range(count * 8):
+            index = bisect.bisect_right(cumulative, rng.random() * total)
+            if index < size and index not in seen and self._weight_at(cumulative, index) > 0:
+                seen.add(index)
+                selected.append(index)
+                if len(selected) == count:
+                    return selected
+        # fall back to rounds of the same draws over what is left: the drawn items' weights are
+        # zeroed and the running sums rebuilt once per round, not once per draw
+        weights = [0.0 if i in seen else self._weight_at(cumulative, i) for i in range(len(cumulative))]
+        while len(selected) < count:
+            cumulative = list(itertools.accumulate(weights))
+            total = cumulative[-1]
+            drawn = len(selected)
+            for _ in range(2 * (count - drawn) if total > 0 else 0):
+                index = bisect.bisect_right(cumulative, rng.random() * total)
+                if index < size and weights[index] > 0:
+                    weights[index] = 0.0
+                    selected.append(index)
+                    if len(selected) == count:
+                        return selected
+            if len(selected) == drawn:
+                break
+        return selected
+
+    def get_cumulative_weights(self, section: SectionObject, fingerprint: Optional[int] = None) -> List[float]:
+        if fingerprint is None:
+            fingerprint = section_fingerprint(section)
+        cached = self._cumulative_weights.get(section.sectionId, None)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        cumulative: List[float] = []
+        total = 0.0
+        for item in section.items:
+            total += WeightedSampler.clean_weight(self.get_weight(item.itemId, item.itemSku))
+            cumulative.append(total)
+        if len(self._cumulative_weights) >= self.max_cached_sections:
+            self._cumulative_weights.clear()
+        self._cumulative_weights[section.sectionId] = (fingerprint, cumulative)
+        return cumulative
+
+    def get_weight(self, item_id: str, item_sku: str) -> float:
+        weight = self.weights.get(item_id, None)
+        if weight is None:
+            weight = self.weights.get(item_sku, self.default_weight)
+        return weight
+
+    @staticmethod
+    def _weight_at(cumulative: List[float], index: int) -> float:
+        return cumulative[index] - (cumulative[index - 1] if index else 0.0)
+
+
+class WeightedSampleStrategy(WeightedStrategy):
+    """Draws `count` distinct items per slot by weight, for sections of thousands of items.
+
+    Weights are as for `weighted`, and `excluded` item IDs or SKUs get none. The
+    section's weights are turned into arrays once per section version, and the draw
+    runs on them (see `WeightedSampler`, NumPy-backed when installed), so a rotation
+    costs no Python loop over the items. With a `catalog`, items it knows to be
+    unavailable at the start of the slot are left out. The draw is seeded with the
+    section ID and the slot index, and every sampler draws the same items.
+    """
+
+    name = "weighted_sample"
+
+    def __init__(
+        self,
+        slot_duration: int = DEFAULT_SLOT_DURATION,
+        count: int = DEFAULT_ITEM_COUNT,
+        weights: Optional[Mapping[str, float]] = None,
+        default_weight: float = 1.0,
+        max_cached_sections: int = 1024,
+        excluded: Collection[str] = (),
+        sampler: Optional[WeightedSampler] = None,
+        catalog: Optional["CatalogStore"] = None,
+    ) -> None:
+        super().__init__(
+            slot_duration=slot_duration,
+            count=count,
+            weights=weights,
+            default_weight=default_weight,
+            max_cached_sections=max_cached_sections,
+        )
+        self.excluded = frozenset(excluded)
+        self.sampler = sampler if sampler is not None else create_weighted_sampler(
+            max_cached_sections=max_cached_sections
+        )
+        self.catalog = catalog
+
+    def select(
+        self, request: GetRotationItemsRequest, slot: RotationSlot, size: int, fingerprint: Optional[int] = None
+    ) -> List[int]:
+        section = request.sectionObject
+        if fingerprint is None:
+            fingerprint = section_fingerprint(section)
+        section_weights = self.sampler.get_weights(section, self.get_weight, fingerprint)
+        return self.sampler.sample(
+            section,
+            section_weights,
+            self.count,
+            seed=mmh3.hash64(f"{section.sectionId}:{slot.index}", signed=False)[0],
+            catalog_index=self.catalog.index if self.catalog is not None else None,
+            now=slot.start,
+        )
+
+    def get_weight(self, item_id: str, item_sku: str) -> float:
+        if item_id in self.excluded or item_sku in self.excluded:
+            return 0.0
+        return super().get_weight(item_id, item_sku)
+
+
+class PersonalizedStrategy(RotationStrategy):
+    """Gives every user their own `count` items per slot, without keeping anything per user.
+
+    The items are the first `count` of a permutation of the section seeded with the
+    user ID, the section ID and the slot index. The permutation is a Fisher-Yates
+    shuffle that stops after `count` swaps and only records the positions it
+    swapped, so a rotation costs O(count) whatever the size of the section. Each
+    swap is drawn from a murmur hash of the seed and the position, so the same user,
+    section and slot get the same items on every replica.
+    """
+
+    name = "personalized"
+    cacheable = False
+
+    def select(
+        self, request: GetRotationItemsRequest, slot: RotationSlot, size: int, fingerprint: Optional[int] = None
+    ) -> List[int]:
+        key = f"{request.userId}:{request.sectionObject.sectionId}:{slot.index}".encode()
+        # position -> item moved there by an earlier swap, the rest are where they started
+        swapped: Dict[int, int] = {}
+        selected: List[int] = []
+        for i in range(min(self.count, size)):
+            j = i + mmh3.hash64(key, seed=i, signed=False)[0] % (size - i)
+            selected.append(swapped.get(j, j))
+            swapped[j] = swapped.get(i, i)
+        return selected
+
+
+STRATEGIES: Dict[str, type] = {
+    TimeSlotStrategy.name: TimeSlotStrategy,
+    RoundRobinStrategy.name: RoundRobinStrategy,
+    WeightedStrategy.name: WeightedStrategy,
+    WeightedSampleStrategy.name: WeightedSampleStrategy,
+    PersonalizedStrategy.name: PersonalizedStrategy,
+}
+
+
+class RotationEngine:
+    """Picks the strategy for a section (by ID, then by name, else the default) and runs it."""
+
+    def __init__(
+        self,
+        default_strategy: Optional[RotationStrategy] = None,
+        section_strategies: Optional[Mapping[str, RotationStrategy]] = None,
+    ) -> None:
+        self.default_strategy = default_strategy or TimeSlotStrategy()
+        self.section_strategies = dict(section_strategies or {})
+
+    def get_strategy(self, section: SectionObject) -> RotationStrategy:
+        return self.section_strategies.get(
+            section.sectionId,
+            self.section_strategies.get(section.sectionName, self.default_strategy),
+        )
+
+    def rotate(self, request: GetRotationItemsRequest, now: float, fingerprint: Optional[int] = None) -> Rotation:
+        return self.get_strategy(request.sectionObject).rotate(request, now, fingerprint=fingerprint)
+
+
+def create_strategy(name: str, **kwargs) -> RotationStrategy:
+    try:
+        strategy_type = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"unknown rotation strategy: {name}") from None
+    return strategy_type(**kwargs)
+
+
+__all__ = [
+    "DEFAULT_ITEM_COUNT",
+    "DEFAULT_SLOT_DURATION",
+    "PersonalizedStrategy",
+    "RoundRobinStrategy",
+    "Rotation",
+    "RotationEngine",
+    "RotationSlot",
+    "RotationStrategy",
+    "STRATEGIES",
+    "TimeSlotStrategy",
+    "WeightedSampleStrategy",
+    "WeightedStrategy",
+    "compute_expired_at",
+    "compute_slot",
+    "create_strategy",
+    "section_fingerprint",
+]
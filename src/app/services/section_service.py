@@ -2,50 +2,110 @@
 # This is licensed software from AccelByte Inc, for limitations
 # and restrictions contact your company contract manager.
 
-from datetime import datetime
-import json
 from logging import Logger
-import math
-from typing import List, Optional
+import time
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Union
 
-from google.protobuf.json_format import MessageToDict
+import grpc
 
+from accelbyte_grpc_plugin.utils import WarmUpCalls
 from accelbyte_py_sdk import AccelByteSDK
 
 from section_pb2 import (
     BackfillRequest,
     BackfilledItemObject,
-    RotationItemObject,
     BackfillResponse,
     GetRotationItemsRequest,
     GetRotationItemsResponse,
+    RotationItemObject,
     SectionItemObject,
+    SectionObject,
     DESCRIPTOR,
 )
 from section_pb2_grpc import SectionServicer
 
+from ..deadlines import DEGRADED_CACHED, DEGRADED_FALLBACK, DEGRADED_OWNED_FLAGS, DeadlineGuard
+from ..payload_logging import PayloadLogger
+from ..rotation.backfill import BackfillEngine
+from ..rotation.cache import RotationCache
+from ..rotation.strategies import RotationEngine, RotationStrategy, compute_expired_at
+
+if TYPE_CHECKING:
+    # imported lazily, with the platform API, only when enabled
+    from ..catalog import CatalogStore
+    from ..entitlements import EntitlementLookup
+
 
 class AsyncSectionService(SectionServicer):
     full_name: str = DESCRIPTOR.services_by_name["Section"].full_name
-    upper_limit: float = float(24)
 
-    def __init__(self, sdk: Optional[AccelByteSDK] = None, logger: Optional[Logger] = None) -> None:
+    def __init__(
+        self,
+        sdk: Optional[AccelByteSDK] = None,
+        logger: Optional[Logger] = None,
+        payload_logger: Optional[PayloadLogger] = None,
+        rotation_engine: Optional[RotationEngine] = None,
+        rotation_cache: Optional[RotationCache] = None,
+        backfill_engine: Optional[BackfillEngine] = None,
+        catalog: Optional["CatalogStore"] = None,
+        entitlements: Optional["EntitlementLookup"] = None,
+        deadlines: Optional[DeadlineGuard] = None,
+    ) -> None:
         self.sdk = sdk
         self.logger = logger
+        self.rotation_engine = rotation_engine or RotationEngine()
+        self.rotation_cache = rotation_cache
+        self.backfill_engine = backfill_engine or BackfillEngine(catalog=catalog)
+        # item metadata for rotation and backfill rules, read from memory only
+        self.catalog = catalog
+        self.entitlements = entitlements
+        # cuts the work short for calls near or past their deadline
+        self.deadlines = deadlines
+        if payload_logger is None and logger is not None:
+            payload_logger = PayloadLogger(logger=logger)
+        self.payload_logger = payload_logger
 
     async def GetRotationItems(self, request: GetRotationItemsRequest, context):
         """*
         GetRotationItems: get current rotation items, this method will be called by rotation type is CUSTOM
         """
         self.log_payload(f'{self.GetRotationItems.__name__} request: %s', request)
+        low = False
+        if self.deadlines is not None:
+            if (code := self.deadlines.check(context, "GetRotationItems")) is not None:
+                await context.abort(code)
+            low = self.deadlines.low(context)
+        now = time.time()
+        strategy = self.rotation_engine.get_strategy(request.sectionObject)
+        if low:
+            return self.get_degraded_rotation_items(request, strategy, now)
+
+        cache_key = None
+        fingerprint = None
+        # warm-up calls go through the strategy but leave no rotation nor candidates behind
+        warm_up = WarmUpCalls.is_warm_up_context(context)
+        if self.rotation_cache is not None and strategy.cacheable and not warm_up:
+            cache_key = self.rotation_cache.create_key(request.sectionObject, strategy.slot(now))
+            fingerprint = cache_key[1]
+        if not warm_up:
+            # remember the section's items as the candidates for its later Backfill calls
+            self.backfill_engine.pools.update(request.sectionObject, fingerprint=fingerprint)
+        if cache_key is not None:
+            if (entry := self.rotation_cache.get(cache_key)) is not None:
+                self.log_payload(f'{self.GetRotationItems.__name__} response: %s', entry.response)
+                return entry.data if entry.data is not None else entry.response
+
         items: List[SectionItemObject] = request.sectionObject.items
-        input_count: int = len(items)
-        current_point: float = float(datetime.now().hour)
-        selected_index: int = int(math.floor((input_count/self.upper_limit)*current_point))
-        selected_item: SectionItemObject = items[selected_index]
-        response_items: List[SectionItemObject] = [selected_item]
-        response: GetRotationItemsResponse = GetRotationItemsResponse(expiredAt=0, items=response_items)
+        rotation = strategy.rotate(request, now=now, fingerprint=fingerprint)
+        response_items: List[SectionItemObject] = [items[i] for i in rotation.indices]
+        response: GetRotationItemsResponse = GetRotationItemsResponse(
+            expiredAt=rotation.expired_at, items=response_items
+        )
         self.log_payload(f'{self.GetRotationItems.__name__} response: %s', response)
+        if cache_key is not None:
+            entry = self.rotation_cache.put(cache_key, response)
+            if entry.data is not None:
+                return entry.data
         return response
 
     async def Backfill(self, request: BackfillRequest, context):
@@ -56,22 +116,119 @@ class AsyncSectionService(SectionServicer):
         3. User already owned any one of current rotation items.
         """
         self.log_payload(f'{self.Backfill.__name__} request: %s', request)
-        new_items: List[BackfilledItemObject] = []
-        item: RotationItemObject
-        for item in request.items:
-            if item.owned:
-                # Use the last item in the request for backfill for demo purpose only
-                backfill_item_id = request.items[-1].itemId
-                new_item: BackfilledItemObject = BackfilledItemObject(itemId=backfill_item_id, index=item.index)
-                new_items.append(new_item)
+        if self.deadlines is not None:
+            if (code := self.deadlines.check(context, "Backfill")) is not None:
+                await context.abort(code)
+            if self.deadlines.low(context):
+                # no time for the lookup: exclude by the request's owned flags alone
+                self.deadlines.count_degraded("Backfill", DEGRADED_OWNED_FLAGS)
+                owned_item_ids = frozenset()
+            else:
+                owned_item_ids = await self.get_owned_item_ids(request.userId)
+                # the caller may have given up while the lookup ran
+                if (code := self.deadlines.check(context, "Backfill")) is not None:
+                    await context.abort(code)
+        else:
+            owned_item_ids = await self.get_owned_item_ids(request.userId)
+        new_items: List[BackfilledItemObject] = self.backfill_engine.backfill(
+            request, excluded_item_ids=owned_item_ids
+        )
         response: BackfillResponse = BackfillResponse(backfilledItems=new_items)
         self.log_payload(f'{self.Backfill.__name__} response: %s', response)
         return response
 
+    def get_degraded_rotation_items(
+        self, request: GetRotationItemsRequest, strategy: RotationStrategy, now: float
+    ):
+        """The section's last cached rotation, else its round-robin window of the slot.
+
+        Neither fingerprints the section nor runs the strategy. The fallback is not
+        cached and expires within `degraded_ttl`, so clients soon ask again for the
+        real rotation.
+        """
+        section = request.sectionObject
+        if self.rotation_cache is not None and strategy.cacheable:
+            if (entry := self.rotation_cache.get_latest(section.sectionId)) is not None:
+                self.deadlines.count_degraded("GetRotationItems", DEGRADED_CACHED)
+                self.log_payload(f'{self.GetRotationItems.__name__} response: %s', entry.response)
+                return entry.data if entry.data is not None else entry.response
+
+        self.deadlines.count_degraded("GetRotationItems", DEGRADED_FALLBACK)
+        items: List[SectionItemObject] = section.items
+        slot = strategy.slot(now)
+        size = len(items)
+        count = min(strategy.count, size)
+        first = (slot.index * count) % size if size else 0
+        response = GetRotationItemsResponse(
+            expiredAt=min(compute_expired_at(section, slot), int(now) + self.deadlines.degraded_ttl),
+            items=[items[(first + i) % size] for i in range(count)],
+        )
+        self.log_payload(f'{self.GetRotationItems.__name__} response: %s', response)
+        return response
+
+    async def get_owned_item_ids(self, user_id: str) -> FrozenSet[str]:
+        if self.entitlements is None or not user_id:
+            return frozenset()
+        try:
+            return await self.entitlements.get_owned_item_ids(user_id)
+        except Exception as error:
+            # fall back to the request's owned flags alone
+            if self.logger:
+                self.logger.warning(f"failed to look up entitlements: {type(error).__name__}: {error}")
+            return frozenset()
+
     # noinspection PyShadowingBuiltins
     def log_payload(self, format: str, payload):
-        if not self.logger:
+        if not self.payload_logger:
             return
-        payload_dict = MessageToDict(payload, preserving_proto_field_name=True)
-        payload_json = json.dumps(payload_dict)
-        self.logger.info(format % payload_json)
+        self.payload_logger.log(format, payload)
+
+
+def serialize_response(message: Union[bytes, Any]) -> bytes:
+    # handlers may return responses that were already serialized (see RotationCache)
+    return message if isinstance(message, bytes) else message.SerializeToString()
+
+
+def create_warm_up_requests(namespace: str = "", size: int = 10) -> Dict[str, Any]:
+    """Representative requests for warming up the Section methods (see WarmUpOpt).
+
+    They use a dedicated section and no user, so no entitlement lookup is made. Sent
+    as warm-up calls, they fill neither the rotation cache nor the backfill pools.
+    """
+    items = [SectionItemObject(itemId=f"{i:032x}", itemSku=f"WARM-UP-{i}") for i in range(size)]
+    return {
+        f"/{AsyncSectionService.full_name}/GetRotationItems": GetRotationItemsRequest(
+            namespace=namespace,
+            sectionObject=SectionObject(sectionId="warm-up", sectionName="warm-up", items=items),
+        ),
+        f"/{AsyncSectionService.full_name}/Backfill": BackfillRequest(
+            namespace=namespace,
+            sectionId="warm-up",
+            sectionName="warm-up",
+            items=[
+                RotationItemObject(itemId=item.itemId, itemSku=item.itemSku, owned=(i == 0), index=i)
+                for i, item in enumerate(items[: size // 2])
+            ],
+        ),
+    }
+
+
+def add_section_servicer_to_server(servicer: SectionServicer, server) -> None:
+    """Same as the generated add_SectionServicer_to_server, but accepts pre-serialized responses"""
+    rpc_method_handlers = {
+        "GetRotationItems": grpc.unary_unary_rpc_method_handler(
+            servicer.GetRotationItems,
+            request_deserializer=GetRotationItemsRequest.FromString,
+            response_serializer=serialize_response,
+        ),
+        "Backfill": grpc.unary_unary_rpc_method_handler(
+            servicer.Backfill,
+            request_deserializer=BackfillRequest.FromString,
+            response_serializer=serialize_response,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+        AsyncSectionService.full_name, rpc_method_handlers
+    )
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers(AsyncSectionService.full_name, rpc_method_handlers)
@@ -0,0 +1,115 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+"""A local HTTP stand-in for the AccelByte platform, and an SDK that talks to it."""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from accelbyte_py_sdk.core import AccelByteSDK, HttpxHttpClient, InMemoryTokenRepository, MyConfigRepository
+
+NAMESPACE: str = "test"
+
+# (status, JSON body) from the query parameters and the path's named groups
+Route = Callable[[Dict[str, List[str]], Dict[str, str]], Tuple[int, Any]]
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+    body: bytes
+
+
+class FakeServer:
+    """Serves routes from a thread, and records the requests it got"""
+
+    def __init__(self) -> None:
+        self.routes: List[Tuple[str, "re.Pattern[str]", Route]] = []
+        self.requests: List[Request] = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def handle_request(self) -> None:
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                request = Request(
+                    self.command, url.path, parse_qs(url.query), dict(self.headers), self.rfile.read(length)
+                )
+                with server._lock:
+                    server.requests.append(request)
+                status, body = server.dispatch(request)
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def route(self, method: str, pattern: str, route: Route) -> None:
+        self.routes.append((method, re.compile(pattern), route))
+
+    def dispatch(self, request: Request) -> Tuple[int, Any]:
+        for method, pattern, route in self.routes:
+            match = pattern.fullmatch(request.path)
+            if method == request.method and match is not None:
+                return route(request.query, match.groupdict())
+        return 404, {"errorCode": 404, "errorMessage": f"no route for {request.method} {request.path}"}
+
+    def get_requests(self, path_pattern: str) -> List[Request]:
+        pattern = re.compile(path_pattern)
+        with self._lock:
+            return [request for request in self.requests if pattern.fullmatch(request.path)]
+
+    def start(self) -> "FakeServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def create_sdk(url: str, namespace: str = NAMESPACE) -> AccelByteSDK:
+    sdk = AccelByteSDK()
+    sdk.initialize(
+        options={
+            "config": MyConfigRepository(url, "client-id", "client-secret", namespace),
+            "token": InMemoryTokenRepository(),
+            "http": HttpxHttpClient(),
+        }
+    )
+    sdk.get_token_repository().store_token({"access_token": "token"})
+    return sdk
+
+
+def get_query_int(query: Dict[str, List[str]], name: str, default: int = 0) -> int:
+    values: Optional[List[str]] = query.get(name, None)
+    return int(values[0]) if values else default
+
+
+def page(data: List[Any], query: Dict[str, List[str]]) -> Dict[str, Any]:
+    """The platform's paged response for the `offset` and `limit` of the query"""
+    offset = get_query_int(query, "offset")
+    limit = get_query_int(query, "limit", len(data) or 1)
+    paging = {"next": "next"} if offset + limit < len(data) else {}
+    return {"data": data[offset:offset + limit], "paging": paging}
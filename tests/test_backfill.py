@@ -0,0 +1,85 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from section_pb2 import BackfillRequest, RotationItemObject  # noqa: E402
+
+from app.catalog import CatalogIndex, CatalogItem  # noqa: E402
+from app.rotation.backfill import BackfillEngine  # noqa: E402
+from app.services.section_service import AsyncSectionService  # noqa: E402
+
+
+def create_request(user_id: str = "u1") -> BackfillRequest:
+    return BackfillRequest(
+        userId=user_id,
+        sectionId="s1",
+        items=[
+            RotationItemObject(itemId="a", itemSku="A", owned=True, index=0),
+            RotationItemObject(itemId="b", itemSku="B", index=1),
+            RotationItemObject(itemId="c", itemSku="C", index=2),
+        ],
+    )
+
+
+def create_catalog_item(item_id: str) -> CatalogItem:
+    return CatalogItem(
+        item_id=item_id,
+        sku=item_id.upper(),
+        name="",
+        item_type="INGAMEITEM",
+        category_path="/",
+        tags=(),
+        active=True,
+        purchasable=True,
+        currency_code="USD",
+        price=100,
+        available_from=0,
+        available_until=0,
+        updated_at=0,
+    )
+
+
+class BackfillUnseenSectionTest(unittest.IsolatedAsyncioTestCase):
+    """Backfill is called for FIXED_PERIOD sections, which GetRotationItems never sees"""
+
+    async def test_replaces_owned_items_from_the_request(self):
+        response = await AsyncSectionService().Backfill(create_request(), None)
+
+        self.assertEqual([item.index for item in response.backfilledItems], [0])
+        self.assertIn(response.backfilledItems[0].itemId, {"b", "c"})
+
+    async def test_replacement_is_deterministic(self):
+        service = AsyncSectionService()
+        first = await service.Backfill(create_request(), None)
+        second = await service.Backfill(create_request(), None)
+
+        self.assertEqual(first, second)
+
+    def test_skips_items_the_user_owns(self):
+        backfilled = BackfillEngine().backfill(create_request(), excluded_item_ids={"b"})
+
+        self.assertEqual([(item.itemId, item.index) for item in backfilled], [("c", 0)])
+
+    def test_nothing_to_replace_with(self):
+        backfilled = BackfillEngine().backfill(create_request(), excluded_item_ids={"b", "c"})
+
+        self.assertEqual(backfilled, [])
+
+    def test_replaces_owned_items_from_the_catalog(self):
+        items = {item_id: create_catalog_item(item_id) for item_id in ("a", "b", "c", "d", "e")}
+        engine = BackfillEngine(catalog=SimpleNamespace(index=CatalogIndex(items)))
+        backfilled = engine.backfill(create_request())
+
+        self.assertEqual([item.index for item in backfilled], [0])
+        self.assertIn(backfilled[0].itemId, {"d", "e"})
+
+
+if __name__ == "__main__":
+    unittest.main()
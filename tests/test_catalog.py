@@ -0,0 +1,206 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import CollectorRegistry
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from app.catalog import CatalogIndex, CatalogStore, create_catalog_item  # noqa: E402
+from fake_platform import NAMESPACE, FakeServer, create_sdk, page  # noqa: E402
+
+ITEMS_PATH: str = rf"/platform/v2/admin/namespaces/{NAMESPACE}/items/byCriteria"
+
+T0: int = 1_700_000_000
+
+
+def format_timestamp(value: int) -> str:
+    return datetime.fromtimestamp(value, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def create_item_info(
+    item_id: str,
+    updated_at: int,
+    price: int = 100,
+    status: str = "ACTIVE",
+    purchase_at: Optional[int] = None,
+    expire_at: Optional[int] = None,
+) -> Dict[str, Any]:
+    region_data: Dict[str, Any] = {"currencyCode": "USD", "price": price}
+    if purchase_at is not None:
+        region_data["purchaseAt"] = format_timestamp(purchase_at)
+    if expire_at is not None:
+        region_data["expireAt"] = format_timestamp(expire_at)
+    return {
+        "itemId": item_id,
+        "sku": item_id.upper(),
+        "name": item_id,
+        "itemType": "INGAMEITEM",
+        "categoryPath": "/weapons",
+        "status": status,
+        "updatedAt": format_timestamp(updated_at),
+        "regionData": {"US": [region_data]},
+    }
+
+
+class CatalogStoreTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # item ID -> its FullItemInfo as the platform returns it
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.failing = False
+        self.server = FakeServer().start()
+        self.server.route("GET", ITEMS_PATH, self.query_items)
+        self.store = CatalogStore(
+            create_sdk(self.server.url), namespace=NAMESPACE, page_size=2, registry=CollectorRegistry()
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def query_items(self, query, params):
+        if self.failing:
+            return 500, {"errorCode": 20000, "errorMessage": "internal server error"}
+        descending = any(sort_by.endswith(":desc") for sort_by in query.get("sortBy", []))
+        items = sorted(self.items.values(), key=lambda item: item["updatedAt"], reverse=descending)
+        return 200, page(items, query)
+
+    def add_items(self, *infos: Dict[str, Any]) -> None:
+        for info in infos:
+            self.items[info["itemId"]] = info
+
+    def get_item_requests(self) -> List[Any]:
+        return self.server.get_requests(ITEMS_PATH)
+
+    async def load(self) -> None:
+        self.add_items(*(create_item_info(f"i{i}", T0 + i) for i in range(5)))
+        await self.store.refresh()
+
+    async def test_first_refresh_loads_every_item(self):
+        await self.load()
+
+        self.assertTrue(self.store.is_ready)
+        self.assertEqual(sorted(self.store.index.items), [f"i{i}" for i in range(5)])
+        self.assertEqual(self.store.index.get_by_sku("I3").item_id, "i3")
+        self.assertEqual(self.store.index.updated_at, T0 + 4)
+        requests = self.get_item_requests()
+        # pages of 2
+        self.assertEqual(len(requests), 3)
+        self.assertTrue(all(request.query["sortBy"] == ["updatedAt:asc"] for request in requests))
+
+    async def test_incremental_refresh_without_changes_keeps_the_index(self):
+        await self.load()
+        index = self.store.index
+
+        await self.store.refresh()
+
+        self.assertIs(self.store.index, index)
+        requests = self.get_item_requests()[3:]
+        # only the newest page, which ends below the high-water mark
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0].query["sortBy"], ["updatedAt:desc"])
+
+    async def test_incremental_refresh_applies_changed_items(self):
+        await self.load()
+        index = self.store.index
+
+        self.add_items(create_item_info("i1", T0 + 10, price=50), create_item_info("i9", T0 + 11))
+        await self.store.refresh()
+
+        self.assertIsNot(self.store.index, index)
+        self.assertEqual(self.store.index.get("i1").price, 50)
+        self.assertIn("i9", self.store.index)
+        self.assertEqual(len(self.store.index), 6)
+        self.assertEqual(self.store.index.updated_at, T0 + 11)
+
+    async def test_incremental_refresh_applies_changes_stamped_with_the_high_water_mark(self):
+        await self.load()
+
+        # changed within the same second as the last refresh
+        self.add_items(create_item_info("i4", T0 + 4, price=75))
+        await self.store.refresh()
+
+        self.assertEqual(self.store.index.get("i4").price, 75)
+
+    async def test_incremental_refresh_applies_deactivated_items(self):
+        await self.load()
+
+        self.add_items(create_item_info("i2", T0 + 10, status="INACTIVE"))
+        await self.store.refresh()
+
+        self.assertFalse(self.store.index.get("i2").active)
+        self.assertFalse(self.store.index.is_available("i2", T0))
+
+    async def test_full_refresh_drops_removed_items(self):
+        await self.load()
+
+        del self.items["i0"]
+        await self.store.refresh()
+        # deletions leave nothing to find by update time
+        self.assertIn("i0", self.store.index)
+
+        await self.store.refresh(full=True)
+        self.assertNotIn("i0", self.store.index)
+        self.assertEqual(len(self.store.index), 4)
+
+    async def test_refresh_swaps_in_a_new_index(self):
+        await self.load()
+        index = self.store.index
+        items = dict(index.items)
+
+        self.add_items(create_item_info("i1", T0 + 10, price=50))
+        await self.store.refresh()
+
+        # readers holding the previous index still see it whole
+        self.assertEqual(dict(index.items), items)
+        self.assertEqual(index.get("i1").price, 100)
+        self.assertEqual(self.store.index.get("i1").price, 50)
+
+    async def test_failed_refresh_keeps_the_index(self):
+        await self.load()
+        index = self.store.index
+
+        self.failing = True
+        await self.store.refresh(full=True)
+
+        self.assertIs(self.store.index, index)
+
+    async def test_items_are_available_within_their_window(self):
+        self.add_items(
+            create_item_info("window", T0, purchase_at=T0 + 100, expire_at=T0 + 200),
+            create_item_info("open", T0),
+            create_item_info("inactive", T0, status="INACTIVE"),
+        )
+        await self.store.refresh()
+        index = self.store.index
+
+        self.assertFalse(index.is_available("window", T0 + 99))
+        self.assertTrue(index.is_available("window", T0 + 100))
+        self.assertTrue(index.is_available("window", T0 + 199.5))
+        self.assertFalse(index.is_available("window", T0 + 200))
+        self.assertTrue(index.is_available("open", 0))
+        self.assertFalse(index.is_available("inactive", T0))
+        # items the catalog does not know about are given the benefit of the doubt
+        self.assertTrue(index.is_available("unknown", T0))
+
+
+class CatalogItemTest(unittest.TestCase):
+    def test_is_available_at_the_boundaries(self):
+        info = SimpleNamespace(item_id="i1", status="ACTIVE", region_data={})
+        item = create_catalog_item(info)._replace(available_from=T0, available_until=T0 + 10)
+
+        self.assertFalse(item.is_available(T0 - 1))
+        self.assertTrue(item.is_available(T0))
+        self.assertFalse(item.is_available(T0 + 10))
+        self.assertFalse(item._replace(purchasable=False).is_available(T0))
+        self.assertTrue(CatalogIndex({"i1": item}).is_available("i1", T0 + 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from prometheus_client import CollectorRegistry
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from app.entitlements import EntitlementLookup  # noqa: E402
+from fake_platform import NAMESPACE, FakeServer, create_sdk, page  # noqa: E402
+
+ENTITLEMENTS_PATH: str = rf"/platform/admin/namespaces/{NAMESPACE}/users/(?P<user_id>[^/]+)/entitlements"
+
+
+class RecordingEntitlementLookup(EntitlementLookup):
+    """Records the users of each batch it fetches"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, registry=CollectorRegistry(), **kwargs)
+        self.batches: List[List[str]] = []
+
+    async def fetch_owned_item_ids(self, user_ids: Sequence[str]):
+        self.batches.append(list(user_ids))
+        return await super().fetch_owned_item_ids(user_ids)
+
+
+class EntitlementLookupTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # user ID -> item IDs they own, users missing from it fail with a 500
+        self.owned: Dict[str, List[str]] = {}
+        self.server = FakeServer().start()
+        self.server.route("GET", ENTITLEMENTS_PATH, self.get_entitlements)
+        self.sdk = create_sdk(self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def get_entitlements(self, query, params):
+        owned = self.owned.get(params["user_id"], None)
+        if owned is None:
+            return 500, {"errorCode": 20000, "errorMessage": "internal server error"}
+        entitlements = [{"id": f"e-{item_id}", "itemId": item_id} for item_id in owned]
+        return 200, page(entitlements, query)
+
+    def create_lookup(self, **kwargs) -> RecordingEntitlementLookup:
+        return RecordingEntitlementLookup(self.sdk, namespace=NAMESPACE, **kwargs)
+
+    def count_fetches(self, user_id: str) -> int:
+        return len(self.server.get_requests(ENTITLEMENTS_PATH.replace("(?P<user_id>[^/]+)", user_id)))
+
+    async def test_pages_through_the_entitlements(self):
+        self.owned["u1"] = [f"i{i}" for i in range(5)]
+        lookup = self.create_lookup(page_size=2)
+
+        self.assertEqual(await lookup.get_owned_item_ids("u1"), frozenset(self.owned["u1"]))
+        self.assertEqual(self.count_fetches("u1"), 3)
+
+    async def test_concurrent_callers_share_one_fetch(self):
+        self.owned["u1"] = ["i1"]
+        lookup = self.create_lookup()
+
+        results = await asyncio.gather(*(lookup.get_owned_item_ids("u1") for _ in range(10)))
+
+        self.assertEqual(results, [frozenset({"i1"})] * 10)
+        self.assertEqual(self.count_fetches("u1"), 1)
+        self.assertEqual(lookup.batches, [["u1"]])
+
+    async def test_users_within_the_window_are_batched(self):
+        for i in range(10):
+            self.owned[f"u{i}"] = [f"i{i}"]
+        lookup = self.create_lookup(batch_window=0.05, max_batch_size=4)
+
+        results = await asyncio.gather(*(lookup.get_owned_item_ids(f"u{i}") for i in range(10)))
+
+        self.assertEqual(results, [frozenset({f"i{i}"}) for i in range(10)])
+        self.assertEqual([len(batch) for batch in lookup.batches], [4, 4, 2])
+        self.assertEqual(sorted(user_id for batch in lookup.batches for user_id in batch), sorted(self.owned))
+
+    async def test_cache_hits_until_the_ttl_expires(self):
+        self.owned["u1"] = ["i1"]
+        lookup = self.create_lookup(cache_ttl=0.2)
+
+        await lookup.get_owned_item_ids("u1")
+        self.owned["u1"] = ["i2"]
+        self.assertEqual(await lookup.get_owned_item_ids("u1"), frozenset({"i1"}))
+        self.assertEqual(self.count_fetches("u1"), 1)
+
+        await asyncio.sleep(0.3)
+        self.assertEqual(await lookup.get_owned_item_ids("u1"), frozenset({"i2"}))
+        self.assertEqual(self.count_fetches("u1"), 2)
+
+    async def test_failures_reach_every_waiter(self):
+        self.owned["u2"] = ["i2"]
+        lookup = self.create_lookup(batch_window=0.05)
+
+        results = await asyncio.gather(
+            lookup.get_owned_item_ids("u1"),
+            lookup.get_owned_item_ids("u1"),
+            lookup.get_owned_item_ids("u2"),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(results[0], Exception)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(results[2], frozenset({"i2"}))
+        self.assertEqual(self.count_fetches("u1"), 1)
+        # failures are not cached
+        self.owned["u1"] = ["i1"]
+        self.assertEqual(await lookup.get_owned_item_ids("u1"), frozenset({"i1"}))
+
+    async def test_cancelled_batch_leaves_no_pending_lookup(self):
+        self.owned["u1"] = ["i1"]
+        lookup = self.create_lookup(max_batch_size=1)
+        fetching = asyncio.Event()
+        release = asyncio.Event()
+
+        async def fetch_owned_item_ids(user_ids):
+            fetching.set()
+            await release.wait()
+
+        lookup.fetch_owned_item_ids = fetch_owned_item_ids
+        waiters = [asyncio.ensure_future(lookup.get_owned_item_ids("u1")) for _ in range(2)]
+        await fetching.wait()
+        for task in list(lookup._tasks):
+            task.cancel()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        self.assertTrue(all(isinstance(result, LookupError) for result in results))
+        self.assertEqual(lookup._pending, {})
+        self.assertEqual(lookup._tasks, set())
+
+    async def test_batch_cancelled_before_it_started_leaves_no_pending_lookup(self):
+        self.owned["u1"] = ["i1"]
+        lookup = self.create_lookup(max_batch_size=1)
+
+        waiter = asyncio.ensure_future(lookup.get_owned_item_ids("u1"))
+        await asyncio.sleep(0)
+        # the batch task was created by the flush but has not run yet
+        for task in list(lookup._tasks):
+            task.cancel()
+
+        with self.assertRaises(LookupError):
+            await waiter
+        self.assertEqual(lookup._pending, {})
+        # the next lookup fetches again
+        self.assertEqual(await lookup.get_owned_item_ids("u1"), frozenset({"i1"}))
+
+    async def test_close_resolves_the_waiting_batch(self):
+        self.owned["u1"] = ["i1"]
+        lookup = self.create_lookup(batch_window=10.0)
+
+        waiter = asyncio.ensure_future(lookup.get_owned_item_ids("u1"))
+        await asyncio.sleep(0)
+        await lookup.close()
+
+        self.assertEqual(await waiter, frozenset({"i1"}))
+        self.assertEqual(lookup._pending, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
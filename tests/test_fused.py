@@ -0,0 +1,321 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import asyncio
+import logging
+import platform
+import sys
+import unittest
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import grpc
+import jwt
+from grpc import StatusCode
+from grpc.aio import ServerInterceptor
+from prometheus_client import REGISTRY
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from accelbyte_grpc_plugin.interceptors.authorization import (  # noqa: E402
+    AuthorizationServerInterceptor,
+    MethodPolicy,
+)
+from accelbyte_grpc_plugin.interceptors.compression import CompressionServerInterceptor  # noqa: E402
+from accelbyte_grpc_plugin.interceptors.concurrency import (  # noqa: E402
+    AIMDLimit,
+    ConcurrencyLimitServerInterceptor,
+)
+from accelbyte_grpc_plugin.interceptors.fused import (  # noqa: E402
+    FusedServerInterceptor,
+    fuse_interceptors,
+)
+from accelbyte_grpc_plugin.interceptors.logging import DebugLoggingServerInterceptor  # noqa: E402
+from accelbyte_grpc_plugin.interceptors.metrics import MetricsServerInterceptor  # noqa: E402
+from accelbyte_py_sdk.token_validation._ctypes import InsufficientPermissionsError  # noqa: E402
+from section_pb2 import (  # noqa: E402
+    BackfillRequest,
+    BackfillResponse,
+    GetRotationItemsRequest,
+    GetRotationItemsResponse,
+    RotationItemObject,
+    SectionItemObject,
+    SectionObject,
+)
+from app.services.section_service import (  # noqa: E402
+    AsyncSectionService,
+    add_section_servicer_to_server,
+)
+
+NAMESPACE = "test"
+GET_ROTATION_ITEMS = f"/{AsyncSectionService.full_name}/GetRotationItems"
+BACKFILL = f"/{AsyncSectionService.full_name}/Backfill"
+SERVICE, _, METHOD_NAME = GET_ROTATION_ITEMS.removeprefix("/").partition("/")
+COMPRESSION_MIN_SIZE = 32
+SECRET = "0" * 32
+
+ALLOWED_TOKEN = jwt.encode({"sub": "allowed", "namespace": NAMESPACE}, SECRET, algorithm="HS256")
+DENIED_TOKEN = jwt.encode({"sub": "denied", "namespace": NAMESPACE}, SECRET, algorithm="HS256")
+OTHER_NAMESPACE_TOKEN = jwt.encode(
+    {"sub": "other", "namespace": NAMESPACE, "extend_namespace": "other"}, SECRET, algorithm="HS256"
+)
+
+
+class TokenValidator:
+    def validate_token(self, token, resource=None, action=None, namespace=None, **kwargs):
+        if token == DENIED_TOKEN:
+            return InsufficientPermissionsError("denied")
+        return None
+
+
+class RecordingCompressionServerInterceptor(CompressionServerInterceptor):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.compressed: List[str] = []
+
+    async def compress(self, response, context) -> None:
+        if response.ByteSize() >= self.min_size:
+            self.compressed.append(type(response).__name__)
+        await super().compress(response, context)
+
+
+class BlockingSectionService(AsyncSectionService):
+    """Holds the GetRotationItems calls of user `slow` until released"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+        self.released = asyncio.Event()
+
+    async def GetRotationItems(self, request, context):
+        if request.userId == "slow":
+            self.started.set()
+            await self.released.wait()
+        return await super().GetRotationItems(request, context)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(level=logging.DEBUG)
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+def create_rotation_request(user_id: str, size: int) -> GetRotationItemsRequest:
+    items = [SectionItemObject(itemId=f"{i:032x}", itemSku=f"SKU-{i}") for i in range(size)]
+    return GetRotationItemsRequest(
+        userId=user_id,
+        namespace=NAMESPACE,
+        sectionObject=SectionObject(sectionId="section", sectionName="section", items=items),
+    )
+
+
+def create_backfill_request(size: int) -> BackfillRequest:
+    return BackfillRequest(
+        userId="user",
+        namespace=NAMESPACE,
+        sectionId="section",
+        sectionName="section",
+        items=[
+            RotationItemObject(itemId=f"{i:032x}", itemSku=f"SKU-{i}", owned=(i == 0), index=i)
+            for i in range(size)
+        ],
+    )
+
+
+def read_metrics() -> Dict[Tuple[str, ...], float]:
+    samples: Dict[Tuple[str, ...], float] = {
+        ("calls",): REGISTRY.get_sample_value("grpc_server_calls_count_total", {"os": platform.system().lower()}) or 0.0,
+        ("shed",): REGISTRY.get_sample_value(
+            "grpc_server_shed_calls_total", {"grpc_service": SERVICE, "grpc_method": METHOD_NAME}
+        ) or 0.0,
+    }
+    for method in (GET_ROTATION_ITEMS, BACKFILL, "/unknown.Service/Call"):
+        service, _, name = method.removeprefix("/").partition("/")
+        for code in StatusCode:
+            labels = {"grpc_service": service, "grpc_method": name, "grpc_code": code.name}
+            samples[("handled", name, code.name)] = (
+                REGISTRY.get_sample_value("grpc_server_handling_seconds_count", labels) or 0.0
+            )
+        for metric in ("grpc_server_request_size_bytes_count", "grpc_server_response_size_bytes_count"):
+            labels = {"grpc_service": service, "grpc_method": name}
+            samples[(metric, name)] = REGISTRY.get_sample_value(metric, labels) or 0.0
+    return samples
+
+
+class FusedServerInterceptorTest(unittest.IsolatedAsyncioTestCase):
+    """The same calls, through the chained interceptors then through `fuse_interceptors` of them"""
+
+    # the interceptors register their prometheus metrics globally, so each is created once
+    logger = logging.getLogger("test_fused")
+    logging_interceptor = DebugLoggingServerInterceptor(logger=logger)
+    metrics = MetricsServerInterceptor()
+    concurrency = ConcurrencyLimitServerInterceptor(limit=AIMDLimit(initial_limit=1, min_limit=1, max_limit=1))
+
+    def setUp(self):
+        self.authorization = AuthorizationServerInterceptor(token_validator=TokenValidator(), namespace=NAMESPACE)
+        self.authorization.compile_policies([AsyncSectionService.full_name])
+        # the Section proto declares no security, so GetRotationItems is given a policy that requires a token
+        self.authorization.policies = MappingProxyType(
+            {**self.authorization.policies, GET_ROTATION_ITEMS: MethodPolicy(True, "ROTATION", 2)}
+        )
+        self.compression = RecordingCompressionServerInterceptor(grpc.Compression.Gzip, COMPRESSION_MIN_SIZE)
+        self.log_handler = ListHandler()
+        self.logger.addHandler(self.log_handler)
+        self.logger.setLevel(logging.DEBUG)
+        self.addCleanup(self.logger.removeHandler, self.log_handler)
+
+    def create_orders(self) -> Dict[str, List[ServerInterceptor]]:
+        return {
+            # as the app adds them
+            "app": [self.concurrency, self.authorization, self.logging_interceptor, self.metrics, self.compression],
+            # the stages before authorization also see the calls it rejects
+            "outer": [self.metrics, self.compression, self.logging_interceptor, self.authorization, self.concurrency],
+            "mixed": [self.logging_interceptor, self.compression, self.authorization, self.concurrency, self.metrics],
+        }
+
+    async def settle(self) -> None:
+        # the limiter releases a call when its task is done, which can be after the client got the response
+        for _ in range(1000):
+            if self.concurrency.in_flight == 0:
+                return
+            await asyncio.sleep(0.001)
+        self.fail("calls still in flight")
+
+    async def run_calls(self, interceptors: Sequence[ServerInterceptor]) -> Tuple[list, dict, list, list]:
+        self.compression.compressed.clear()
+        self.log_handler.messages.clear()
+        for interceptor in interceptors:
+            if isinstance(interceptor, FusedServerInterceptor):
+                interceptor.bind_methods([AsyncSectionService.full_name])
+
+        service = BlockingSectionService()
+        server = grpc.aio.server(interceptors=interceptors)
+        add_section_servicer_to_server(service, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        before = read_metrics()
+        results: List[Tuple[str, StatusCode, str]] = []
+        try:
+            async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                get_rotation_items = channel.unary_unary(
+                    GET_ROTATION_ITEMS,
+                    request_serializer=GetRotationItemsRequest.SerializeToString,
+                    response_deserializer=GetRotationItemsResponse.FromString,
+                )
+                backfill = channel.unary_unary(
+                    BACKFILL,
+                    request_serializer=BackfillRequest.SerializeToString,
+                    response_deserializer=BackfillResponse.FromString,
+                )
+                unknown = channel.unary_unary("/unknown.Service/Call")
+
+                async def call(name, stub, request, token: Optional[str] = None) -> None:
+                    await self.settle()
+                    metadata = (("authorization", token),) if token is not None else ()
+                    try:
+                        response = await stub(request, metadata=metadata, timeout=5.0)
+                        results.append((name, StatusCode.OK, response.ByteSize()))
+                    except grpc.aio.AioRpcError as error:
+                        results.append((name, error.code(), error.details()))
+
+                large, small = create_rotation_request("user", 20), create_rotation_request("user", 0)
+                await call("no token", get_rotation_items, large)
+                await call("not bearer", get_rotation_items, large, f"Basic {ALLOWED_TOKEN}")
+                await call("denied", get_rotation_items, large, f"Bearer {DENIED_TOKEN}")
+                await call("other namespace", get_rotation_items, large, f"Bearer {OTHER_NAMESPACE_TOKEN}")
+                await call("invalid token", get_rotation_items, large, "Bearer invalid")
+                await call("allowed", get_rotation_items, large, f"Bearer {ALLOWED_TOKEN}")
+                await call("small", get_rotation_items, small, f"Bearer {ALLOWED_TOKEN}")
+                await call("no auth required", backfill, create_backfill_request(10))
+                await call("unknown method", unknown, b"")
+
+                # one call holds the only slot of the limiter, so the next one is shed
+                await self.settle()
+                slow = asyncio.ensure_future(
+                    get_rotation_items(
+                        create_rotation_request("slow", 20),
+                        metadata=(("authorization", f"Bearer {ALLOWED_TOKEN}"),),
+                        timeout=5.0,
+                    )
+                )
+                await asyncio.wait_for(service.started.wait(), 5.0)
+                try:
+                    response = await get_rotation_items(
+                        large, metadata=(("authorization", f"Bearer {ALLOWED_TOKEN}"),), timeout=5.0
+                    )
+                    results.append(("over limit", StatusCode.OK, response.ByteSize()))
+                except grpc.aio.AioRpcError as error:
+                    results.append(("over limit", error.code(), error.details()))
+                service.released.set()
+                results.append(("slow", StatusCode.OK, (await slow).ByteSize()))
+                await self.settle()
+        finally:
+            await server.stop(None)
+        after = read_metrics()
+        deltas = {key: after[key] - before[key] for key in after if after[key] != before[key]}
+        return results, deltas, list(self.compression.compressed), list(self.log_handler.messages)
+
+    async def test_fused_calls_match_chained_calls(self):
+        for order, interceptors in self.create_orders().items():
+            with self.subTest(order=order):
+                fused = fuse_interceptors(interceptors)
+                self.assertTrue(any(isinstance(i, FusedServerInterceptor) for i in fused))
+                self.assertIn(self.concurrency, fused)
+
+                chained_results, chained_metrics, chained_compressed, chained_logs = await self.run_calls(interceptors)
+                fused_results, fused_metrics, fused_compressed, fused_logs = await self.run_calls(fused)
+
+                self.assertEqual(fused_results, chained_results)
+                self.assertEqual(fused_metrics, chained_metrics)
+                self.assertEqual(fused_compressed, chained_compressed)
+                self.assertEqual(fused_logs, chained_logs)
+
+    async def test_rejections(self):
+        results, _, compressed, _ = await self.run_calls(fuse_interceptors(self.create_orders()["app"]))
+        codes = {name: (code, details) for name, code, details in results}
+
+        self.assertEqual(codes["no token"], (StatusCode.UNAUTHENTICATED, "no authorization token found"))
+        self.assertEqual(codes["not bearer"], (StatusCode.UNAUTHENTICATED, "invalid authorization token format"))
+        self.assertEqual(
+            codes["denied"],
+            (StatusCode.PERMISSION_DENIED, "insufficient permissions: resource: ROTATION, action: 2"),
+        )
+        self.assertEqual(codes["other namespace"], (StatusCode.PERMISSION_DENIED, f"'other' does not match '{NAMESPACE}'"))
+        self.assertEqual(codes["invalid token"][0], StatusCode.UNAUTHENTICATED)
+        self.assertEqual(codes["unknown method"], (StatusCode.INTERNAL, "method not found"))
+        self.assertEqual(codes["over limit"], (StatusCode.RESOURCE_EXHAUSTED, "concurrency limit reached"))
+        self.assertEqual(codes["allowed"][0], StatusCode.OK)
+        self.assertEqual(codes["small"][0], StatusCode.OK)
+        self.assertEqual(codes["no auth required"][0], StatusCode.OK)
+        self.assertEqual(codes["slow"][0], StatusCode.OK)
+        # only responses of calls past authorization, and large enough, are compressed
+        self.assertEqual(compressed, ["GetRotationItemsResponse", "GetRotationItemsResponse"])
+
+    async def test_metric_labels(self):
+        for order in ("app", "outer"):
+            with self.subTest(order=order):
+                _, metrics, _, _ = await self.run_calls(fuse_interceptors(self.create_orders()[order]))
+
+                self.assertEqual(metrics[("handled", METHOD_NAME, "OK")], 3)
+                self.assertEqual(metrics[("handled", "Backfill", "OK")], 1)
+                self.assertEqual(metrics[("shed",)], 1)
+                if order == "app":
+                    # authorization and the limiter come first: their rejections are not counted
+                    self.assertEqual(metrics[("calls",)], 4)
+                    self.assertNotIn(("handled", METHOD_NAME, "UNAUTHENTICATED"), metrics)
+                    self.assertNotIn(("handled", METHOD_NAME, "RESOURCE_EXHAUSTED"), metrics)
+                else:
+                    self.assertEqual(metrics[("calls",)], 11)
+                    self.assertEqual(metrics[("handled", METHOD_NAME, "UNAUTHENTICATED")], 3)
+                    self.assertEqual(metrics[("handled", METHOD_NAME, "PERMISSION_DENIED")], 2)
+                    self.assertEqual(metrics[("handled", METHOD_NAME, "RESOURCE_EXHAUSTED")], 1)
+                    self.assertEqual(metrics[("handled", "Call", "INTERNAL")], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
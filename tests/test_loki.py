@@ -0,0 +1,226 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import base64
+import gzip
+import json
+import logging
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+
+from prometheus_client import CollectorRegistry
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from accelbyte_grpc_plugin.loki import DROP_NEWEST, DROP_OLDEST, BatchingLokiHandler  # noqa: E402
+from fake_platform import FakeServer, Request  # noqa: E402
+
+PUSH_PATH: str = "/loki/api/v1/push"
+
+
+def read_body(request: Request) -> Dict[str, Any]:
+    data = request.body
+    if request.headers.get("Content-Encoding", None) == "gzip":
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def read_lines(request: Request) -> List[str]:
+    return [line for stream in read_body(request)["streams"] for _, line in stream["values"]]
+
+
+class BatchingLokiHandlerTest(unittest.TestCase):
+    def setUp(self):
+        # status codes to answer with, in order, then 204
+        self.statuses: List[int] = []
+        # set to hold the pushes back
+        self.blocked = threading.Event()
+        self.released = threading.Event()
+        self.server = FakeServer().start()
+        self.server.route("POST", PUSH_PATH, self.push)
+        self.registry = CollectorRegistry()
+        self.handlers: List[BatchingLokiHandler] = []
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        self.released.set()
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+            handler.close()
+        self.server.stop()
+
+    def push(self, query, params):
+        if self.blocked.is_set():
+            self.released.wait(timeout=5.0)
+        return (self.statuses.pop(0) if self.statuses else 204), None
+
+    def create_handler(self, **kwargs) -> BatchingLokiHandler:
+        kwargs.setdefault("flush_interval", 10.0)
+        handler = BatchingLokiHandler(
+            url=f"{self.server.url}{PUSH_PATH}", tags={"app": "test"}, registry=self.registry, **kwargs
+        )
+        self.handlers.append(handler)
+        self.logger.addHandler(handler)
+        return handler
+
+    def wait_for_pushes(self, count: int, timeout: float = 5.0) -> List[Request]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            requests = self.server.get_requests(PUSH_PATH)
+            if len(requests) >= count:
+                return requests
+            time.sleep(0.01)
+        self.fail(f"expected {count} push(es), got {len(self.server.get_requests(PUSH_PATH))}")
+
+    def get_records(self, outcome: str) -> float:
+        return self.registry.get_sample_value("loki_handler_records_total", {"outcome": outcome}) or 0.0
+
+    def test_sends_a_full_batch_right_away(self):
+        self.create_handler(batch_size=3)
+
+        for i in range(3):
+            self.logger.info(f"line {i}")
+
+        [request] = self.wait_for_pushes(1)
+        self.assertEqual(read_lines(request), ["line 0", "line 1", "line 2"])
+
+    def test_sends_a_partial_batch_after_the_flush_interval(self):
+        self.create_handler(batch_size=100, flush_interval=0.3)
+
+        start = time.monotonic()
+        self.logger.info("line")
+        [request] = self.wait_for_pushes(1)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual(read_lines(request), ["line"])
+
+    def test_flush_sends_right_away(self):
+        handler = self.create_handler(batch_size=100)
+
+        self.logger.info("line")
+        handler.flush()
+
+        # well within the flush interval
+        [request] = self.wait_for_pushes(1, timeout=2.0)
+        self.assertEqual(read_lines(request), ["line"])
+
+    def test_close_sends_every_queued_batch(self):
+        handler = self.create_handler(batch_size=1)
+
+        for i in range(3):
+            self.logger.info(f"line {i}")
+        start = time.monotonic()
+        handler.close()
+
+        self.assertLess(time.monotonic() - start, handler.flush_interval / 2)
+        lines = [line for request in self.server.get_requests(PUSH_PATH) for line in read_lines(request)]
+        self.assertEqual(lines, ["line 0", "line 1", "line 2"])
+
+    def test_pushes_a_gzipped_body_with_its_headers(self):
+        handler = self.create_handler(batch_size=2, auth=("user", "secret"))
+
+        self.logger.info("first")
+        self.logger.warning("second", extra={"tags": {"section": "s1"}})
+
+        [request] = self.wait_for_pushes(1)
+        self.assertEqual(request.headers["Content-Encoding"], "gzip")
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+        self.assertEqual(
+            request.headers["Authorization"], "Basic " + base64.b64encode(b"user:secret").decode()
+        )
+        streams = {
+            tuple(sorted(stream["stream"].items())): [line for _, line in stream["values"]]
+            for stream in read_body(request)["streams"]
+        }
+        self.assertEqual(
+            streams,
+            {
+                (("app", "test"), ("logger", self.logger.name), ("severity", "info")): ["first"],
+                (("app", "test"), ("logger", self.logger.name), ("section", "s1"), ("severity", "warning")): [
+                    "second"
+                ],
+            },
+        )
+        self.assertEqual(self.get_records("sent"), 2)
+        handler.close()
+
+    def test_uncompressed_body(self):
+        self.create_handler(batch_size=1, compress=False)
+
+        self.logger.info("line")
+
+        [request] = self.wait_for_pushes(1)
+        self.assertNotIn("Content-Encoding", request.headers)
+        self.assertEqual(read_lines(request), ["line"])
+
+    def test_retries_server_errors_with_backoff(self):
+        self.statuses = [503, 500]
+        self.create_handler(batch_size=1, backoff_base=0.01)
+
+        self.logger.info("line")
+
+        requests = self.wait_for_pushes(3)
+        self.assertEqual([read_lines(request) for request in requests], [["line"]] * 3)
+        self.wait_for(lambda: self.get_records("sent") == 1)
+        self.assertEqual(self.get_records("dropped_send_failed"), 0)
+
+    def test_drops_the_batch_after_the_last_retry(self):
+        self.statuses = [503] * 3
+        self.create_handler(batch_size=1, max_retries=2, backoff_base=0.01)
+
+        self.logger.info("line")
+
+        self.wait_for(lambda: self.get_records("dropped_send_failed") == 1)
+        self.assertEqual(len(self.server.get_requests(PUSH_PATH)), 3)
+
+    def test_does_not_retry_client_errors(self):
+        self.statuses = [400]
+        self.create_handler(batch_size=1, backoff_base=0.01)
+
+        self.logger.info("line")
+
+        self.wait_for(lambda: self.get_records("dropped_send_failed") == 1)
+        self.assertEqual(len(self.server.get_requests(PUSH_PATH)), 1)
+
+    def fill_queue(self, drop_policy: str) -> List[str]:
+        """Log 4 lines while the first push is held back and the queue holds 2, then let them through"""
+        self.blocked.set()
+        handler = self.create_handler(batch_size=1, max_queue_size=2, drop_policy=drop_policy)
+        self.logger.info("line 0")
+        # the worker took line 0 and waits on its push
+        self.wait_for_pushes(1)
+        for i in range(1, 4):
+            self.logger.info(f"line {i}")
+        self.assertEqual(self.get_records("dropped_queue_full"), 1)
+
+        self.released.set()
+        handler.close()
+        return [line for request in self.server.get_requests(PUSH_PATH) for line in read_lines(request)]
+
+    def test_drop_newest_keeps_the_queued_records(self):
+        self.assertEqual(self.fill_queue(DROP_NEWEST), ["line 0", "line 1", "line 2"])
+
+    def test_drop_oldest_keeps_the_latest_records(self):
+        self.assertEqual(self.fill_queue(DROP_OLDEST), ["line 0", "line 2", "line 3"])
+
+    def test_rejects_unknown_drop_policies(self):
+        with self.assertRaises(ValueError):
+            BatchingLokiHandler(url="http://127.0.0.1:1", drop_policy="drop_random", registry=None)
+
+    def wait_for(self, condition, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() >= deadline:
+                self.fail("condition not met in time")
+            time.sleep(0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import logging
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from section_pb2 import SectionItemObject  # noqa: E402
+
+from app.payload_logging import PayloadLogger  # noqa: E402
+
+PAYLOAD = SectionItemObject(itemId="item", itemSku="SKU")
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class BlockingHandler(ListHandler):
+    """Holds the payload records until released"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.released = threading.Event()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.levelno == logging.INFO:
+            self.released.wait(5.0)
+        super().emit(record)
+
+
+class PayloadLoggerTest(unittest.TestCase):
+    def create_logger(self, handler: logging.Handler) -> logging.Logger:
+        logger = logging.getLogger(f"test_payload_logging.{self.id()}")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def test_level_names(self):
+        logger = logging.getLogger("test_payload_logging")
+        self.assertEqual(PayloadLogger(logger=logger, level="DEBUG").level, logging.DEBUG)
+        self.assertEqual(PayloadLogger(logger=logger, level=logging.WARNING).level, logging.WARNING)
+        for name in ("VERBOSE", "debug", ""):
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    PayloadLogger(logger=logger, level=name)
+
+    def test_logs_inline(self):
+        handler = ListHandler()
+        payload_logger = PayloadLogger(logger=self.create_logger(handler))
+        payload_logger.log("request: %s", PAYLOAD)
+        self.assertEqual([r.getMessage() for r in handler.records], ['request: {"itemId": "item", "itemSku": "SKU"}'])
+
+    def test_offloads_to_a_dedicated_thread(self):
+        handler = ListHandler()
+        payload_logger = PayloadLogger(logger=self.create_logger(handler), offload=True)
+        payload_logger.log("request: %s", PAYLOAD)
+        payload_logger.close()
+        self.assertEqual([r.getMessage() for r in handler.records], ['request: {"itemId": "item", "itemSku": "SKU"}'])
+        self.assertEqual([r.threadName.rpartition("_")[0] for r in handler.records], ["payload-logging"])
+
+    def test_reports_failures(self):
+        handler = ListHandler()
+        payload_logger = PayloadLogger(logger=self.create_logger(handler), offload=True)
+        payload_logger.log("request: %s", "not a message")
+        payload_logger.close()
+        self.assertEqual(len(handler.records), 1)
+        self.assertEqual(handler.records[0].levelno, logging.WARNING)
+        self.assertTrue(handler.records[0].getMessage().startswith("failed to log payload: AttributeError"))
+        # the failed payload no longer counts as pending
+        self.assertTrue(payload_logger._pending.acquire(blocking=False))
+
+    def test_drops_beyond_max_pending(self):
+        handler = BlockingHandler()
+        payload_logger = PayloadLogger(logger=self.create_logger(handler), offload=True, max_pending=2)
+        for _ in range(5):
+            payload_logger.log("request: %s", PAYLOAD)
+        self.assertEqual(payload_logger.dropped, 3)
+        handler.released.set()
+        payload_logger.close()
+        self.assertEqual(len(handler.records), 2)
+
+        payload_logger.log("request: %s", PAYLOAD)
+        payload_logger.close()
+        self.assertEqual(len(handler.records), 3)
+        self.assertEqual(payload_logger.dropped, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
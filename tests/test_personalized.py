@@ -0,0 +1,117 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import sys
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from section_pb2 import GetRotationItemsRequest, SectionItemObject, SectionObject  # noqa: E402
+
+from app.rotation.strategies import PersonalizedStrategy, RotationEngine, compute_slot  # noqa: E402
+from app.services.section_service import AsyncSectionService  # noqa: E402
+
+ITEMS: int = 20
+COUNT: int = 5
+USERS: int = 5000
+# chi-square with ITEMS - 1 = 19 degrees of freedom, exceeded with a probability of 0.001
+CHI_SQUARE_LIMIT: float = 43.82
+
+
+def create_section(size: int = ITEMS, end_date: int = 0) -> SectionObject:
+    return SectionObject(
+        sectionId="s1",
+        sectionName="personalized",
+        endDate=end_date,
+        items=[SectionItemObject(itemId=f"{i:032x}", itemSku=f"SKU{i}") for i in range(size)],
+    )
+
+
+def create_request(user_id: str, section: SectionObject) -> GetRotationItemsRequest:
+    return GetRotationItemsRequest(userId=user_id, sectionObject=section)
+
+
+def chi_square(counts: Counter, size: int, expected: float) -> float:
+    return sum((counts[i] - expected) ** 2 / expected for i in range(size))
+
+
+class PersonalizedStrategyTest(unittest.TestCase):
+    def setUp(self):
+        self.strategy = PersonalizedStrategy(count=COUNT)
+        self.section = create_section()
+        self.slot = compute_slot(1_700_000_000, self.strategy.slot_duration)
+        self.users = [f"{i:032x}" for i in range(USERS)]
+
+    def select(self, user_id: str, slot=None):
+        return self.strategy.select(create_request(user_id, self.section), slot or self.slot, ITEMS)
+
+    def test_items_are_spread_evenly_across_users(self):
+        shown, shown_first = Counter(), Counter()
+        for user_id in self.users:
+            indices = self.select(user_id)
+            self.assertEqual(len(set(indices)), COUNT)
+            shown.update(indices)
+            shown_first[indices[0]] += 1
+
+        self.assertLess(chi_square(shown, ITEMS, USERS * COUNT / ITEMS), CHI_SQUARE_LIMIT)
+        self.assertLess(chi_square(shown_first, ITEMS, USERS / ITEMS), CHI_SQUARE_LIMIT)
+
+    def test_users_get_different_items(self):
+        rotations = {tuple(self.select(user_id)) for user_id in self.users[:100]}
+
+        self.assertGreater(len(rotations), 90)
+
+    def test_same_user_gets_the_same_items(self):
+        # another strategy, as on another replica
+        other = PersonalizedStrategy(count=COUNT)
+        for user_id in self.users[:100]:
+            request = create_request(user_id, create_section())
+            self.assertEqual(self.select(user_id), other.select(request, self.slot, ITEMS))
+
+    def test_items_change_with_the_slot(self):
+        next_slot = compute_slot(self.slot.end, self.strategy.slot_duration)
+        changed = sum(self.select(user_id) != self.select(user_id, next_slot) for user_id in self.users[:100])
+
+        self.assertGreater(changed, 90)
+
+    def test_large_sections(self):
+        section = create_section(size=100_000)
+        indices = self.strategy.select(create_request(self.users[0], section), self.slot, 100_000)
+
+        self.assertEqual(len(set(indices)), COUNT)
+        self.assertTrue(all(0 <= i < 100_000 for i in indices))
+
+    def test_expired_at_is_the_end_of_the_slot(self):
+        rotation = self.strategy.rotate(create_request(self.users[0], self.section), now=self.slot.start + 1234.5)
+
+        self.assertEqual(rotation.expired_at, self.slot.end)
+
+    def test_expired_at_is_the_end_of_the_section_when_it_ends_first(self):
+        section = create_section(end_date=self.slot.start + 600)
+        rotation = self.strategy.rotate(create_request(self.users[0], section), now=self.slot.start + 10)
+
+        self.assertEqual(rotation.expired_at, self.slot.start + 600)
+
+
+class PersonalizedRotationItemsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_same_user_gets_the_same_response(self):
+        strategy = PersonalizedStrategy(count=COUNT)
+        service = AsyncSectionService(rotation_engine=RotationEngine(default_strategy=strategy))
+        now = 1_700_000_000 + 42.0
+        slot = compute_slot(now, strategy.slot_duration)
+
+        with mock.patch("app.services.section_service.time.time", return_value=now):
+            first = await service.GetRotationItems(create_request("u1", create_section()), None)
+            second = await service.GetRotationItems(create_request("u1", create_section()), None)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first.items), COUNT)
+        self.assertEqual(first.expiredAt, slot.end)
+
+
+if __name__ == "__main__":
+    unittest.main()
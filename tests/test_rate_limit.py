@@ -0,0 +1,88 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import grpc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from accelbyte_grpc_plugin.interceptors.rate_limit import (  # noqa: E402
+    RateLimit,
+    RateLimitServerInterceptor,
+)
+
+METHOD = "/accelbyte.platform.catalog.section.v1.Section/GetRotationItems"
+
+
+class Aborted(Exception):
+    pass
+
+
+class Context:
+    def invocation_metadata(self):
+        return ()
+
+    async def abort(self, code, details):
+        raise Aborted(code)
+
+
+async def behavior(request, context):
+    return "ok"
+
+
+HANDLER = grpc.unary_unary_rpc_method_handler(behavior)
+
+
+class RateLimitServerInterceptorTest(unittest.IsolatedAsyncioTestCase):
+    # the interceptor registers its prometheus metrics globally, so one is shared
+    interceptor = RateLimitServerInterceptor(default_limit=RateLimit(1.0, 1), clock=lambda: 0.0)
+
+    def setUp(self):
+        self.interceptor.clear()
+        self.interceptor.keyless_limit = None
+        self.interceptor._wrapped_handlers.clear()
+
+    async def intercept(self, method: str = METHOD):
+        async def continuation(details):
+            return HANDLER
+
+        details = SimpleNamespace(method=method, invocation_metadata=())
+        return await self.interceptor.intercept_service(continuation, details)
+
+    async def call(self, user_id: str, method: str = METHOD):
+        handler = await self.intercept(method)
+        return await handler.unary_unary(SimpleNamespace(userId=user_id), Context())
+
+    async def test_limits_calls_per_key(self):
+        self.assertEqual(await self.call("u1"), "ok")
+        with self.assertRaises(Aborted):
+            await self.call("u1")
+        self.assertEqual(await self.call("u2"), "ok")
+
+    async def test_keyless_calls_are_not_limited(self):
+        for _ in range(3):
+            self.assertEqual(await self.call(""), "ok")
+
+    async def test_keyless_calls_share_the_keyless_limit(self):
+        self.interceptor.keyless_limit = RateLimit(1.0, 2)
+        await self.call("")
+        await self.call("")
+        with self.assertRaises(Aborted):
+            await self.call("")
+
+    async def test_critical_methods_are_not_limited(self):
+        self.assertIs(await self.intercept("/grpc.health.v1.Health/Check"), HANDLER)
+
+    def test_rejects_rates_that_never_refill(self):
+        for limit in (RateLimit(0.0, 1), RateLimit(-1.0, 1), RateLimit(float("nan"), 1)):
+            with self.assertRaises(ValueError):
+                RateLimitServerInterceptor(limits={"GetRotationItems": limit})
+
+
+if __name__ == "__main__":
+    unittest.main()
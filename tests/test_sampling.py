@@ -0,0 +1,101 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import math
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from section_pb2 import SectionItemObject, SectionObject  # noqa: E402
+
+from app.catalog import CatalogIndex, CatalogItem  # noqa: E402
+from app.rotation.sampling import NumpyWeightedSampler, PythonWeightedSampler, numpy  # noqa: E402
+
+
+def create_section(size: int) -> SectionObject:
+    return SectionObject(
+        sectionId="s1",
+        items=[SectionItemObject(itemId=f"{i}", itemSku=f"SKU{i}") for i in range(size)],
+    )
+
+
+class WeightedSamplerTest(unittest.TestCase):
+    def sample(self, weights, count: int):
+        section = create_section(len(weights))
+        sampler = PythonWeightedSampler()
+        section_weights = sampler.get_weights(section, lambda item_id, sku: weights[int(item_id)], fingerprint=1)
+        return sampler.sample(section, section_weights, count, seed=42)
+
+    def test_non_finite_weights_are_never_drawn(self):
+        selected = self.sample([math.inf, 1.0, math.nan, 2.0, -math.inf], count=5)
+
+        self.assertEqual(sorted(selected), [1, 3])
+
+    def test_only_infinite_weights(self):
+        self.assertEqual(self.sample([math.inf, math.inf], count=2), [])
+
+    def test_draws_distinct_items(self):
+        selected = self.sample([100.0, 1.0, 1.0, 1.0], count=4)
+
+        self.assertEqual(sorted(selected), [0, 1, 2, 3])
+
+
+def create_catalog_index(section: SectionObject, seed: int) -> CatalogIndex:
+    """Availability for most of the section's items: some inactive, some in a window around 1000"""
+    rng = random.Random(seed)
+    items = {}
+    for item in section.items:
+        if rng.random() < 0.2:
+            continue
+        items[item.itemId] = CatalogItem(
+            item_id=item.itemId,
+            sku=item.itemSku,
+            name="",
+            item_type="INGAMEITEM",
+            category_path="/",
+            tags=(),
+            active=rng.random() < 0.8,
+            purchasable=rng.random() < 0.9,
+            currency_code="USD",
+            price=100,
+            available_from=rng.choice((0, 500, 1000)),
+            available_until=rng.choice((0, 1000, 1500)),
+            updated_at=0,
+        )
+    return CatalogIndex(items)
+
+
+@unittest.skipUnless(numpy, "numpy is not installed")
+class NumpyWeightedSamplerTest(unittest.TestCase):
+    def test_draws_the_same_items_as_pure_python(self):
+        for size in (1, 7, 100, 1000, 20_000):
+            section = create_section(size)
+            rng = random.Random(size)
+            weights = [rng.choice((0.0, 0.5, 1.0, 3.0, 100.0, math.inf)) for _ in range(size)]
+            catalog_index = create_catalog_index(section, seed=size)
+            samplers = (NumpyWeightedSampler(), PythonWeightedSampler())
+            for count in (1, 5, 50, size):
+                for index, now in ((None, 0.0), (catalog_index, 499.0), (catalog_index, 1000.0)):
+                    for seed in range(5):
+                        with self.subTest(size=size, count=count, now=now if index else None, seed=seed):
+                            numpy_selected, python_selected = (
+                                sampler.sample(
+                                    section,
+                                    sampler.get_weights(section, lambda item_id, sku: weights[int(item_id)], 1),
+                                    count,
+                                    seed=seed,
+                                    catalog_index=index,
+                                    now=now,
+                                )
+                                for sampler in samplers
+                            )
+                            self.assertEqual(numpy_selected, python_selected)
+                            self.assertEqual(len(set(numpy_selected)), len(numpy_selected))
+
+
+if __name__ == "__main__":
+    unittest.main()
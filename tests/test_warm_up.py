@@ -0,0 +1,53 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from accelbyte_grpc_plugin.utils import WarmUpCalls  # noqa: E402
+
+
+class Context:
+    def __init__(self, metadata):
+        self.metadata = metadata
+
+    def invocation_metadata(self):
+        return self.metadata
+
+
+class WarmUpCallsTest(unittest.TestCase):
+    def setUp(self):
+        WarmUpCalls.running = 1
+        self.addCleanup(setattr, WarmUpCalls, "running", 0)
+
+    def is_warm_up(self, value) -> bool:
+        metadata = ((WarmUpCalls.METADATA_KEY, value),) if value is not None else ()
+        details = SimpleNamespace(method="/Service/Method", invocation_metadata=metadata)
+        from_details = WarmUpCalls.is_warm_up(details)
+        self.assertEqual(WarmUpCalls.is_warm_up_context(Context(metadata)), from_details)
+        return from_details
+
+    def test_marker_with_the_process_token(self):
+        self.assertTrue(self.is_warm_up(WarmUpCalls.token))
+
+    def test_marker_with_another_value(self):
+        self.assertEqual(len(WarmUpCalls.token), 32)
+        for value in ("1", "", WarmUpCalls.token[:-1], WarmUpCalls.token.upper() + "x", "é" * 32, b"1"):
+            with self.subTest(value=value):
+                self.assertFalse(self.is_warm_up(value))
+
+    def test_no_marker(self):
+        self.assertFalse(self.is_warm_up(None))
+
+    def test_marker_once_warmed_up(self):
+        WarmUpCalls.running = 0
+        self.assertFalse(self.is_warm_up(WarmUpCalls.token))
+
+
+if __name__ == "__main__":
+    unittest.main()
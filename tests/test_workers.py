@@ -0,0 +1,60 @@
+# Copyright (c) 2025 AccelByte Inc. All Rights Reserved.
+# This is licensed software from AccelByte Inc, for limitations
+# and restrictions contact your company contract manager.
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from prometheus_client import CollectorRegistry
+from prometheus_client.multiprocess import MultiProcessCollector
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# a worker's gauges whose values come from functions
+WORKER = textwrap.dedent(
+    """
+    from section_pb2 import GetRotationItemsResponse
+
+    from accelbyte_grpc_plugin.interceptors.rate_limit import RateLimit, RateLimitServerInterceptor
+    from accelbyte_grpc_plugin.workers import write_gauge_functions
+    from app.rotation.cache import RotationCache
+
+    cache = RotationCache(max_size=10)
+    for i in range({entries}):
+        cache.put(("s%d" % i, 0, 0), GetRotationItemsResponse(expiredAt=2**40))
+    limiter = RateLimitServerInterceptor(default_limit=RateLimit(1.0, 1))
+    limiter.acquire("/Section/GetRotationItems", "u1", limiter.default_limit)
+    write_gauge_functions()
+    """
+)
+
+
+class MultiprocessGaugeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory(prefix="prometheus-")
+        self.addCleanup(self.directory.cleanup)
+
+    def run_worker(self, entries: int) -> None:
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": self.directory.name, "PYTHONPATH": str(SRC)}
+        subprocess.run([sys.executable, "-c", WORKER.format(entries=entries)], env=env, check=True, timeout=60)
+
+    def test_workers_write_the_values_of_gauge_functions(self):
+        self.run_worker(entries=3)
+        self.run_worker(entries=2)
+
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry, path=self.directory.name)
+
+        # sizes add up over the workers
+        self.assertEqual(registry.get_sample_value("rotation_cache_size"), 5)
+        self.assertEqual(registry.get_sample_value("grpc_server_rate_limit_buckets"), 2)
+        self.assertGreater(registry.get_sample_value("grpc_server_rate_limit_memory_bytes"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()